@@ -1,12 +1,14 @@
-from .bellman_ford import bellman_ford
+from .bellman_ford import bellman_ford, find_negative_cycle
 from .dijkstra import Dijkstra
-from .floyd_warshall import floyd_warshall
+from .floyd_warshall import floyd_warshall, floyd_warshall_with_paths
 from .johnson import Johnson 
-from .topological_sort import topological_sort
+from .topological_sort import DynamicTopologicalOrder, topological_layers, topological_sort
 from .kruskal_algorithm import kruskal_algorithm
 from .prim import Prim
 from .tarjan import Tarjan
 from .kosaraju import Kosaraju
+from .incremental_scc import IncrementalSCC
+from .reachability_index import ReachabilityIndex
 from .biconnected_components import BiconnectedComponents
 from .articulation_points import ArticulationPoints
 from .bridges import Bridges
@@ -18,24 +20,35 @@ from .graph_representation import Graph
 from .graph_utils import GraphUtils
 from .graph_coloring import GraphColoring
 from .graph_matching import GraphMatching
+from .assignment import hungarian_assignment, auction_assignment
 from .graph_partitioning import GraphPartitioning
 from .graph_clustering import GraphClustering
+from .community_detection import CommunityDetection
 from .graph_embedding import GraphEmbedding
-from .graph_isomorphism import GraphIsomorphism
+from .graph_isomorphism import GraphIsomorphism, weisfeiler_lehman_hash
+from .graph_fingerprint_index import GraphFingerprintIndex
 from .graph_layout import GraphLayout
 from .graph_statistics import GraphStatistics
 from .graph_analysis import GraphAnalysis
+from .csr_graph import CSRGraph
+from .iterative_dfs import IterativeDFS
 
 __all__ = [
     'bellman_ford',
+    'find_negative_cycle',
     'Dijkstra',
     'floyd_warshall',
+    'floyd_warshall_with_paths',
     'Johnson',
     'topological_sort',
+    'topological_layers',
+    'DynamicTopologicalOrder',
     'kruskal_algorithm',
     'Prim',
     'Tarjan',
     'Kosaraju',
+    'IncrementalSCC',
+    'ReachabilityIndex',
     'BiconnectedComponents',
     'ArticulationPoints',
     'Bridges',
@@ -47,11 +60,18 @@ __all__ = [
     'GraphUtils',
     'GraphColoring',
     'GraphMatching',
+    'hungarian_assignment',
+    'auction_assignment',
     'GraphPartitioning',
     'GraphClustering',
+    'CommunityDetection',
     'GraphEmbedding',
     'GraphIsomorphism',
+    'weisfeiler_lehman_hash',
+    'GraphFingerprintIndex',
     'GraphLayout',
     'GraphStatistics',
-    'GraphAnalysis'
+    'GraphAnalysis',
+    'CSRGraph',
+    'IterativeDFS'
 ]
\ No newline at end of file
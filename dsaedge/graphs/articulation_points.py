@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class ArticulationPoints:
     """
     Finds articulation points (or cut vertices) in an undirected graph.
@@ -9,17 +12,20 @@ class ArticulationPoints:
         Initializes the ArticulationPoints object.
 
         Args:
-            graph (dict): An adjacency list representation of the undirected graph.
+            graph (dict or CSRGraph): An adjacency list representation of the undirected graph,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1, 2], 1: [0, 2], 2: [0, 1, 3], 3: [2, 4], 4: [3]}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
-        self.time = 0
-        self.disc = {v: -1 for v in self.vertices}  # Discovery times
-        self.low = {v: -1 for v in self.vertices}   # Low-link values
-        self.parent = {v: -1 for v in self.vertices}
+        self._dfs = IterativeDFS(self.csr, undirected=True)
+        self.disc = self._dfs.disc      # Discovery times, indexed by vertex id
+        self.low = self._dfs.low        # Low-link values, indexed by vertex id
+        self.parent = self._dfs.parent  # DFS-tree parents, -1 for roots
         self.articulation_points = set()
+        self._root_children = 0
 
     def find_articulation_points(self):
         """
@@ -29,37 +35,24 @@ class ArticulationPoints:
             set: A set of articulation points.
                  Example: {2, 3}
         """
-        for v in self.vertices:
+        for v in range(self.num_vertices):
             if self.disc[v] == -1:
-                self._find_ap_util(v)
+                self._root_children = 0
+                self._dfs.run(v, exit=self._exit)
+                # Case 1: v is the root of DFS tree and has two or more children.
+                if self._root_children > 1:
+                    self.articulation_points.add(self.csr.labels[v])
         return self.articulation_points
 
-    def _find_ap_util(self, u):
+    def _exit(self, v, u):
         """
-        A recursive DFS utility to find articulation points.
+        Checks the tree edge u-v once v's subtree is finished.
         """
-        self.disc[u] = self.time
-        self.low[u] = self.time
-        self.time += 1
-        children = 0
-
-        for v in self.graph.get(u, []):
-            if v == self.parent[u]:
-                continue
-
-            if self.disc[v] != -1:  # Back edge
-                self.low[u] = min(self.low[u], self.disc[v])
-            else:  # Tree edge
-                children += 1
-                self.parent[v] = u
-                self._find_ap_util(v)
-                self.low[u] = min(self.low[u], self.low[v])
-
-                # Case 1: u is the root of DFS tree and has two or more children.
-                if self.parent[u] == -1 and children > 1:
-                    self.articulation_points.add(u)
-
-                # Case 2: u is not root and low value of one of its children is more
-                # than discovery value of u.
-                if self.parent[u] != -1 and self.low[v] >= self.disc[u]:
-                    self.articulation_points.add(u)
+        if u == -1:
+            return
+        if self.parent[u] == -1:
+            self._root_children += 1
+        # Case 2: u is not root and low value of one of its children is more
+        # than discovery value of u.
+        elif self.low[v] >= self.disc[u]:
+            self.articulation_points.add(self.csr.labels[u])
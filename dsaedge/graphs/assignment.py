@@ -0,0 +1,308 @@
+import math
+
+from .graph_matching import GraphMatching
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only hungarian_assignment needs it.
+    np = None
+
+_BLOCK_ROWS = 64  # Rows relaxed together in the shortest path search
+
+
+def hungarian_assignment(costs, maximize=False):
+    """
+    Solves the linear assignment problem with the Jonker-Volgenant algorithm:
+    every row is assigned a distinct column so that the total cost is minimal.
+    If there are more rows than columns, every column is assigned a distinct row.
+
+    Column reduction, reduction transfer and augmenting row reduction assign most
+    rows cheaply; each remaining row is then assigned by a shortest augmenting
+    path search over reduced costs, with every step vectorised over the columns.
+
+    Args:
+        costs (dict or 2D array): Either a dict of dicts {row: {column: cost}}, where
+                                  missing entries are forbidden pairs, or a 2D array /
+                                  list of lists, where inf marks forbidden pairs.
+        maximize (bool): Maximize the total instead.
+
+    Returns:
+        tuple: A tuple containing:
+            - dict: The column assigned to every row (indices for array input).
+            - float: The total cost.
+
+    Raises:
+        ValueError: If forbidden pairs leave no complete assignment.
+    """
+    if np is None:
+        raise ImportError("hungarian_assignment requires NumPy.")
+    rows, columns, matrix = _dense_costs(costs)
+    if maximize:
+        matrix = np.where(np.isfinite(matrix), -matrix, np.inf)
+    transposed = matrix.shape[0] > matrix.shape[1]
+    if transposed:
+        matrix = matrix.T
+    n, m = matrix.shape
+    if n == 0:
+        return {}, 0.0
+    # Zero-cost dummy rows make the problem square
+    square = np.vstack((matrix, np.zeros((m - n, m)))) if n < m else matrix
+
+    column_of = _jonker_volgenant(square)[:n]
+    pairs = [(i, j) for i, j in enumerate(column_of.tolist())]
+    if transposed:
+        pairs = [(j, i) for i, j in pairs]
+    assignment = {rows[i]: columns[j] for i, j in sorted(pairs)}
+    total = sum(float(costs[rows[i]][columns[j]]) for i, j in pairs)
+    return assignment, total
+
+
+def auction_assignment(costs, maximize=False, epsilon=None):
+    """
+    Solves the linear assignment problem with Bertsekas' auction algorithm,
+    which only touches the given entries and suits sparse costs. Rows bid for
+    their best column, raising its price by the margin over their second-best
+    choice plus epsilon, with epsilon-scaling. Problems with fewer rows than
+    columns are made square with zero-cost dummy rows.
+
+    Args:
+        costs (dict or 2D array): As for hungarian_assignment. Needs at most as many
+                                  rows as columns.
+        maximize (bool): Maximize the total instead.
+        epsilon (float, optional): The final bid increment. The result is within
+                                   m * epsilon of the optimum, for m columns. By default
+                                   1 / (m + 1), which is exact for integer costs, or
+                                   1e-9 of the cost range per column for other costs.
+
+    Returns:
+        tuple: A tuple containing:
+            - dict: The column assigned to every row (indices for array input).
+            - float: The total cost.
+
+    Raises:
+        ValueError: If there are more rows than columns or no complete assignment exists.
+    """
+    rows, columns, entries = _sparse_costs(costs)
+    n, m = len(rows), len(columns)
+    if n > m:
+        raise ValueError("auction_assignment needs at most as many rows as columns.")
+    if n == 0:
+        return {}, 0.0
+    if GraphMatching({i: [j for j, _ in row] for i, row in enumerate(entries)}).hopcroft_karp() < n:
+        raise ValueError("No complete assignment exists.")
+
+    sign = 1 if maximize else -1  # The auction maximizes benefit
+    benefits = [[(j, sign * c) for j, c in row] for row in entries]
+    if n < m:
+        # Zero-benefit dummy rows that may take any column make the problem square,
+        # so epsilon-scaling applies; unscaled auctions fall into price wars
+        dummy = [(j, 0) for j in range(m)]
+        benefits += [dummy] * (m - n)
+    values = [b for row in benefits for _, b in row]
+    span = max(values) - min(values)
+    if epsilon is None:
+        integral = all(float(c).is_integer() for row in entries for _, c in row)
+        epsilon = 1 / (m + 1) if integral else max(span, 1.0) * 1e-9 / m
+
+    prices = [0.0] * m
+    step = max(epsilon, span / 4)
+    while True:
+        column_of = _auction_round(benefits, prices, step, span, m)
+        if step <= epsilon:
+            break
+        step = max(epsilon, step / 5)
+
+    pairs = sorted(enumerate(column_of[:n]))
+    assignment = {rows[i]: columns[j] for i, j in pairs}
+    total = sum(float(costs[rows[i]][columns[j]]) for i, j in pairs)
+    return assignment, total
+
+
+def _auction_round(benefits, prices, epsilon, span, num_columns):
+    """
+    One Gauss-Seidel auction with a fixed bid increment, starting from the given
+    prices (updated in place) and no assignment.
+
+    Returns:
+        list: The column of every row.
+    """
+    column_of = [-1] * len(benefits)
+    owner = [-1] * num_columns
+    unassigned = list(range(len(benefits)))
+    while unassigned:
+        i = unassigned.pop()
+        best = second = -math.inf
+        best_column = -1
+        for j, benefit in benefits[i]:
+            value = benefit - prices[j]
+            if value > best:
+                best, second, best_column = value, best, j
+            elif value > second:
+                second = value
+        if second == -math.inf:  # A single candidate: any large enough raise will do
+            second = best - span - epsilon
+        prices[best_column] += best - second + epsilon
+        previous = owner[best_column]
+        owner[best_column] = i
+        column_of[i] = best_column
+        if previous >= 0:
+            column_of[previous] = -1
+            unassigned.append(previous)
+    return column_of
+
+
+def _jonker_volgenant(cost):
+    """
+    Solves a square assignment problem, with inf for forbidden pairs.
+
+    Returns:
+        ndarray: The column of every row.
+    """
+    n = len(cost)
+    column_of = np.full(n, -1, dtype=np.int64)
+    row_of = np.full(n, -1, dtype=np.int64)
+
+    # Column reduction: every column starts at its cheapest row
+    cheapest = cost.argmin(axis=0)
+    v = cost[cheapest, np.arange(n)].astype(np.float64)
+    if not np.isfinite(v).all():
+        raise ValueError("No complete assignment exists.")
+    for j in range(n - 1, -1, -1):
+        i = cheapest[j]
+        if column_of[i] < 0:
+            column_of[i] = j
+            row_of[j] = i
+
+    # Reduction transfer: lower the price of an assigned column to the row's second choice
+    for i in np.flatnonzero(column_of >= 0):
+        j = column_of[i]
+        reduced = cost[i] - v
+        reduced[j] = np.inf
+        mu = reduced.min()
+        if np.isfinite(mu):
+            v[j] -= mu
+
+    # Augmenting row reduction, twice: free rows take their best column,
+    # displacing its row, which tries again right away if the price rose
+    for _ in range(2):
+        free = np.flatnonzero(column_of < 0).tolist()
+        k, steps, still_free = 0, 0, []
+        while k < len(free):
+            i = free[k]
+            k += 1
+            reduced = cost[i] - v
+            j1 = int(reduced.argmin())
+            u1 = reduced[j1]
+            if not np.isfinite(u1):
+                raise ValueError("No complete assignment exists.")
+            reduced[j1] = np.inf
+            j2 = int(reduced.argmin())
+            u2 = reduced[j2]
+            displaced = row_of[j1]
+            lowered = u1 < u2 and np.isfinite(u2)
+            if lowered:
+                v[j1] -= u2 - u1
+            elif u1 == u2 and displaced >= 0:
+                j1, displaced = j2, row_of[j2]
+            column_of[i] = j1
+            row_of[j1] = i
+            if displaced >= 0:
+                column_of[displaced] = -1
+                if lowered and steps < 10 * n:
+                    steps += 1
+                    k -= 1
+                    free[k] = displaced
+                else:
+                    still_free.append(displaced)
+
+    # Shortest augmenting paths for the remaining free rows: Dijkstra over the
+    # columns with reduced costs, settling all columns at the current distance at once
+    u = np.array([(cost[i] - v).min() for i in range(n)])
+    for root in np.flatnonzero(column_of < 0).tolist():
+        dist = np.full(n, np.inf)
+        path = np.full(n, -1, dtype=np.int64)  # Row from which every column was reached
+        settled = np.zeros(n, dtype=bool)
+        scanned = [root]
+        frontier = np.array([root])
+        lowest = 0.0
+        while True:
+            for start in range(0, len(frontier), _BLOCK_ROWS):
+                block_rows = frontier[start:start + _BLOCK_ROWS]
+                block = cost[block_rows] - u[block_rows, None]
+                nearest = block.argmin(axis=0)
+                reduced = lowest + block[nearest, np.arange(n)] - v
+                better = ~settled & (reduced < dist)
+                dist[better] = reduced[better]
+                path[better] = block_rows[nearest[better]]
+            candidates = np.where(settled, np.inf, dist)
+            lowest = candidates.min()
+            if not np.isfinite(lowest):
+                raise ValueError("No complete assignment exists.")
+            ties = np.flatnonzero(candidates == lowest)
+            free = ties[row_of[ties] < 0]
+            if len(free):
+                sink = int(free[0])
+                break
+            settled[ties] = True
+            frontier = row_of[ties]
+            scanned.extend(frontier.tolist())
+
+        # Update the duals so the reduced costs stay non-negative, then augment
+        u[root] += lowest
+        others = np.array(scanned[1:], dtype=np.int64)
+        u[others] += lowest - dist[column_of[others]]
+        v[settled] -= lowest - dist[settled]
+        j = sink
+        while True:
+            i = path[j]
+            row_of[j] = i
+            column_of[i], j = j, column_of[i]
+            if i == root:
+                break
+    return column_of
+
+
+def _dense_costs(costs):
+    """
+    Returns the row labels, column labels and float cost matrix, with inf for missing pairs.
+    """
+    if isinstance(costs, dict):
+        rows, columns = _labels(costs)
+        index = {c: j for j, c in enumerate(columns)}
+        matrix = np.full((len(rows), len(columns)), np.inf)
+        for i, r in enumerate(rows):
+            for c, cost in costs[r].items():
+                matrix[i, index[c]] = cost
+        return rows, columns, matrix
+    matrix = np.array(costs, dtype=np.float64)
+    if matrix.ndim != 2:
+        if matrix.size == 0:
+            return [], [], np.zeros((0, 0))
+        raise ValueError("costs must be a dict of dicts or a 2D array.")
+    return list(range(matrix.shape[0])), list(range(matrix.shape[1])), matrix
+
+
+def _sparse_costs(costs):
+    """
+    Returns the row labels, column labels and the (column id, cost) pairs of every row.
+    """
+    if isinstance(costs, dict):
+        rows, columns = _labels(costs)
+        index = {c: j for j, c in enumerate(columns)}
+        return rows, columns, [[(index[c], cost) for c, cost in costs[r].items()] for r in rows]
+    matrix = [list(row) for row in costs]
+    num_columns = max((len(row) for row in matrix), default=0)
+    entries = [[(j, cost) for j, cost in enumerate(row) if cost != math.inf] for row in matrix]
+    return list(range(len(matrix))), list(range(num_columns)), entries
+
+
+def _labels(costs):
+    """
+    Returns the rows and the columns of a dict of dicts, in first-seen order.
+    """
+    columns = {}
+    for row in costs.values():
+        for c in row:
+            columns.setdefault(c, None)
+    return list(costs.keys()), list(columns)
+
@@ -1,3 +1,7 @@
+from collections import deque
+
+from .csr_graph import CSRGraph
+
 class Graph:
     """
     A graph representation for Bellman-Ford algorithm.
@@ -13,20 +17,69 @@ class Graph:
         """
         self.graph.append([u, v, w])
 
-def bellman_ford(graph, start_vertex):
+def bellman_ford(graph, start_vertex, method='passes'):
     """
     Finds the shortest paths from a start_vertex to all other vertices
     using the Bellman-Ford algorithm. Detects negative cycles.
 
     Args:
-        graph (Graph): The graph object.
+        graph (Graph or CSRGraph): The graph object. A CSRGraph is relaxed directly
+                                   over its edge arrays and keyed by its labels.
         start_vertex: The starting vertex for path calculation.
+        method (str): 'passes' relaxes every edge once per pass and stops after the
+                      first pass that changes nothing. 'spfa' (the queue-based
+                      Shortest Path Faster Algorithm) only re-relaxes the out-edges
+                      of vertices whose distance changed.
 
     Returns:
         tuple: A tuple containing:
             - distances (dict): Dictionary of shortest distances from start_vertex.
             - predecessors (dict): Dictionary of predecessors for reconstructing paths.
             - bool: True if a negative cycle is detected, False otherwise.
+              Use find_negative_cycle to get the cycle itself.
+    """
+    if method not in ('passes', 'spfa'):
+        raise ValueError("method must be 'passes' or 'spfa'.")
+
+    if isinstance(graph, Graph) and method == 'passes':
+        return _bellman_ford_edges(graph, start_vertex)
+
+    csr = _edge_list_to_csr(graph) if isinstance(graph, Graph) else graph
+    distances, predecessors, cycle = _bellman_ford_csr(csr, [csr.index[start_vertex]], method == 'spfa')
+    labels = csr.labels
+    return (
+        dict(zip(labels, distances)),
+        {labels[v]: (labels[p] if p != -1 else None) for v, p in enumerate(predecessors)},
+        cycle is not None,
+    )
+
+def find_negative_cycle(graph, start_vertex=None, method='spfa'):
+    """
+    Finds a negative-weight cycle.
+
+    Args:
+        graph (Graph or CSRGraph): The graph object.
+        start_vertex (optional): Only look for cycles reachable from this vertex.
+                                 By default every vertex is a source, so any
+                                 negative cycle in the graph is found.
+        method (str): 'passes' or 'spfa', as for bellman_ford.
+
+    Returns:
+        list: The vertices of a negative cycle in edge order (the last one has an
+              edge back to the first), or None if there is no negative cycle.
+    """
+    if method not in ('passes', 'spfa'):
+        raise ValueError("method must be 'passes' or 'spfa'.")
+    csr = _edge_list_to_csr(graph) if isinstance(graph, Graph) else graph
+    sources = range(csr.num_vertices) if start_vertex is None else [csr.index[start_vertex]]
+    _, _, cycle = _bellman_ford_csr(csr, sources, method == 'spfa')
+    if cycle is None:
+        return None
+    return [csr.labels[v] for v in cycle]
+
+def _bellman_ford_edges(graph, start_vertex):
+    """
+    Pass-based Bellman-Ford over the edge list of a Graph.
     """
     # Initialize distances from start_vertex to all other vertices as infinity
     # and distance to start_vertex as 0.
@@ -34,18 +87,137 @@ def bellman_ford(graph, start_vertex):
     distances[start_vertex] = 0
     predecessors = {v: None for v in range(graph.V)}
 
-    # Relax all edges V-1 times
+    # Relax all edges up to V-1 times, stopping early once a pass changes nothing
     for _ in range(graph.V - 1):
+        changed = False
         for u, v, weight in graph.graph:
             if distances[u] != float('inf') and distances[u] + weight < distances[v]:
                 distances[v] = distances[u] + weight
                 predecessors[v] = u
+                changed = True
+        if not changed:
+            return distances, predecessors, False
 
     # Check for negative-weight cycles
     for u, v, weight in graph.graph:
         if distances[u] != float('inf') and distances[u] + weight < distances[v]:
-            print("Graph contains negative weight cycle!")
             return distances, predecessors, True
 
     return distances, predecessors, False
 
+def _edge_list_to_csr(graph):
+    """
+    Compacts the edge list of a Graph into a CSRGraph over the same integer vertices.
+    """
+    return CSRGraph.from_edges(graph.V, graph.graph)
+
+def _bellman_ford_csr(csr, sources, spfa=False):
+    """
+    Bellman-Ford over the edge arrays of a CSRGraph, using vertex ids.
+
+    Args:
+        csr (CSRGraph): The graph.
+        sources (iterable): Vertex ids that start at distance 0. Starting every
+                            vertex at 0 is equivalent to adding a virtual source
+                            with zero-weight edges to all of them.
+        spfa (bool): Use the FIFO queue variant instead of full passes.
+
+    Returns:
+        tuple: (distances list, predecessors list with -1 for none, negative cycle
+               as a list of vertex ids in edge order, or None).
+    """
+    num_vertices = csr.num_vertices
+    distances = [float('inf')] * num_vertices
+    predecessors = [-1] * num_vertices
+    for source in sources:
+        distances[source] = 0
+
+    if spfa:
+        cycle = _spfa(csr, distances, predecessors, sources)
+    else:
+        cycle = _passes(csr, distances, predecessors)
+    return distances, predecessors, cycle
+
+def _passes(csr, distances, predecessors):
+    """
+    Relaxes every edge once per pass. A pass that changes nothing ends the search;
+    if the V-th pass still changes something, there is a negative cycle.
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    num_vertices = csr.num_vertices
+    inf = float('inf')
+
+    for _ in range(num_vertices):
+        changed = False
+        for u in range(num_vertices):
+            d_u = distances[u]
+            if d_u == inf:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if d_u + weights[e] < distances[v]:
+                    distances[v] = d_u + weights[e]
+                    predecessors[v] = u
+                    changed = True
+        if not changed:
+            return None
+
+    return _predecessor_cycle(predecessors)
+
+def _spfa(csr, distances, predecessors, sources):
+    """
+    Queue-based Bellman-Ford: only vertices whose distance dropped are queued,
+    each at most once at a time. Every V relaxations the predecessor graph is
+    checked for a cycle, which exists, and is negative, exactly when the search
+    has run into a negative cycle (the amortised walk-to-root check).
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    num_vertices = csr.num_vertices
+    queue = deque(sources)
+    in_queue = bytearray(num_vertices)
+    for source in queue:
+        in_queue[source] = 1
+    relaxations = 0
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        d_u = distances[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            if d_u + weights[e] < distances[v]:
+                distances[v] = d_u + weights[e]
+                predecessors[v] = u
+                if not in_queue[v]:
+                    in_queue[v] = 1
+                    queue.append(v)
+                relaxations += 1
+                if relaxations == num_vertices:
+                    relaxations = 0
+                    cycle = _predecessor_cycle(predecessors)
+                    if cycle is not None:
+                        return cycle
+
+    return None
+
+def _predecessor_cycle(predecessors):
+    """
+    Finds a cycle in the predecessor graph (every vertex has at most one
+    predecessor), returned as vertex ids in edge order, or None.
+    """
+    num_vertices = len(predecessors)
+    state = bytearray(num_vertices)  # 0: unseen, 1: on the current walk, 2: done
+    for start in range(num_vertices):
+        walk = []
+        v = start
+        while v != -1 and state[v] == 0:
+            state[v] = 1
+            walk.append(v)
+            v = predecessors[v]
+        if v != -1 and state[v] == 1:
+            cycle = walk[walk.index(v):]
+            cycle.reverse()  # The walk follows predecessors, i.e. edges backwards
+            return cycle
+        for u in walk:
+            state[u] = 2
+    return None
@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class BiconnectedComponents:
     """
     Finds biconnected components (BCCs) in an undirected graph.
@@ -11,16 +14,18 @@ class BiconnectedComponents:
         Initializes the BiconnectedComponents object.
 
         Args:
-            graph (dict): An adjacency list representation of the undirected graph.
+            graph (dict or CSRGraph): An adjacency list representation of the undirected graph,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1, 2], 1: [0, 2], 2: [0, 1, 3], 3: [2, 4], 4: [3]}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
-        self.time = 0
-        self.disc = {v: -1 for v in self.vertices}  # Discovery times
-        self.low = {v: -1 for v in self.vertices}   # Low-link values
-        self.parent = {v: -1 for v in self.vertices}
+        self._dfs = IterativeDFS(self.csr, undirected=True)
+        self.disc = self._dfs.disc      # Discovery times, indexed by vertex id
+        self.low = self._dfs.low        # Low-link values, indexed by vertex id
+        self.parent = self._dfs.parent  # DFS-tree parents, -1 for roots
         self.edge_stack = []
         self.bccs = []
 
@@ -32,48 +37,50 @@ class BiconnectedComponents:
             list: A list of lists, where each inner list contains the edges of a BCC.
                   Example: [[(0, 1), (1, 2), (2, 0)], [(2, 3), (3, 4)]]
         """
-        for v in self.vertices:
+        for v in range(self.num_vertices):
             if self.disc[v] == -1:
-                self._find_bccs_util(v)
+                self._dfs.run(v, self._enter, self._edge, self._exit)
 
             # If there are remaining edges in the stack, they form a BCC
             # This handles the case where the entire graph is one BCC
             if self.edge_stack:
                 component = []
                 while self.edge_stack:
-                    component.append(self.edge_stack.pop())
+                    component.append(self._edge_labels(self.edge_stack.pop()))
                 self.bccs.append(component)
 
         return self.bccs
 
-    def _find_bccs_util(self, u):
+    def _enter(self, v):
         """
-        A recursive DFS utility to find BCCs.
+        Pushes the tree edge leading to a newly discovered vertex.
         """
-        self.disc[u] = self.time
-        self.low[u] = self.time
-        self.time += 1
+        if self.parent[v] != -1:
+            self.edge_stack.append((self.parent[v], v))
 
-        for v in self.graph.get(u, []):
-            if v == self.parent[u]:
-                continue
+    def _edge(self, u, v):
+        """
+        Pushes a back edge, only from its lower end so that it is added once.
+        """
+        if self.disc[v] < self.disc[u]: # Important condition to only add edge once
+            self.edge_stack.append((u, v))
 
-            if self.disc[v] != -1:  # Back edge
-                self.low[u] = min(self.low[u], self.disc[v])
-                if self.disc[v] < self.disc[u]: # Important condition to only add edge once
-                    self.edge_stack.append((u, v))
-            else:  # Tree edge
-                self.parent[v] = u
-                self.edge_stack.append((u, v))
-                self._find_bccs_util(v)
-                self.low[u] = min(self.low[u], self.low[v])
+    def _exit(self, v, u):
+        """
+        Checks the tree edge u-v once v's subtree is finished.
+        """
+        # If u is an articulation point, pop edges from stack to form a BCC
+        if u != -1 and self.low[v] >= self.disc[u]:
+            component = []
+            while True:
+                edge = self.edge_stack.pop()
+                component.append(self._edge_labels(edge))
+                if edge == (u, v):
+                    break
+            self.bccs.append(component)
 
-                # If u is an articulation point, pop edges from stack to form a BCC
-                if self.low[v] >= self.disc[u]:
-                    component = []
-                    while True:
-                        edge = self.edge_stack.pop()
-                        component.append(edge)
-                        if edge == (u, v):
-                            break
-                    self.bccs.append(component)
+    def _edge_labels(self, edge):
+        """
+        Maps an edge over vertex ids back to the original vertex labels.
+        """
+        return (self.csr.labels[edge[0]], self.csr.labels[edge[1]])
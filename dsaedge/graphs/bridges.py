@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class Bridges:
     """
     Finds bridges in an undirected graph.
@@ -8,16 +11,18 @@ class Bridges:
         Initializes the Bridges object.
 
         Args:
-            graph (dict): An adjacency list representation of the undirected graph.
+            graph (dict or CSRGraph): An adjacency list representation of the undirected graph,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1, 2], 1: [0, 2], 2: [0, 1, 3], 3: [2, 4], 4: [3, 5], 5: [4]}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
-        self.time = 0
-        self.disc = {v: -1 for v in self.vertices}  # Discovery times
-        self.low = {v: -1 for v in self.vertices}   # Low-link values
-        self.parent = {v: -1 for v in self.vertices}
+        self._dfs = IterativeDFS(self.csr, undirected=True)
+        self.disc = self._dfs.disc      # Discovery times, indexed by vertex id
+        self.low = self._dfs.low        # Low-link values, indexed by vertex id
+        self.parent = self._dfs.parent  # DFS-tree parents, -1 for roots
         self.bridges = []
 
     def find_bridges(self):
@@ -28,31 +33,16 @@ class Bridges:
             list: A list of tuples, where each tuple is a bridge.
                   Example: [(2, 3), (3, 4), (4, 5)]
         """
-        for v in self.vertices:
+        for v in range(self.num_vertices):
             if self.disc[v] == -1:
-                self._find_bridges_util(v)
+                self._dfs.run(v, exit=self._exit)
         return self.bridges
 
-    def _find_bridges_util(self, u):
+    def _exit(self, v, u):
         """
-        A recursive DFS utility to find bridges.
+        Checks the tree edge u-v once v's subtree is finished.
         """
-        self.disc[u] = self.time
-        self.low[u] = self.time
-        self.time += 1
-
-        for v in self.graph.get(u, []):
-            if v == self.parent[u]:
-                continue
-
-            if self.disc[v] != -1:  # Back edge
-                self.low[u] = min(self.low[u], self.disc[v])
-            else:  # Tree edge
-                self.parent[v] = u
-                self._find_bridges_util(v)
-                self.low[u] = min(self.low[u], self.low[v])
-
-                # If the lowest vertex reachable from subtree under v is below u in DFS tree,
-                # then u-v is a bridge.
-                if self.low[v] > self.disc[u]:
-                    self.bridges.append((u, v))
+        # If the lowest vertex reachable from subtree under v is below u in DFS tree,
+        # then u-v is a bridge.
+        if u != -1 and self.low[v] > self.disc[u]:
+            self.bridges.append((self.csr.labels[u], self.csr.labels[v]))
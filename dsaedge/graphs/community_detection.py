@@ -0,0 +1,224 @@
+import random
+
+from .csr_graph import CSRGraph, as_csr
+
+class CommunityDetection:
+    """
+    Near-linear community detection for large undirected graphs:
+
+        louvain             Greedy modularity optimisation. Vertices move to the
+                            neighbouring community with the best modularity gain
+                            until nothing improves, then every community is
+                            collapsed into one vertex and the process repeats.
+        label_propagation   Asynchronous label propagation. Every vertex in turn
+                            adopts the label carrying the most edge weight among
+                            its neighbours, until no label changes.
+
+    Both return the communities together with their modularity. Edge weights are
+    used when the graph is weighted.
+    """
+    def __init__(self, graph):
+        """
+        Initializes the CommunityDetection object.
+
+        Args:
+            graph (dict or CSRGraph): An adjacency list representation of the undirected
+                          graph, with every edge listed from both ends, or a prebuilt CSRGraph.
+                          Example: {'A': ['B', 'C'], 'B': ['A', 'D'], ...}
+                          or {'A': [('B', 2.5), ('C', 1)], ...}
+        """
+        self.graph = graph
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
+
+    def louvain(self, resolution=1.0, seed=None):
+        """
+        Detects communities with the Louvain method.
+
+        Args:
+            resolution (float): Values above 1 favour smaller communities, below 1 larger ones.
+            seed (int, optional): Seed for the order in which vertices are visited.
+
+        Returns:
+            tuple: A tuple containing:
+                - list: The communities, each a list of vertices.
+                - float: The modularity of the partition.
+        """
+        csr = self.csr
+        rng = random.Random(seed)
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        node_weight = [sum(weights[offsets[u]:offsets[u + 1]]) for u in range(csr.num_vertices)]
+        total_weight = sum(node_weight)
+        membership = list(range(csr.num_vertices))  # Original vertex id -> current node
+        if total_weight == 0:
+            return self._communities(membership), 0.0
+
+        while True:
+            community, improved = _move_nodes(offsets, targets, weights, node_weight, total_weight, resolution, rng)
+            if not improved:
+                break
+            # Collapse every community into a single node
+            renumber = {}
+            for c in community:
+                if c not in renumber:
+                    renumber[c] = len(renumber)
+            membership = [renumber[community[node]] for node in membership]
+            offsets, targets, weights, node_weight = _aggregate(offsets, targets, weights, community, renumber)
+
+        return self._communities(membership), self._modularity(membership, resolution)
+
+    def label_propagation(self, seed=None, max_iterations=100):
+        """
+        Detects communities with asynchronous label propagation.
+
+        Args:
+            seed (int, optional): Seed for the visiting order and for breaking ties.
+            max_iterations (int): The maximum number of sweeps over all vertices.
+
+        Returns:
+            tuple: A tuple containing:
+                - list: The communities, each a list of vertices.
+                - float: The modularity of the partition.
+        """
+        csr = self.csr
+        rng = random.Random(seed)
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        labels = list(range(csr.num_vertices))
+        order = list(range(csr.num_vertices))
+
+        for _ in range(max_iterations):
+            rng.shuffle(order)
+            changed = False
+            for u in order:
+                counts = {}
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if v != u:
+                        counts[labels[v]] = counts.get(labels[v], 0) + weights[e]
+                if not counts:
+                    continue
+                best = max(counts.values())
+                # Keeping the current label on a tie guarantees termination
+                if counts.get(labels[u]) == best:
+                    continue
+                labels[u] = rng.choice([label for label, count in counts.items() if count == best])
+                changed = True
+            if not changed:
+                break
+
+        return self._communities(labels), self._modularity(labels)
+
+    def modularity(self, communities, resolution=1.0):
+        """
+        Calculates the modularity of a partition of the vertices.
+
+        Args:
+            communities (list): The communities, each an iterable of vertices.
+            resolution (float): The resolution parameter, as for louvain.
+
+        Returns:
+            float: The modularity, between -0.5 and 1.
+        """
+        membership = [-1] * self.csr.num_vertices
+        for c, community in enumerate(communities):
+            for v in community:
+                membership[self.csr.index[v]] = c
+        if -1 in membership:
+            raise ValueError("Every vertex must be in a community.")
+        return self._modularity(membership, resolution)
+
+    def _modularity(self, membership, resolution=1.0):
+        """
+        Calculates the modularity of a partition given as the community of every vertex id.
+        """
+        csr = self.csr
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        internal = {}  # community -> weight of the edges inside it
+        degree = {}    # community -> total weight of the edges at its vertices
+        for u in range(csr.num_vertices):
+            c = membership[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                degree[c] = degree.get(c, 0) + weights[e]
+                if membership[targets[e]] == c:
+                    internal[c] = internal.get(c, 0) + weights[e]
+        total_weight = sum(degree.values())
+        if total_weight == 0:
+            return 0.0
+        return sum(
+            internal.get(c, 0) / total_weight - resolution * (degree[c] / total_weight) ** 2
+            for c in degree
+        )
+
+    def _communities(self, membership):
+        """
+        Groups the vertices by community, in order of their first vertex.
+        """
+        groups = {}
+        for v, c in enumerate(membership):
+            groups.setdefault(c, []).append(self.vertices[v])
+        return list(groups.values())
+
+
+def _move_nodes(offsets, targets, weights, node_weight, total_weight, resolution, rng):
+    """
+    The Louvain local-moving phase: repeatedly moves each node to the
+    neighbouring community with the largest modularity gain.
+
+    Returns:
+        tuple: The community of every node, and whether any node moved.
+    """
+    num_nodes = len(node_weight)
+    community = list(range(num_nodes))
+    community_weight = list(node_weight)  # Total node weight of every community
+    order = list(range(num_nodes))
+    rng.shuffle(order)
+    improved = False
+
+    moved = True
+    while moved:
+        moved = False
+        for u in order:
+            current, k_u = community[u], node_weight[u]
+            links = {}  # community -> weight of the edges from u into it
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v != u:
+                    links[community[v]] = links.get(community[v], 0) + weights[e]
+
+            # Take u out of its community, then put it back where the gain is largest
+            community_weight[current] -= k_u
+            scale = resolution * k_u / total_weight
+            best, best_gain = current, links.get(current, 0) - community_weight[current] * scale
+            for c, weight in links.items():
+                gain = weight - community_weight[c] * scale
+                if gain > best_gain:
+                    best, best_gain = c, gain
+            community_weight[best] += k_u
+            if best != current:
+                community[u] = best
+                moved = improved = True
+
+    return community, improved
+
+
+def _aggregate(offsets, targets, weights, community, renumber):
+    """
+    Builds the graph whose nodes are the communities. The edges inside a
+    community become a self-loop, so every node keeps its total weight.
+
+    Returns:
+        tuple: The offsets, targets and weights arrays and the node weights.
+    """
+    edge_weight = {}
+    for u in range(len(community)):
+        cu = renumber[community[u]]
+        for e in range(offsets[u], offsets[u + 1]):
+            key = (cu, renumber[community[targets[e]]])
+            edge_weight[key] = edge_weight.get(key, 0) + weights[e]
+
+    num_nodes = len(renumber)
+    aggregated = CSRGraph.from_edges(num_nodes, [(cu, cv, w) for (cu, cv), w in edge_weight.items()])
+    node_weight = [0] * num_nodes
+    for (cu, _), w in edge_weight.items():
+        node_weight[cu] += w
+    return aggregated.offsets, aggregated.targets, aggregated.weights, node_weight
@@ -0,0 +1,366 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the array module is used otherwise.
+    np = None
+
+
+class CSRGraph:
+    """
+    A compact, read-only graph stored in Compressed Sparse Row (CSR) form.
+
+    Vertices are relabelled to the integer ids 0..n-1. The out-edges of vertex i
+    are stored contiguously: their targets are targets[offsets[i]:offsets[i + 1]]
+    and their weights are the matching slice of weights. An undirected graph is
+    stored with each edge in both directions, exactly as in the adjacency-dict
+    format used throughout dsaedge.graphs.
+    """
+    def __init__(self, offsets, targets, weights=None, labels=None, weighted=None):
+        """
+        Initializes the CSRGraph from prebuilt arrays.
+
+        Args:
+            offsets (sequence): n + 1 edge offsets, offsets[0] == 0.
+            targets (sequence): Target vertex id of every edge.
+            weights (sequence, optional): Weight of every edge. Defaults to 1 for all edges.
+            labels (list, optional): The original vertex label of every id.
+                                     Defaults to the ids themselves.
+            weighted (bool, optional): Whether the weights are meaningful. Defaults to
+                                       True when weights are given.
+        """
+        self.offsets = array('q', offsets)
+        self.targets = array('q', targets)
+        if len(self.offsets) == 0 or self.offsets[0] != 0:
+            raise ValueError("offsets must start with 0.")
+        if self.offsets[-1] != len(self.targets):
+            raise ValueError("offsets[-1] must equal the number of edges.")
+
+        if weights is None:
+            self.weights = array('q', [1]) * len(self.targets)
+        else:
+            weights = list(weights)
+            typecode = 'q' if all(isinstance(w, int) for w in weights) else 'd'
+            self.weights = array(typecode, weights)
+        if len(self.weights) != len(self.targets):
+            raise ValueError("weights must have one entry per edge.")
+        self.weighted = weights is not None if weighted is None else weighted
+
+        num_vertices = len(self.offsets) - 1
+        self.labels = list(range(num_vertices)) if labels is None else list(labels)
+        if len(self.labels) != num_vertices:
+            raise ValueError("labels must have one entry per vertex.")
+        self.index = {label: i for i, label in enumerate(self.labels)}
+
+    @classmethod
+    def from_adjacency(cls, graph, weighted=None):
+        """
+        Builds a CSRGraph from the adjacency-dict format used by dsaedge.graphs.
+
+        Three shapes of adjacency are understood:
+            - unweighted lists:  {'A': ['B', 'C'], ...}
+            - weighted lists:    {'A': [('B', 1), ('C', 4)], ...}
+            - weighted dicts:    {'A': {'B': 1, 'C': 4}, ...}
+
+        Whether lists hold (neighbor, weight) pairs is decided once for the whole
+        graph, never per entry, so tuple labels such as grid coordinates work in
+        unweighted lists. By default the lists are weighted only if every entry is
+        a 2-tuple and at least one entry is not itself a vertex (a key of graph).
+
+        Vertices keep the order of the dict keys; vertices that only appear as
+        neighbours are appended after them.
+
+        Args:
+            graph (dict): The adjacency dict.
+            weighted (bool, optional): Whether the lists hold (neighbor, weight) pairs.
+                                       Detected from the entries by default.
+
+        Returns:
+            CSRGraph: The compact graph.
+        """
+        if weighted is None:
+            weighted = _has_weighted_lists(graph)
+        labels = list(graph.keys())
+        index = {label: i for i, label in enumerate(labels)}
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = []
+        has_weights = False
+
+        for u in graph:
+            edges = graph[u]
+            if isinstance(edges, dict):
+                edges = edges.items()
+                has_weights = True
+            elif weighted:
+                has_weights = has_weights or len(edges) > 0
+            else:
+                edges = ((v, 1) for v in edges)
+            for v, w in edges:
+                i = index.get(v)
+                if i is None:
+                    i = index[v] = len(labels)
+                    labels.append(v)
+                targets.append(i)
+                weights.append(w)
+            offsets.append(len(targets))
+
+        # Neighbour-only vertices have no out-edges.
+        for _ in range(len(offsets) - 1, len(labels)):
+            offsets.append(len(targets))
+
+        return cls(offsets, targets, weights, labels, has_weights)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds a CSRGraph from a graph_representation.Graph instance.
+
+        Args:
+            graph (Graph): The graph whose adj_list should be compacted.
+
+        Returns:
+            CSRGraph: The compact, weighted graph.
+        """
+        return cls.from_adjacency(graph.adj_list, weighted=True)
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges, labels=None):
+        """
+        Builds a CSRGraph from an edge list over integer ids using a counting sort,
+        without materialising an adjacency dict.
+
+        Args:
+            num_vertices (int): The number of vertices.
+            edges (iterable): (u, v) or (u, v, weight) tuples with 0 <= u, v < num_vertices.
+            labels (list, optional): The original vertex label of every id.
+
+        Returns:
+            CSRGraph: The compact graph.
+        """
+        sources, dests, weights = [], [], []
+        weighted = False
+        for edge in edges:
+            if len(edge) == 3:
+                weighted = True
+                weights.append(edge[2])
+            else:
+                weights.append(1)
+            sources.append(edge[0])
+            dests.append(edge[1])
+
+        offsets = [0] * (num_vertices + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(num_vertices):
+            offsets[i + 1] += offsets[i]
+
+        position = offsets[:-1]
+        targets = [0] * len(dests)
+        ordered_weights = [0] * len(dests)
+        for u, v, w in zip(sources, dests, weights):
+            e = position[u]
+            targets[e] = v
+            ordered_weights[e] = w
+            position[u] = e + 1
+
+        return cls(offsets, targets, ordered_weights, labels, weighted)
+
+    @property
+    def num_vertices(self):
+        """
+        Returns the number of vertices.
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        """
+        Returns the number of stored (directed) edges.
+        """
+        return len(self.targets)
+
+    def id_of(self, label):
+        """
+        Returns the integer id of a vertex label.
+        Raises a KeyError if the label is not in the graph.
+        """
+        return self.index[label]
+
+    def label_of(self, vertex_id):
+        """
+        Returns the original label of an integer vertex id.
+        """
+        return self.labels[vertex_id]
+
+    def out_degree(self, vertex_id):
+        """
+        Returns the number of out-edges of a vertex id in O(1).
+        """
+        return self.offsets[vertex_id + 1] - self.offsets[vertex_id]
+
+    def neighbors(self, vertex_id):
+        """
+        Returns the target ids of the out-edges of a vertex id.
+        """
+        return self.targets[self.offsets[vertex_id]:self.offsets[vertex_id + 1]]
+
+    def edges(self, vertex_id):
+        """
+        Returns (target id, weight) pairs for the out-edges of a vertex id.
+        """
+        start, end = self.offsets[vertex_id], self.offsets[vertex_id + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def transpose(self):
+        """
+        Computes the transpose (all edges reversed) as a new CSRGraph.
+        """
+        offsets, targets = self.offsets, self.targets
+        reversed_edges = (
+            (targets[e], u, self.weights[e])
+            for u in range(self.num_vertices)
+            for e in range(offsets[u], offsets[u + 1])
+        )
+        transposed = CSRGraph.from_edges(self.num_vertices, reversed_edges, self.labels)
+        transposed.weighted = self.weighted
+        return transposed
+
+    def to_adjacency_list(self, weighted=None):
+        """
+        Converts back to the adjacency-dict format keyed by the original labels.
+
+        Args:
+            weighted (bool, optional): Emit (neighbor, weight) tuples instead of bare
+                                       neighbours. Defaults to self.weighted.
+
+        Returns:
+            dict: {label: [neighbor, ...]} or {label: [(neighbor, weight), ...]}.
+        """
+        weighted = self.weighted if weighted is None else weighted
+        labels, offsets, targets, weights = self.labels, self.offsets, self.targets, self.weights
+        adjacency = {}
+        for u in range(self.num_vertices):
+            start, end = offsets[u], offsets[u + 1]
+            if weighted:
+                adjacency[labels[u]] = [(labels[targets[e]], weights[e]) for e in range(start, end)]
+            else:
+                adjacency[labels[u]] = [labels[targets[e]] for e in range(start, end)]
+        return adjacency
+
+    def to_adjacency_dict(self):
+        """
+        Converts to the weighted dict-of-dicts format, {label: {neighbor: weight}}.
+        """
+        labels, offsets, targets, weights = self.labels, self.offsets, self.targets, self.weights
+        return {
+            labels[u]: {labels[targets[e]]: weights[e] for e in range(offsets[u], offsets[u + 1])}
+            for u in range(self.num_vertices)
+        }
+
+    def to_numpy(self):
+        """
+        Returns zero-copy NumPy views of the offsets, targets and weights arrays.
+        Raises an ImportError if NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("CSRGraph.to_numpy requires NumPy.")
+        weight_dtype = np.int64 if self.weights.typecode == 'q' else np.float64
+        return (
+            np.frombuffer(self.offsets, dtype=np.int64),
+            np.frombuffer(self.targets, dtype=np.int64),
+            np.frombuffer(self.weights, dtype=weight_dtype),
+        )
+
+    def to_shared_memory(self):
+        """
+        Copies the offsets, targets and weights arrays into one block of shared
+        memory, so that worker processes can attach to the graph without pickling it.
+
+        The caller owns the block and must close() and unlink() it when done.
+
+        Returns:
+            tuple: The SharedMemory block and a small picklable descriptor to pass
+                   to CSRGraph.from_shared_memory in the workers.
+        """
+        from multiprocessing import shared_memory
+
+        parts = [memoryview(a).cast('B') for a in (self.offsets, self.targets, self.weights)]
+        block = shared_memory.SharedMemory(create=True, size=max(1, sum(len(p) for p in parts)))
+        start = 0
+        for part in parts:
+            block.buf[start:start + len(part)] = part
+            start += len(part)
+        descriptor = (block.name, self.num_vertices, self.num_edges, self.weights.typecode, self.weighted)
+        return block, descriptor
+
+    @classmethod
+    def from_shared_memory(cls, descriptor):
+        """
+        Attaches to a graph published with to_shared_memory, without copying it.
+
+        The arrays of the returned graph are read-only memoryviews into the shared
+        block, and its labels are the vertex ids. The block must stay referenced
+        for as long as the graph is in use.
+
+        Args:
+            descriptor (tuple): The descriptor returned by to_shared_memory.
+
+        Returns:
+            tuple: The attached CSRGraph and its SharedMemory block.
+        """
+        from multiprocessing import shared_memory
+
+        name, num_vertices, num_edges, typecode, weighted = descriptor
+        block = shared_memory.SharedMemory(name=name)
+        buf = block.buf.toreadonly()
+        offsets_end = 8 * (num_vertices + 1)
+        targets_end = offsets_end + 8 * num_edges
+
+        graph = cls.__new__(cls)
+        graph.offsets = buf[:offsets_end].cast('q')
+        graph.targets = buf[offsets_end:targets_end].cast('q')
+        graph.weights = buf[targets_end:targets_end + 8 * num_edges].cast(typecode)
+        graph.weighted = weighted
+        # Ids double as labels, so a range serves as both the labels and the index.
+        graph.labels = graph.index = range(num_vertices)
+        return graph, block
+
+    def __len__(self):
+        return self.num_vertices
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __repr__(self):
+        return f"CSRGraph(num_vertices={self.num_vertices}, num_edges={self.num_edges})"
+
+
+def _has_weighted_lists(graph):
+    """
+    Decides whether the adjacency lists of graph hold (neighbor, weight) pairs:
+    every list entry is a 2-tuple, and at least one is not a vertex of graph.
+    """
+    any_pair = False
+    for edges in graph.values():
+        if isinstance(edges, dict):
+            continue
+        for entry in edges:
+            if not (isinstance(entry, tuple) and len(entry) == 2):
+                return False
+            if not any_pair and entry not in graph:
+                any_pair = True
+    return any_pair
+
+
+def as_csr(graph):
+    """
+    Returns graph unchanged if it is already a CSRGraph, otherwise compacts an
+    adjacency dict (or a graph_representation.Graph) into one.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    if hasattr(graph, 'adj_list'):
+        return CSRGraph.from_graph(graph)
+    return CSRGraph.from_adjacency(graph)
+
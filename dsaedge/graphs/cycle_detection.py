@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class CycleDetection:
     """
     Provides methods to detect cycles in both directed and undirected graphs.
@@ -7,12 +10,14 @@ class CycleDetection:
         Initializes the CycleDetection object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1, 2], 1: [2], 2: [0, 3], 3: [3]}
             directed (bool): True if the graph is directed, False otherwise.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.directed = directed
 
     def has_cycle(self):
@@ -30,56 +35,28 @@ class CycleDetection:
     def _has_cycle_directed(self):
         """
         Detects a cycle in a directed graph using DFS.
+        An edge back to a vertex still on the DFS path closes a cycle.
         """
-        visited = {v: False for v in self.vertices}
-        recursion_stack = {v: False for v in self.vertices}
-
-        for v in self.vertices:
-            if not visited[v]:
-                if self._dfs_directed_util(v, visited, recursion_stack):
-                    return True
-        return False
-
-    def _dfs_directed_util(self, u, visited, recursion_stack):
-        """
-        A recursive DFS utility for directed cycle detection.
-        """
-        visited[u] = True
-        recursion_stack[u] = True
+        dfs = IterativeDFS(self.csr)
+        back_edge = lambda u, v: dfs.state[v] == IterativeDFS.GRAY
 
-        for v in self.graph.get(u, []):
-            if not visited[v]:
-                if self._dfs_directed_util(v, visited, recursion_stack):
+        for v in range(self.csr.num_vertices):
+            if dfs.disc[v] == -1:
+                if dfs.run(v, edge=back_edge):
                     return True
-            elif recursion_stack[v]:
-                return True
-
-        recursion_stack[u] = False
         return False
 
     def _has_cycle_undirected(self):
         """
         Detects a cycle in an undirected graph using DFS.
+        Any edge to an already discovered vertex other than the DFS-tree parent
+        closes a cycle.
         """
-        visited = {v: False for v in self.vertices}
+        dfs = IterativeDFS(self.csr, undirected=True)
+        any_edge = lambda u, v: True
 
-        for v in self.vertices:
-            if not visited[v]:
-                if self._dfs_undirected_util(v, visited, -1): # -1 as parent for starting node
+        for v in range(self.csr.num_vertices):
+            if dfs.disc[v] == -1:
+                if dfs.run(v, edge=any_edge):
                     return True
         return False
-
-    def _dfs_undirected_util(self, u, visited, parent):
-        """
-        A recursive DFS utility for undirected cycle detection.
-        """
-        visited[u] = True
-
-        for v in self.graph.get(u, []):
-            if not visited[v]:
-                if self._dfs_undirected_util(v, visited, u):
-                    return True
-            elif v != parent:
-                return True
-
-        return False
@@ -1,52 +1,130 @@
-import heapq
+from ..heaps.indexed_min_heap import IndexedMinHeap
+from .csr_graph import as_csr
 
 class Dijkstra:
     """
     Implementation of Dijkstra's algorithm for finding the shortest paths
     from a single source to all other vertices in a weighted graph.
     """
-    def __init__(self, graph):
+    def __init__(self, graph, heap_factory=IndexedMinHeap):
         """
         Initializes the Dijkstra object with a graph.
 
         Args:
-            graph (dict): A dictionary representing the graph's adjacency list.
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
                           Example: {'A': [('B', 1), ('C', 4)], 'B': [('A', 1), ...]}
+            heap_factory (callable): Creates the empty decrease-key priority queue, e.g.
+                          IndexedMinHeap, lambda: IndexedMinHeap(arity=4) or PairingHeap.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.heap_factory = heap_factory
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
-    def find_shortest_paths(self, start_vertex):
+    def find_shortest_paths(self, sources, targets=None, cutoff=None):
         """
-        Calculates the shortest paths from a given start vertex.
+        Calculates the shortest paths from one or more start vertices.
+
+        The search stops as soon as every target is settled, or once the nearest
+        unsettled vertex lies beyond the cutoff, so point-to-point and bounded-radius
+        queries only touch the part of the graph they need.
 
         Args:
-            start_vertex: The vertex from which to start the search.
+            sources: The vertex from which to start the search, or an iterable of
+                     vertices that all start at distance 0 (multi-source search).
+            targets (optional): A vertex or iterable of vertices; the search stops once
+                                all of them are settled.
+            cutoff (float, optional): Only vertices within this distance are settled.
 
         Returns:
             tuple: A tuple containing:
                 - distances (dict): A dictionary of the shortest distances from the start vertex.
                 - predecessors (dict): A dictionary of predecessors for path reconstruction.
+            Both are sparse, in order of increasing distance, and only hold settled
+            vertices. A plain single-source call (no targets, no cutoff) still reports
+            every vertex, with unreachable ones at infinity.
+        """
+        csr = self.csr
+        source_ids = self._resolve(sources, "Start vertex not in graph.")
+        target_ids = None if targets is None else self._resolve(targets, "Target vertex not in graph.")
+        settled, predecessors = self._search(source_ids, target_ids, cutoff)
+
+        labels = csr.labels
+        if target_ids is None and cutoff is None and self._is_vertex(sources):
+            distance_map = {label: float('infinity') for label in labels}
+            predecessor_map = {label: None for label in labels}
+        else:
+            distance_map, predecessor_map = {}, {}
+        for v, distance in settled.items():
+            distance_map[labels[v]] = distance
+            p = predecessors[v]
+            predecessor_map[labels[v]] = labels[p] if p != -1 else None
+        return distance_map, predecessor_map
+
+    def _search(self, source_ids, target_ids=None, cutoff=None):
         """
-        if start_vertex not in self.vertices:
-            raise ValueError("Start vertex not in graph.")
+        Runs the search over vertex ids.
 
-        distances = {vertex: float('infinity') for vertex in self.vertices}
-        predecessors = {vertex: None for vertex in self.vertices}
-        distances[start_vertex] = 0
-        pq = [(0, start_vertex)]  # (distance, vertex)
+        Returns:
+            tuple: settled (dict of vertex id -> final distance, in settling order)
+                   and predecessors (dict of vertex id -> predecessor id, -1 for sources).
+        """
+        csr = self.csr
+        offsets, targets_arr, weights = csr.offsets, csr.targets, csr.weights
+        distances = {}     # Tentative distances, by vertex id
+        predecessors = {}  # Tentative predecessors, by vertex id (-1 for sources)
+        settled = {}       # Final distances, by vertex id, in settling order
+        pq = self.heap_factory()  # vertex id -> tentative distance, one entry per vertex
+        for source in source_ids:
+            distances[source] = 0
+            predecessors[source] = -1
+            pq.push_or_decrease(source, 0)
+        remaining = set(target_ids) if target_ids is not None else None
 
         while pq:
-            current_distance, current_vertex = heapq.heappop(pq)
+            u, current_distance = pq.pop()
 
-            if current_distance > distances[current_vertex]:
-                continue
+            if cutoff is not None and current_distance > cutoff:
+                break
+            settled[u] = current_distance
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
 
-            for neighbor, weight in self.graph.get(current_vertex, []):
-                distance = current_distance + weight
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    predecessors[neighbor] = current_vertex
-                    heapq.heappush(pq, (distance, neighbor))
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets_arr[e]
+                distance = current_distance + weights[e]
+                if cutoff is not None and distance > cutoff:
+                    continue
+                if v not in settled and distance < distances.get(v, float('infinity')):
+                    distances[v] = distance
+                    predecessors[v] = u
+                    pq.push_or_decrease(v, distance)
 
-        return distances, predecessors
+        return settled, predecessors
+
+    def _resolve(self, vertices, message):
+        """
+        Maps a vertex, or an iterable of vertices, to a list of vertex ids.
+        """
+        index = self.csr.index
+        if self._is_vertex(vertices):
+            return [index[vertices]]
+        try:
+            vertex_ids = [index[v] for v in vertices]
+        except (KeyError, TypeError):
+            raise ValueError(message)
+        if not vertex_ids:
+            raise ValueError(message)
+        return vertex_ids
+
+    def _is_vertex(self, vertex):
+        """
+        Checks whether a value is a single vertex of the graph (as opposed to an iterable of them).
+        """
+        try:
+            return vertex in self.csr.index
+        except TypeError:  # Unhashable, e.g. a list of vertices
+            return False
@@ -1,50 +1,217 @@
+from .csr_graph import CSRGraph
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python version is used otherwise.
+    np = None
 
-def floyd_warshall(graph):
+
+def floyd_warshall(graph, use_numpy=False, block_size=None):
     """
     Implements the Floyd-Warshall algorithm to find the shortest paths
     between all pairs of vertices in a weighted graph.
 
     Args:
-        graph (list of lists): An adjacency matrix representation of the graph.
+        graph (list of lists, ndarray or CSRGraph): An adjacency matrix representation of the graph.
                                graph[i][j] is the weight of the edge from i to j.
                                If there is no edge, use float('inf').
                                Self-loops (graph[i][i]) should be 0.
+                               A CSRGraph is expanded into such a matrix over its vertex ids.
+        use_numpy (bool): Relax each intermediate vertex as one broadcasted np.minimum
+                          over the whole matrix. Always on for ndarray input.
+        block_size (int, optional): With NumPy, process the matrix in cache-sized
+                                    block_size x block_size tiles (blocked Floyd-Warshall).
 
     Returns:
         list of lists: A matrix where distances[i][j] is the shortest distance
-                       from vertex i to vertex j.
+                       from vertex i to vertex j (an ndarray on the NumPy path),
+                       or None if the graph contains a negative cycle.
+    """
+    distances, _, negative_cycle = _solve(graph, use_numpy, block_size, with_paths=False)
+    return None if negative_cycle else distances
+
+
+def floyd_warshall_with_paths(graph, use_numpy=False, block_size=None):
+    """
+    Runs Floyd-Warshall and also builds a next-hop matrix for path reconstruction.
+
+    Args:
+        graph: As for floyd_warshall.
+        use_numpy (bool): As for floyd_warshall.
+        block_size (int, optional): Selects the NumPy path, but paths are always built
+                                    with the per-vertex relaxation: the blocked update
+                                    order can leave next hops circling on zero-weight
+                                    cycles.
+
+    Returns:
+        tuple: A tuple containing:
+            - distances (list of lists or ndarray): The shortest distances.
+            - next_vertex (list of lists or ndarray): next_vertex[i][j] is the vertex
+              after i on a shortest path from i to j, or None (-1 on the NumPy path)
+              if j is unreachable from i.
+            - bool: True if a negative cycle is detected, False otherwise.
+              Distances and paths through a negative cycle are not meaningful.
+    """
+    return _solve(graph, use_numpy, block_size, with_paths=True)
+
+
+def reconstruct_path(next_vertex, start, end):
+    """
+    Rebuilds the shortest path from start to end from a next-hop matrix.
+
+    Returns:
+        list: The vertices on the path, or None if end is unreachable from start.
+    """
+    if start == end:
+        return [start]
+    hop = next_vertex[start][end]
+    if hop is None or hop < 0:
+        return None
+    path = [start]
+    while start != end:
+        start = int(next_vertex[start][end])
+        path.append(start)
+        if len(path) > len(next_vertex):  # Only possible around a negative cycle
+            return None
+    return path
+
+
+def _solve(graph, use_numpy, block_size, with_paths):
+    """
+    Dispatches to the pure-Python or NumPy implementation.
+    """
+    if isinstance(graph, CSRGraph):
+        graph = _csr_to_matrix(graph)
+
+    if use_numpy or block_size is not None or (np is not None and isinstance(graph, np.ndarray)):
+        if np is None:
+            raise ImportError("The NumPy Floyd-Warshall path requires NumPy.")
+        return _floyd_warshall_numpy(graph, block_size, with_paths)
+    return _floyd_warshall_python(graph, with_paths)
+
+
+def _floyd_warshall_python(graph, with_paths):
+    """
+    The classic triple loop, with the k-th row and the (i, k) entry hoisted out
+    of the innermost loop.
     """
+    inf = float('inf')
     num_vertices = len(graph)
     distances = list(map(lambda i: list(map(lambda j: j, i)), graph))
 
-    # Path reconstruction matrix (optional, but useful)
-    # next_vertex = [[None for _ in range(num_vertices)] for _ in range(num_vertices)]
-    # for i in range(num_vertices):
-    #     for j in range(num_vertices):
-    #         if i != j and distances[i][j] != float('inf'):
-    #             next_vertex[i][j] = j
+    # Path reconstruction matrix
+    next_vertex = None
+    if with_paths:
+        next_vertex = [[None] * num_vertices for _ in range(num_vertices)]
+        for i in range(num_vertices):
+            for j in range(num_vertices):
+                if i == j:
+                    next_vertex[i][j] = i
+                elif distances[i][j] != inf:
+                    next_vertex[i][j] = j
 
     # Iterate through all possible intermediate vertices
     for k in range(num_vertices):
+        row_k = distances[k]
         # Pick all vertices as source one by one
         for i in range(num_vertices):
-            # Pick all vertices as destination for the above picked source
+            d_ik = distances[i][k]
+            if d_ik == inf:
+                continue
+            row_i = distances[i]
+            next_i = next_vertex[i] if with_paths else None
+            # Pick all vertices as destination for the above picked source.
+            # If vertex k is on the shortest path from i to j, update distances[i][j].
             for j in range(num_vertices):
-                # If vertex k is on the shortest path from i to j,
-                # then update the value of distances[i][j]
-                if distances[i][k] != float('inf') and distances[k][j] != float('inf'):
-                    if distances[i][j] > distances[i][k] + distances[k][j]:
-                        distances[i][j] = distances[i][k] + distances[k][j]
-                        # next_vertex[i][j] = next_vertex[i][k]
+                candidate = d_ik + row_k[j]
+                if candidate < row_i[j]:
+                    row_i[j] = candidate
+                    if with_paths:
+                        next_i[j] = next_i[k]
 
     # Check for negative cycles (if distances[i][i] < 0 for any i)
-    for i in range(num_vertices):
-        if distances[i][i] < 0:
-            print("Graph contains a negative cycle!")
-            # In a real application, you might raise an error or handle this differently
-            return None # Or return distances with negative infinities
+    negative_cycle = any(distances[i][i] < 0 for i in range(num_vertices))
+    return distances, next_vertex, negative_cycle
+
+
+def _floyd_warshall_numpy(graph, block_size, with_paths):
+    """
+    Vectorised Floyd-Warshall: each intermediate vertex k relaxes the whole matrix
+    with one broadcasted np.minimum, or, with block_size, the blocked variant.
+    """
+    distances = np.array(graph, dtype=np.float64)
+    num_vertices = distances.shape[0]
+
+    next_vertex = None
+    if with_paths:
+        next_vertex = np.where(np.isfinite(distances), np.arange(num_vertices)[None, :], -1)
+        np.fill_diagonal(next_vertex, np.arange(num_vertices))
+
+    if block_size is None or with_paths:
+        for k in range(num_vertices):
+            _relax(distances, next_vertex, slice(None), slice(None), k)
+    else:
+        _blocked(distances, num_vertices, block_size)
+
+    negative_cycle = bool((np.diagonal(distances) < 0).any())
+    return distances, next_vertex, negative_cycle
 
-    return distances
 
+def _relax(distances, next_vertex, rows, cols, k):
+    """
+    Relaxes distances[rows, cols] through the intermediate vertex k, in place.
+    """
+    candidate = distances[rows, k][:, None] + distances[k, cols][None, :]
+    if next_vertex is None:
+        np.minimum(distances[rows, cols], candidate, out=candidate)
+        distances[rows, cols] = candidate
+        return
+    improved = candidate < distances[rows, cols]
+    distances[rows, cols] = np.where(improved, candidate, distances[rows, cols])
+    next_vertex[rows, cols] = np.where(improved, next_vertex[rows, k][:, None], next_vertex[rows, cols])
+
+
+def _blocked(distances, num_vertices, block_size):
+    """
+    Blocked (tiled) Floyd-Warshall. For each diagonal block K, the row and column
+    panels through K are relaxed vertex by vertex, after which every remaining
+    tile is updated at once with a min-plus product over K, so each tile is
+    streamed through the cache once per block instead of once per vertex.
+    """
+    for start in range(0, num_vertices, block_size):
+        block = slice(start, min(start + block_size, num_vertices))
 
+        # Phases 1 and 2: the diagonal block and the row/column panels through it
+        for k in range(block.start, block.stop):
+            _relax(distances, None, block, slice(None), k)
+            _relax(distances, None, slice(None), block, k)
+
+        # Phase 3: the remaining tiles, via min-plus products with the final panels
+        for row_start in range(0, num_vertices, block_size):
+            rows = slice(row_start, min(row_start + block_size, num_vertices))
+            if rows == block:
+                continue
+            column_panel = distances[rows, block]
+            for col_start in range(0, num_vertices, block_size):
+                cols = slice(col_start, min(col_start + block_size, num_vertices))
+                if cols == block:
+                    continue
+                candidates = column_panel[:, :, None] + distances[block, cols][None, :, :]
+                np.minimum(distances[rows, cols], candidates.min(axis=1), out=distances[rows, cols])
+
+
+def _csr_to_matrix(csr):
+    """
+    Expands a CSRGraph into a dense adjacency matrix over its vertex ids,
+    keeping the lightest of any parallel edges.
+    """
+    num_vertices = csr.num_vertices
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    matrix = [[float('inf')] * num_vertices for _ in range(num_vertices)]
+    for u in range(num_vertices):
+        row = matrix[u]
+        row[u] = 0
+        for e in range(offsets[u], offsets[u + 1]):
+            if weights[e] < row[targets[e]]:
+                row[targets[e]] = weights[e]
+    return matrix
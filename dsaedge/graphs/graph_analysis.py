@@ -5,6 +5,7 @@ from .graph_coloring import GraphColoring
 from .articulation_points import ArticulationPoints
 from .bridges import Bridges
 from .tarjan import Tarjan
+from .csr_graph import as_csr
 
 class GraphAnalysis:
     """
@@ -16,18 +17,21 @@ class GraphAnalysis:
         Initializes the GraphAnalysis object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph. The graph is compacted once and
+                          shared by every analysis.
             directed (bool): Whether the graph is directed.
         """
         self.graph = graph
+        self.csr = as_csr(graph)
         self.directed = directed
-        self.vertices = list(graph.keys())
+        self.vertices = self.csr.labels
 
     def get_basic_stats(self):
         """
         Returns basic statistics of the graph.
         """
-        stats = GraphStatistics(self.graph, self.directed)
+        stats = GraphStatistics(self.csr, self.directed)
         return {
             "num_vertices": stats.get_number_of_vertices(),
             "num_edges": stats.get_number_of_edges(),
@@ -39,7 +43,7 @@ class GraphAnalysis:
         """
         Checks if the graph contains cycles.
         """
-        cycle_detector = CycleDetection(self.graph, self.directed)
+        cycle_detector = CycleDetection(self.csr, self.directed)
         return cycle_detector.has_cycle()
 
     def find_connected_components(self):
@@ -48,13 +52,13 @@ class GraphAnalysis:
         If the graph is directed, it finds strongly connected components.
         """
         if self.directed:
-            tarjan = Tarjan(self.graph)
+            tarjan = Tarjan(self.csr)
             return tarjan.find_sccs()
         else:
             # Using traversal to find connected components
             visited = {v: False for v in self.vertices}
             components = []
-            traversal = GraphTraversal(self.graph)
+            traversal = GraphTraversal(self.csr)
             for v in self.vertices:
                 if not visited[v]:
                     component = traversal.bfs(v) # or dfs
@@ -69,8 +73,8 @@ class GraphAnalysis:
         """
         if self.directed:
             return "This analysis is for undirected graphs."
-        ap_finder = ArticulationPoints(self.graph)
-        br_finder = Bridges(self.graph)
+        ap_finder = ArticulationPoints(self.csr)
+        br_finder = Bridges(self.csr)
         return {
             "articulation_points": ap_finder.find_articulation_points(),
             "bridges": br_finder.find_bridges()
@@ -80,5 +84,5 @@ class GraphAnalysis:
         """
         Performs a greedy coloring of the graph.
         """
-        coloring = GraphColoring(self.graph)
+        coloring = GraphColoring(self.csr)
         return coloring.greedy_coloring()
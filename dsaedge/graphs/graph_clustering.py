@@ -1,10 +1,20 @@
+import math
+import os
+import random
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .csr_graph import CSRGraph
 
 class GraphClustering:
     """
     Implements the Girvan-Newman algorithm for community detection in graphs.
     This algorithm identifies communities by progressively removing edges with the
     highest betweenness centrality.
+
+    Edge betweenness is computed with Brandes' algorithm over integer vertex ids.
+    Betweenness never crosses between connected components, so after an edge is
+    removed only the component that contained it is recomputed.
     """
     def __init__(self, graph):
         """
@@ -13,90 +23,256 @@ class GraphClustering:
         Args:
             graph (dict): An adjacency list representation of the undirected graph.
                           Example: {'A': ['B', 'C'], 'B': ['A', 'D'], ...}
+                          A CSRGraph is accepted and expanded, since edges are removed
+                          while the algorithm runs.
         """
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_adjacency_list(weighted=False)
         self.graph = graph
         self.vertices = list(graph.keys())
         self.num_vertices = len(self.vertices)
-        self.original_graph = {u: list(v) for u, v in graph.items()} # Deep copy for restoration
 
     def girvan_newman(self):
         """
         Performs the Girvan-Newman algorithm.
         This is a simplified version that returns the components after one iteration
-        of removing the highest betweenness edge(s).
+        of removing the highest betweenness edge(s). See iter_girvan_newman for the
+        full dendrogram.
 
         Returns:
             list: A list of lists, where each inner list is a community (a connected component).
         """
+        labels, adjacency = self._id_adjacency()
+
         # 1. Calculate betweenness for all edges
-        edge_betweenness = self._calculate_edge_betweenness()
+        edge_betweenness = {}
+        for members in self._components(adjacency):
+            edge_betweenness.update(_component_betweenness(adjacency, members))
 
         if not edge_betweenness:
             return [self.vertices] # Graph is a single node or disconnected nodes
 
         # 2. Find the edge(s) with the highest betweenness
         max_betweenness = max(edge_betweenness.values())
-        edges_to_remove = [edge for edge, betweenness in edge_betweenness.items() if betweenness == max_betweenness]
+        edges_to_remove = [
+            edge for edge, betweenness in edge_betweenness.items()
+            if math.isclose(betweenness, max_betweenness, rel_tol=1e-9)
+        ]
 
-        # 3. Remove the edge(s)
+        # 3. Remove the edge(s) from the working copy
         for u, v in edges_to_remove:
-            if v in self.graph[u]: self.graph[u].remove(v)
-            if u in self.graph[v]: self.graph[v].remove(u)
+            adjacency[u].remove(v)
+            adjacency[v].remove(u)
 
         # 4. Find the connected components (communities)
-        communities = self._get_connected_components()
+        return [[labels[v] for v in members] for members in self._components(adjacency)]
 
-        # Restore graph for potential future calls
-        self.graph = {u: list(v) for u, v in self.original_graph.items()}
+    def iter_girvan_newman(self, k=None, seed=None, n_jobs=1):
+        """
+        Runs the full Girvan-Newman algorithm, removing one highest-betweenness
+        edge at a time until no edges are left.
 
-        return communities
+        Args:
+            k (int, optional): Estimate betweenness from k sampled sources per
+                               component instead of all of them (scaled to match).
+            seed (int, optional): Seed for the source sampling.
+            n_jobs (int): The number of worker processes the sources of each
+                          betweenness computation are spread over. None or a
+                          negative value uses every CPU.
 
-    def _calculate_edge_betweenness(self):
-        edge_betweenness = {tuple(sorted((u, v))): 0.0 for u in self.graph for v in self.graph[u]}
-
-        for s in self.vertices:
-            # BFS from s
-            stack = []
-            parent = {v: [] for v in self.vertices}
-            sigma = {v: 0 for v in self.vertices}; sigma[s] = 1
-            dist = {v: -1 for v in self.vertices}; dist[s] = 0
-            queue = deque([s])
-
-            while queue:
-                v = queue.popleft()
-                stack.append(v)
-                for w in self.graph.get(v, []):
-                    if dist[w] < 0:
-                        queue.append(w)
-                        dist[w] = dist[v] + 1
-                    if dist[w] == dist[v] + 1:
-                        sigma[w] += sigma[v]
-                        parent[w].append(v)
-
-            # Accumulate betweenness
-            delta = {v: 0 for v in self.vertices}
-            while stack:
-                w = stack.pop()
-                for v in parent[w]:
-                    credit = (sigma[v] / sigma[w]) * (1 + delta[w])
-                    edge = tuple(sorted((v, w)))
-                    edge_betweenness[edge] += credit
-                    delta[v] += credit
-        return edge_betweenness
+        Yields:
+            list: The communities (lists of vertices) every time a removal splits a
+                  component, from the first split down to single vertices.
+        """
+        labels, adjacency = self._id_adjacency()
+        rng = random.Random(seed)
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        executor = ProcessPoolExecutor(n_jobs) if n_jobs > 1 else None
+        try:
+            components = {}  # component id -> sorted member vertex ids
+            best = {}        # component id -> (betweenness, edge) of its top edge
+            for members in self._components(adjacency):
+                self._add_component(components, best, adjacency, members, k, rng, executor, n_jobs)
+
+            while best:
+                cid = max(best, key=lambda c: best[c][0])
+                _, (u, v) = best.pop(cid)
+                members = components.pop(cid)
+                adjacency[u].remove(v)
+                adjacency[v].remove(u)
 
-    def _get_connected_components(self):
-        visited = {v: False for v in self.vertices}
+                # Only the component that lost the edge changes
+                side = self._reachable(adjacency, u)
+                if v in side:
+                    parts = [members]
+                else:
+                    parts = [sorted(side), [w for w in members if w not in side]]
+                for part in parts:
+                    self._add_component(components, best, adjacency, part, k, rng, executor, n_jobs)
+
+                if len(parts) > 1:
+                    ordered = sorted(components.values(), key=lambda part: part[0])
+                    yield [[labels[w] for w in part] for part in ordered]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def girvan_newman_dendrogram(self, k=None, seed=None, n_jobs=1):
+        """
+        Returns every level of the Girvan-Newman dendrogram as a list of
+        partitions, as yielded by iter_girvan_newman.
+        """
+        return list(self.iter_girvan_newman(k=k, seed=seed, n_jobs=n_jobs))
+
+    def _add_component(self, components, best, adjacency, members, k, rng, executor, n_jobs):
+        """
+        Registers a component and, if it has edges, its highest-betweenness edge.
+        """
+        cid = members[0]
+        components[cid] = members
+        if len(members) < 2:
+            return
+        sources = None
+        if k is not None and k < len(members):
+            sources = rng.sample(range(len(members)), k)
+        betweenness = _component_betweenness(adjacency, members, sources, executor, n_jobs)
+        edge, value = max(betweenness.items(), key=lambda item: item[1])
+        best[cid] = (value, edge)
+
+    def _id_adjacency(self):
+        """
+        Relabels the graph to integer ids as a symmetric adjacency list without
+        self-loops or parallel edges.
+
+        Returns:
+            tuple: The labels of the ids, and the sorted neighbour ids of every id.
+        """
+        labels = list(self.vertices)
+        index = {label: i for i, label in enumerate(labels)}
+        neighbors = [set() for _ in labels]
+        for u in self.vertices:
+            for v in self.graph[u]:
+                if v not in index:
+                    index[v] = len(labels)
+                    labels.append(v)
+                    neighbors.append(set())
+                i, j = index[u], index[v]
+                if i != j:
+                    neighbors[i].add(j)
+                    neighbors[j].add(i)
+        return labels, [sorted(ids) for ids in neighbors]
+
+    def _components(self, adjacency):
+        """
+        Returns the connected components as sorted lists of ids, by smallest id.
+        """
+        seen = bytearray(len(adjacency))
         components = []
-        for v in self.vertices:
-            if not visited[v]:
-                component = []
-                self._dfs_components(v, visited, component)
+        for v in range(len(adjacency)):
+            if not seen[v]:
+                component = sorted(self._reachable(adjacency, v))
+                for w in component:
+                    seen[w] = 1
                 components.append(component)
         return components
 
-    def _dfs_components(self, u, visited, component):
-        visited[u] = True
-        component.append(u)
-        for v in self.graph.get(u, []):
-            if not visited[v]:
-                self._dfs_components(v, visited, component)
+    def _reachable(self, adjacency, start):
+        """
+        Returns the set of ids reachable from start.
+        """
+        reached = {start}
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for v in adjacency[u]:
+                if v not in reached:
+                    reached.add(v)
+                    queue.append(v)
+        return reached
+
+    def _calculate_edge_betweenness(self):
+        """
+        Returns the betweenness of every edge, keyed by the sorted vertex pair.
+        """
+        labels, adjacency = self._id_adjacency()
+        edge_betweenness = {}
+        for members in self._components(adjacency):
+            for (u, v), value in _component_betweenness(adjacency, members).items():
+                edge_betweenness[tuple(sorted((labels[u], labels[v])))] = value
+        return edge_betweenness
+
+
+def _component_betweenness(adjacency, members, sources=None, executor=None, n_jobs=1):
+    """
+    Edge betweenness inside one connected component.
+
+    Args:
+        adjacency (list): The neighbour ids of every vertex id.
+        members (list): The sorted ids of the component.
+        sources (list, optional): Local indices of sampled sources; all by default.
+                                  Sampled values are scaled to estimate the full sum.
+        executor (Executor, optional): Spreads the sources over n_jobs worker processes.
+        n_jobs (int): The number of workers of the executor.
+
+    Returns:
+        dict: {(u, v): betweenness} with u < v, over the component's edges.
+    """
+    local = {v: i for i, v in enumerate(members)}
+    local_adjacency = [[local[w] for w in adjacency[v]] for v in members]
+    if sources is None:
+        sources = range(len(members))
+    scale = len(members) / len(sources)
+
+    if executor is not None and len(sources) > 1:
+        num_chunks = min(len(sources), n_jobs)
+        chunks = [sources[i::num_chunks] for i in range(num_chunks)]
+        betweenness = {}
+        for partial in executor.map(_brandes, [local_adjacency] * num_chunks, chunks):
+            for edge, value in partial.items():
+                betweenness[edge] = betweenness.get(edge, 0.0) + value
+    else:
+        betweenness = _brandes(local_adjacency, sources)
+
+    # members is sorted, so local u < v keeps u < v for the global ids
+    return {(members[u], members[v]): value * scale for (u, v), value in betweenness.items()}
+
+
+def _brandes(adjacency, sources):
+    """
+    Brandes' edge betweenness accumulation from the given sources over an
+    unweighted adjacency list of ids.
+    """
+    num_vertices = len(adjacency)
+    betweenness = {}
+    for s in sources:
+        # BFS from s, counting shortest paths
+        order = []
+        predecessors = [[] for _ in range(num_vertices)]
+        sigma = [0] * num_vertices
+        sigma[s] = 1
+        dist = [-1] * num_vertices
+        dist[s] = 0
+        queue = deque([s])
+
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for w in adjacency[v]:
+                if dist[w] < 0:
+                    queue.append(w)
+                    dist[w] = dist[v] + 1
+                if dist[w] == dist[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        # Accumulate betweenness in order of decreasing distance
+        delta = [0.0] * num_vertices
+        while order:
+            w = order.pop()
+            for v in predecessors[w]:
+                credit = (sigma[v] / sigma[w]) * (1 + delta[w])
+                edge = (v, w) if v < w else (w, v)
+                betweenness[edge] = betweenness.get(edge, 0.0) + credit
+                delta[v] += credit
+    return betweenness
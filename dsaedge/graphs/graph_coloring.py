@@ -1,60 +1,204 @@
+import heapq
+
+from .csr_graph import as_csr
+
 class GraphColoring:
     """
-    Implements a greedy algorithm for vertex coloring of a graph.
-    This algorithm does not guarantee the use of the minimum number of colors
-    (which is an NP-hard problem), but it provides a valid coloring.
+    Implements greedy algorithms for vertex coloring of a graph.
+    These algorithms do not guarantee the use of the minimum number of colors
+    (which is an NP-hard problem), but they provide a valid coloring. The
+    order in which vertices are colored largely decides how many colors are used.
     """
     def __init__(self, graph):
         """
         Initializes the GraphColoring object.
 
         Args:
-            graph (dict): An adjacency list representation of the undirected graph.
+            graph (dict or CSRGraph): An adjacency list representation of the undirected graph,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1, 2], 1: [0, 2, 3], ...}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
 
-    def greedy_coloring(self):
+    def greedy_coloring(self, strategy='sequential'):
         """
         Assigns colors to vertices such that no two adjacent vertices share the same color.
 
+        Strategies:
+            sequential          Vertices in insertion order.
+            largest_first       Vertices by decreasing degree.
+            smallest_last       Repeatedly removes a vertex of smallest remaining degree
+                                (bucket queue) and colors in reverse removal order, so
+                                at most degeneracy + 1 colors are used. O(V + E).
+            dsatur              Always colors the vertex with the most distinct neighbour
+                                colors, then the highest degree (lazy heap). O((V + E) log V).
+            independent_set     Builds one maximal independent set per color, taking
+                                vertices of smallest remaining degree first. O(colors * (V + E)).
+
+        Args:
+            strategy (str): The order in which vertices are colored.
+
         Returns:
             dict: A dictionary mapping each vertex to a color (integer).
                   Example: {0: 0, 1: 1, 2: 2, 3: 0}
         """
-        # Initialize all vertices as uncolored
-        result = {v: -1 for v in self.vertices}
-        # Assign the first color to the first vertex
-        result[self.vertices[0]] = 0
-
-        # A temporary array to store the available colors. False value of
-        # available[cr] would mean that the color cr is assigned to one of its
-        # adjacent vertices.
-        available = [False] * self.num_vertices
-
-        # Assign colors to the remaining V-1 vertices
-        for u in self.vertices[1:]:
-            # Process all adjacent vertices and flag their colors as unavailable
-            for v_info in self.graph.get(u, []):
-                v = v_info[0] if isinstance(v_info, tuple) else v_info
-                if result[v] != -1:
-                    available[result[v]] = True
-
-            # Find the first available color
-            cr = 0
-            while cr < self.num_vertices:
-                if not available[cr]:
-                    break
-                cr += 1
-
-            result[u] = cr  # Assign the found color
-
-            # Reset the values back to false for the next iteration
-            for v_info in self.graph.get(u, []):
-                v = v_info[0] if isinstance(v_info, tuple) else v_info
-                if result[v] != -1:
-                    available[result[v]] = False
-
-        return result
+        if strategy not in _STRATEGIES:
+            raise ValueError("strategy must be one of %s." % ', '.join("'%s'" % name for name in _STRATEGIES))
+        if self.num_vertices == 0:
+            return {}
+        neighbors = self._neighbors()
+        if strategy == 'dsatur':
+            result = _dsatur(neighbors)
+        elif strategy == 'independent_set':
+            result = _independent_sets(neighbors)
+        else:
+            if strategy == 'sequential':
+                order = range(self.num_vertices)
+            elif strategy == 'largest_first':
+                order = sorted(range(self.num_vertices), key=lambda u: -len(neighbors[u]))
+            else:
+                order = _smallest_last_order(neighbors)
+            result = _first_fit(neighbors, order)
+        return dict(zip(self.vertices, result))
+
+    def _neighbors(self):
+        """
+        Returns the neighbour ids of every vertex, with edges taken in both
+        directions, without duplicates or self-loops.
+        """
+        offsets, targets = self.csr.offsets, self.csr.targets
+        neighbors = [set() for _ in range(self.num_vertices)]
+        for u in range(self.num_vertices):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v != u:
+                    neighbors[u].add(v)
+                    neighbors[v].add(u)
+        return [list(adjacent) for adjacent in neighbors]
+
+
+_STRATEGIES = ('sequential', 'largest_first', 'smallest_last', 'dsatur', 'independent_set')
+
+
+def _first_fit(neighbors, order):
+    """
+    Gives every vertex, in order, the smallest color not used by a colored neighbour.
+    """
+    result = [-1] * len(neighbors)
+    # forbidden[c] == u marks color c as taken around u, so it never needs resetting
+    forbidden = [-1] * (max(map(len, neighbors)) + 1)
+    for u in order:
+        for v in neighbors[u]:
+            if result[v] >= 0:
+                forbidden[result[v]] = u
+        color = 0
+        while forbidden[color] == u:
+            color += 1
+        result[u] = color
+    return result
+
+
+def _smallest_last_order(neighbors):
+    """
+    The smallest-last (degeneracy) order, from a bucket queue of remaining degrees.
+    Stale bucket entries are skipped when popped.
+    """
+    n = len(neighbors)
+    degree = [len(adjacent) for adjacent in neighbors]
+    buckets = [[] for _ in range(max(degree) + 1)]
+    for u in range(n):
+        buckets[degree[u]].append(u)
+    removed = bytearray(n)
+    removal = []
+    lowest = 0
+    while len(removal) < n:
+        bucket = buckets[lowest]
+        if not bucket:
+            lowest += 1
+            continue
+        u = bucket.pop()
+        if removed[u] or degree[u] != lowest:
+            continue
+        removed[u] = 1
+        removal.append(u)
+        for v in neighbors[u]:
+            if not removed[v]:
+                degree[v] -= 1
+                buckets[degree[v]].append(v)
+        lowest = max(lowest - 1, 0)
+    removal.reverse()
+    return removal
+
+
+def _dsatur(neighbors):
+    """
+    DSATUR coloring with a lazy max-heap keyed by (saturation, degree).
+    """
+    n = len(neighbors)
+    result = [-1] * n
+    neighbor_colors = [set() for _ in range(n)]
+    forbidden = [-1] * (max(map(len, neighbors)) + 1)
+    heap = [(0, -len(neighbors[u]), u) for u in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        saturation, _, u = heapq.heappop(heap)
+        if result[u] >= 0 or -saturation != len(neighbor_colors[u]):
+            continue
+        for color in neighbor_colors[u]:
+            forbidden[color] = u
+        color = 0
+        while forbidden[color] == u:
+            color += 1
+        result[u] = color
+        for v in neighbors[u]:
+            if result[v] < 0 and color not in neighbor_colors[v]:
+                neighbor_colors[v].add(color)
+                heapq.heappush(heap, (-len(neighbor_colors[v]), -len(neighbors[v]), v))
+    return result
+
+
+def _independent_sets(neighbors):
+    """
+    Colors one maximal independent set at a time. Each set is built by
+    repeatedly taking the candidate with fewest candidate neighbours (bucket
+    queue) and dropping it and its neighbours from the candidates.
+    """
+    n = len(neighbors)
+    result = [-1] * n
+    remaining = list(range(n))
+    candidate = bytearray(n)
+    color = 0
+    while remaining:
+        for u in remaining:
+            candidate[u] = 1
+        degree = {u: sum(1 for v in neighbors[u] if candidate[v]) for u in remaining}
+        buckets = [[] for _ in range(max(degree.values()) + 1)]
+        for u in remaining:
+            buckets[degree[u]].append(u)
+        lowest = 0
+        left = len(remaining)
+        while left:
+            bucket = buckets[lowest]
+            if not bucket:
+                lowest += 1
+                continue
+            u = bucket.pop()
+            if not candidate[u] or degree[u] != lowest:
+                continue
+            result[u] = color
+            dropped = [u] + [v for v in neighbors[u] if candidate[v]]
+            for x in dropped:
+                candidate[x] = 0
+            left -= len(dropped)
+            for x in dropped:
+                for y in neighbors[x]:
+                    if candidate[y]:
+                        degree[y] -= 1
+                        buckets[degree[y]].append(y)
+                        lowest = min(lowest, degree[y])
+        remaining = [u for u in remaining if result[u] < 0]
+        color += 1
+    return result
@@ -1,27 +1,45 @@
+import os
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .csr_graph import as_csr
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the random-walk methods need it.
+    np = None
 
 class GraphEmbedding:
     """
-    A placeholder for graph embedding techniques like Node2Vec or DeepWalk.
+    Graph embedding techniques in the style of DeepWalk and node2vec.
     Graph embedding aims to represent nodes (or entire graphs) as low-dimensional vectors,
     capturing the graph's structure.
 
-    This implementation will demonstrate a very simple random embedding as a placeholder.
+    Random walks are generated over the CSR arrays, advancing a whole batch of
+    walkers per step with NumPy. Uniform walks (DeepWalk) pick a neighbour in
+    proportion to the edge weight; node2vec walks additionally bias the choice by
+    the previous vertex with the return parameter p and the in-out parameter q,
+    sampled in O(1) from alias tables precomputed per edge. train_embedding
+    turns the walks into vectors by factorising their positive pointwise mutual
+    information (PPMI) co-occurrence matrix with a truncated SVD.
     """
     def __init__(self, graph):
         """
         Initializes the GraphEmbedding object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
     def random_embedding(self, dimensions=128):
         """
-        Generates a simple random embedding for each node.
-        In a real scenario, this would be replaced by a sophisticated algorithm.
+        Generates a simple random embedding for each node, as a baseline.
 
         Args:
             dimensions (int): The dimensionality of the embedding vectors.
@@ -34,6 +52,89 @@ class GraphEmbedding:
             embedding[vertex] = [random.uniform(-1, 1) for _ in range(dimensions)]
         return embedding
 
+    def iter_walks(self, num_walks=10, walk_length=80, p=1.0, q=1.0, seed=None, n_jobs=1, batch_size=4096):
+        """
+        Streams random walks, num_walks from every vertex.
+
+        Args:
+            num_walks (int): The number of walks started from each vertex.
+            walk_length (int): The number of vertices per walk.
+            p (float): node2vec return parameter; larger values make stepping back less likely.
+            q (float): node2vec in-out parameter; values below 1 favour moving away
+                       (depth-first), above 1 staying close (breadth-first).
+                       With p == q == 1 the walks are first-order (DeepWalk).
+            seed (int, optional): Seed; the walks do not depend on n_jobs.
+            n_jobs (int): The number of worker processes. None or a negative value uses every CPU.
+            batch_size (int): The number of walks per yielded array.
+
+        Yields:
+            ndarray: An int64 array of shape (walks in batch, walk_length) of vertex
+                     ids (see self.vertices). A walk that reaches a vertex without
+                     out-edges is padded with -1.
+        """
+        if np is None:
+            raise ImportError("GraphEmbedding.iter_walks requires NumPy.")
+        sampler = _WalkSampler(self.csr, walk_length, p, q)
+        seeds = np.random.SeedSequence(seed)
+        order_rng = np.random.default_rng(seeds.spawn(1)[0])
+        batches = (
+            (starts, batch_seed)
+            for _ in range(num_walks)
+            for starts in np.array_split(order_rng.permutation(self.csr.num_vertices),
+                                         max(1, -(-self.csr.num_vertices // batch_size)))
+            for batch_seed in seeds.spawn(1)
+        )
+
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs <= 1:
+            for starts, batch_seed in batches:
+                yield sampler.walk(starts, np.random.default_rng(batch_seed))
+            return
+
+        with ProcessPoolExecutor(n_jobs, initializer=_init_walker, initargs=(sampler,)) as executor:
+            # Keep a bounded number of batches in flight so walks are streamed, not buffered
+            pending = deque(executor.submit(_walk_batch, *batch) for batch in islice(batches, 2 * n_jobs))
+            while pending:
+                walks = pending.popleft().result()
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append(executor.submit(_walk_batch, *batch))
+                yield walks
+
+    def train_embedding(self, dimensions=128, window=5, num_walks=10, walk_length=80, p=1.0, q=1.0,
+                        seed=None, n_jobs=1):
+        """
+        Learns vertex embeddings from random walks without a neural network:
+        vertices co-occurring within window steps of each other are counted,
+        the counts are turned into a PPMI matrix, and its rank-dimensions
+        truncated SVD U S V^T gives the embedding U sqrt(S).
+
+        Args:
+            dimensions (int): The dimensionality of the embedding vectors. With fewer
+                              vertices than dimensions, the extra columns are zero.
+            window (int): The co-occurrence window along the walks.
+            num_walks, walk_length, p, q, seed, n_jobs: As for iter_walks.
+
+        Returns:
+            tuple: A tuple containing:
+                - ndarray: The (num_vertices, dimensions) embedding.
+                - list: The vertex of every row.
+        """
+        if np is None:
+            raise ImportError("GraphEmbedding.train_embedding requires NumPy.")
+        num_vertices = self.csr.num_vertices
+        walks = self.iter_walks(num_walks, walk_length, p, q, seed, n_jobs)
+        rows, cols, counts = _cooccurrence(walks, num_vertices, window)
+        rows, cols, values = _ppmi(rows, cols, counts, num_vertices)
+
+        rank = min(dimensions, num_vertices)  # Columns past the rank stay zero
+        rng = np.random.default_rng(seed)
+        u, s = _truncated_svd(rows, cols, values, num_vertices, rank, rng)
+        embedding = np.zeros((num_vertices, dimensions))
+        embedding[:, :u.shape[1]] = u * np.sqrt(s)
+        return embedding, list(self.vertices)
+
     def explain_concept(self):
         """
         Provides a brief explanation of graph embedding.
@@ -49,3 +150,210 @@ class GraphEmbedding:
             "- Graph Convolutional Networks (GCNs): Use neural networks to learn embeddings by "
             "aggregating information from node neighborhoods."
         )
+
+
+class _WalkSampler:
+    """
+    The NumPy arrays needed to advance random walkers, picklable for worker processes.
+
+    The first-order alias table of vertex v is stored at offsets[v]..offsets[v + 1],
+    aligned with its out-edges. For node2vec, the table for arriving at v along
+    edge e starts at edge_start[e] and also has one entry per out-edge of v.
+    Alias entries are local edge indices.
+    """
+    def __init__(self, csr, walk_length, p, q):
+        self.walk_length = walk_length
+        offsets, targets, weights = csr.to_numpy()
+        self.offsets, self.targets = offsets.copy(), targets.copy()
+        self.degree = np.diff(self.offsets)
+        weights = weights.astype(np.float64)
+
+        self.node_prob = self.node_alias = None
+        if csr.weighted and len(weights) and not np.all(weights == weights[0]):
+            self.node_prob, self.node_alias = _alias_tables(
+                weights[self.offsets[v]:self.offsets[v + 1]] for v in range(csr.num_vertices))
+
+        self.edge_start = self.edge_prob = self.edge_alias = None
+        if p != 1 or q != 1:
+            tails = np.repeat(np.arange(csr.num_vertices), self.degree)
+            heads = self.targets
+            self.edge_start = np.concatenate(([0], np.cumsum(self.degree[heads])[:-1])).astype(np.int64)
+            self.edge_prob, self.edge_alias = _alias_tables(
+                self._biased_weights(t, v, weights, p, q) for t, v in zip(tails.tolist(), heads.tolist()))
+
+    def _biased_weights(self, t, v, weights, p, q):
+        """
+        node2vec transition weights out of v after arriving from t.
+        """
+        offsets = self.offsets
+        candidates = self.targets[offsets[v]:offsets[v + 1]]
+        bias = np.where(candidates == t, 1 / p,
+                        np.where(np.isin(candidates, self.targets[offsets[t]:offsets[t + 1]]), 1.0, 1 / q))
+        return weights[offsets[v]:offsets[v + 1]] * bias
+
+    def walk(self, starts, rng):
+        """
+        Walks from every start at once, one step per iteration.
+        """
+        offsets, targets, degree = self.offsets, self.targets, self.degree
+        walks = np.full((len(starts), self.walk_length), -1, dtype=np.int64)
+        if self.walk_length == 0:
+            return walks
+        walks[:, 0] = starts
+        current = np.asarray(starts, dtype=np.int64)
+        arrived_by = np.full(len(starts), -1, dtype=np.int64)  # Edge taken into current
+        active = np.nonzero(degree[current] > 0)[0]
+
+        for step in range(1, self.walk_length):
+            if len(active) == 0:
+                break
+            v = current[active]
+            local = (rng.random(len(active)) * degree[v]).astype(np.int64)
+            if self.edge_prob is not None and step > 1:
+                position = self.edge_start[arrived_by[active]] + local
+                prob, alias = self.edge_prob, self.edge_alias
+            else:
+                position = offsets[v] + local
+                prob, alias = self.node_prob, self.node_alias
+            if prob is not None:
+                local = np.where(rng.random(len(active)) < prob[position], local, alias[position])
+
+            edge = offsets[v] + local
+            following = targets[edge]
+            walks[active, step] = following
+            current[active] = following
+            arrived_by[active] = edge
+            active = active[degree[following] > 0]
+        return walks
+
+
+def _alias_tables(weight_rows):
+    """
+    Builds Vose alias tables for consecutive rows of weights.
+
+    Returns:
+        tuple: The concatenated acceptance probabilities and alias (local) indices.
+    """
+    probs, aliases = [], []
+    for weights in weight_rows:
+        n = len(weights)
+        total = float(weights.sum())
+        prob = (weights * n / total).tolist() if total > 0 else [1.0] * n
+        alias = list(range(n))
+        small = [i for i in range(n) if prob[i] < 1.0]
+        large = [i for i in range(n) if prob[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in small + large:  # Leftovers are 1 up to rounding
+            prob[i] = 1.0
+        probs.extend(prob)
+        aliases.extend(alias)
+    return np.array(probs, dtype=np.float64), np.array(aliases, dtype=np.int64)
+
+
+_walker = None  # The _WalkSampler of a worker process
+
+
+def _init_walker(sampler):
+    """
+    Installs the walk sampler in a worker process.
+    """
+    global _walker
+    _walker = sampler
+
+
+def _walk_batch(starts, batch_seed):
+    """
+    Generates one batch of walks in a worker process.
+    """
+    return _walker.walk(starts, np.random.default_rng(batch_seed))
+
+
+def _cooccurrence(walk_batches, num_vertices, window):
+    """
+    Counts how often two vertices appear within window steps on a walk, in both orders.
+
+    Returns:
+        tuple: Row ids, column ids and counts of the non-zero entries, sorted by row.
+    """
+    keys = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.float64)
+    pending, pending_size = [], 0
+    for walks in walk_batches:
+        batch_keys = []
+        for distance in range(1, window + 1):
+            a, b = walks[:, :-distance].ravel(), walks[:, distance:].ravel()
+            valid = (a >= 0) & (b >= 0)
+            a, b = a[valid], b[valid]
+            batch_keys.append(a * num_vertices + b)
+            batch_keys.append(b * num_vertices + a)
+        batch_keys, batch_counts = np.unique(np.concatenate(batch_keys), return_counts=True)
+        pending.append((batch_keys, batch_counts))
+        pending_size += len(batch_keys)
+        # Merge into the running totals once the pending batches outgrow them,
+        # so every entry is re-sorted only a logarithmic number of times
+        if pending_size > len(keys):
+            keys, counts = _merge_counts([(keys, counts)] + pending)
+            pending, pending_size = [], 0
+    if pending:
+        keys, counts = _merge_counts([(keys, counts)] + pending)
+    return keys // num_vertices, keys % num_vertices, counts
+
+
+def _merge_counts(parts):
+    """
+    Sums (sorted keys, counts) pairs into one.
+    """
+    keys, inverse = np.unique(np.concatenate([k for k, _ in parts]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([c for _, c in parts]), minlength=len(keys))
+    return keys, counts
+
+
+def _ppmi(rows, cols, counts, num_vertices):
+    """
+    Turns symmetric co-occurrence counts into positive pointwise mutual information.
+    """
+    row_totals = np.bincount(rows, weights=counts, minlength=num_vertices)
+    total = counts.sum()
+    if total == 0:
+        return rows, cols, counts
+    pmi = np.log(counts * total / (row_totals[rows] * row_totals[cols]))
+    keep = pmi > 0
+    return rows[keep], cols[keep], pmi[keep]
+
+
+def _truncated_svd(rows, cols, values, num_vertices, rank, rng, power_iterations=2, oversample=10):
+    """
+    Randomized truncated SVD (Halko, Martinsson and Tropp) of the symmetric sparse
+    matrix given by its non-zero entries.
+
+    Returns:
+        tuple: The leading rank left singular vectors and the singular values.
+    """
+    sketch_size = min(num_vertices, rank + oversample)
+    basis, _ = np.linalg.qr(_sparse_matmul(rows, cols, values, rng.standard_normal((num_vertices, sketch_size))))
+    for _ in range(power_iterations):
+        basis, _ = np.linalg.qr(_sparse_matmul(rows, cols, values, basis))
+    # The matrix is symmetric, so basis^T M = (M basis)^T
+    projected = _sparse_matmul(rows, cols, values, basis).T
+    u_small, s, _ = np.linalg.svd(projected, full_matrices=False)
+    return (basis @ u_small)[:, :rank], s[:rank]
+
+
+def _sparse_matmul(rows, cols, values, dense):
+    """
+    Multiplies the sparse matrix given by its non-zero entries, sorted by row,
+    with a dense matrix, in chunks that bound the temporary memory.
+    """
+    result = np.zeros_like(dense)
+    chunk = max(1, (1 << 18) // max(1, dense.shape[1]))
+    for start in range(0, len(values), chunk):
+        stop = start + chunk
+        # rows is sorted, so every row's entries in the chunk are contiguous
+        chunk_rows, first = np.unique(rows[start:stop], return_index=True)
+        products = values[start:stop, None] * dense[cols[start:stop]]
+        result[chunk_rows] += np.add.reduceat(products, first, axis=0)
+    return result
@@ -0,0 +1,200 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .csr_graph import as_csr
+from .graph_isomorphism import GraphIsomorphism, weisfeiler_lehman_hash
+
+_FORMAT_VERSION = 1
+
+class GraphFingerprintIndex:
+    """
+    An index of graphs for finding isomorphic duplicates without comparing
+    against every graph in the library.
+
+    Every graph is bucketed by its Weisfeiler-Lehman hash. Isomorphic graphs
+    always share a hash, so a lookup only runs the full VF2++ check against the
+    graphs in one bucket. The index, including the hashes, can be saved to disk
+    and loaded without re-hashing.
+    """
+    def __init__(self, iterations=3):
+        """
+        Initializes an empty GraphFingerprintIndex.
+
+        Args:
+            iterations (int): The number of WL refinement rounds per hash. More rounds
+                              separate more graphs into different buckets but cost more.
+        """
+        self.iterations = iterations
+        self._entries = {}  # key -> (fingerprint, CSRGraph, node labels)
+        self._buckets = {}  # fingerprint -> keys
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def fingerprint(self, graph, node_labels=None):
+        """
+        Computes the WL hash of a graph with this index's settings.
+
+        Args:
+            graph (dict or CSRGraph): Adjacency list of the graph.
+            node_labels (dict, optional): Label of every vertex, preserved by isomorphisms.
+
+        Returns:
+            str: The fingerprint.
+        """
+        return weisfeiler_lehman_hash(graph, self.iterations, node_labels)
+
+    def add(self, key, graph, node_labels=None, fingerprint=None):
+        """
+        Adds a graph to the index.
+
+        Args:
+            key: A hashable identifier for the graph.
+            graph (dict or CSRGraph): Adjacency list of the graph.
+            node_labels (dict, optional): Label of every vertex, preserved by isomorphisms.
+            fingerprint (str, optional): The graph's precomputed fingerprint.
+
+        Returns:
+            str: The fingerprint of the graph.
+        """
+        if key in self._entries:
+            raise ValueError("Key already in index.")
+        if fingerprint is None:
+            fingerprint = self.fingerprint(graph, node_labels)
+        self._entries[key] = (fingerprint, as_csr(graph), node_labels)
+        self._buckets.setdefault(fingerprint, []).append(key)
+        return fingerprint
+
+    def add_many(self, items, n_jobs=1):
+        """
+        Adds many graphs, hashing them across worker processes.
+
+        Args:
+            items (iterable): (key, graph) or (key, graph, node_labels) tuples.
+            n_jobs (int): The number of worker processes. None or a negative value uses every CPU.
+        """
+        items = [tuple(item) + (None,) * (3 - len(item)) for item in items]
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        jobs = [(graph, self.iterations, node_labels) for _, graph, node_labels in items]
+        if n_jobs > 1 and len(items) > 1:
+            with ProcessPoolExecutor(n_jobs) as executor:
+                fingerprints = list(executor.map(_fingerprint, jobs, chunksize=max(1, len(jobs) // (4 * n_jobs))))
+        else:
+            fingerprints = [_fingerprint(job) for job in jobs]
+        for (key, graph, node_labels), fingerprint in zip(items, fingerprints):
+            self.add(key, graph, node_labels, fingerprint)
+
+    def find(self, graph, node_labels=None):
+        """
+        Finds a graph in the index that is isomorphic to the given one.
+
+        Args:
+            graph (dict or CSRGraph): Adjacency list of the graph.
+            node_labels (dict, optional): Label of every vertex, preserved by isomorphisms.
+
+        Returns:
+            The key of an isomorphic graph, or None if there is none.
+        """
+        return next(self._matches(graph, node_labels), None)
+
+    def find_all(self, graph, node_labels=None):
+        """
+        Finds every graph in the index that is isomorphic to the given one.
+
+        Returns:
+            list: The keys of the isomorphic graphs, in insertion order.
+        """
+        return list(self._matches(graph, node_labels))
+
+    def add_unique(self, key, graph, node_labels=None):
+        """
+        Adds a graph unless an isomorphic one is already indexed.
+
+        Returns:
+            The key of the existing isomorphic graph, or key if the graph was added.
+        """
+        fingerprint = self.fingerprint(graph, node_labels)
+        existing = next(self._matches(graph, node_labels, fingerprint), None)
+        if existing is not None:
+            return existing
+        self.add(key, graph, node_labels, fingerprint)
+        return key
+
+    def remove(self, key):
+        """
+        Removes a graph from the index.
+        """
+        if key not in self._entries:
+            raise ValueError("Key not in index.")
+        fingerprint = self._entries.pop(key)[0]
+        bucket = self._buckets[fingerprint]
+        bucket.remove(key)
+        if not bucket:
+            del self._buckets[fingerprint]
+
+    def bucket_sizes(self):
+        """
+        Returns the number of graphs under every fingerprint.
+        """
+        return {fingerprint: len(keys) for fingerprint, keys in self._buckets.items()}
+
+    def save(self, path):
+        """
+        Writes the index, including the fingerprints, to a file. The file is
+        replaced atomically.
+
+        Args:
+            path (str): The file to write.
+        """
+        entries = [(key, fingerprint, csr, node_labels)
+                   for key, (fingerprint, csr, node_labels) in self._entries.items()]
+        temporary = '%s.tmp%d' % (path, os.getpid())
+        with open(temporary, 'wb') as f:
+            pickle.dump({'version': _FORMAT_VERSION, 'iterations': self.iterations, 'entries': entries},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by save. The file is unpickled, so only load
+        files from a trusted source.
+
+        Args:
+            path (str): The file to read.
+
+        Returns:
+            GraphFingerprintIndex: The index.
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != _FORMAT_VERSION:
+            raise ValueError("Unsupported index format version.")
+        index = cls(state['iterations'])
+        for key, fingerprint, csr, node_labels in state['entries']:
+            index.add(key, csr, node_labels, fingerprint)
+        return index
+
+    def _matches(self, graph, node_labels, fingerprint=None):
+        """
+        Yields the keys of the isomorphic graphs in the graph's bucket.
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(graph, node_labels)
+        for key in self._buckets.get(fingerprint, ()):
+            _, candidate, candidate_labels = self._entries[key]
+            if GraphIsomorphism(graph, candidate, node_labels, candidate_labels).are_isomorphic():
+                yield key
+
+
+def _fingerprint(job):
+    """
+    Hashes one (graph, iterations, node_labels) job in a worker process.
+    """
+    graph, iterations, node_labels = job
+    return weisfeiler_lehman_hash(graph, iterations, node_labels)
@@ -1,22 +1,39 @@
+import hashlib
+from collections import Counter
+
+from .csr_graph import as_csr
+
 class GraphIsomorphism:
     """
-    A simplified implementation of the VF2 algorithm for checking graph isomorphism.
+    Graph isomorphism and subgraph isomorphism with the VF2++ algorithm.
     Graph isomorphism is the problem of determining whether two graphs are isomorphic,
     i.e., whether there is a one-to-one correspondence between their vertices that
     preserves adjacency.
+
+    Vertices are first coloured by Weisfeiler-Lehman (WL) refinement over both
+    graphs at once: isomorphic graphs have the same colour histogram, and a
+    vertex can only be mapped to a vertex of the same colour. The search then
+    extends a partial mapping in VF2++ order (breadth-first from rare, high-degree
+    vertices), taking candidates from the neighbourhood of an already mapped
+    vertex and pruning them with the VF2 consistency and terminal-set rules.
+    Graphs may be directed; optional vertex labels must be preserved too.
     """
-    def __init__(self, graph1, graph2):
+    def __init__(self, graph1, graph2, node_labels1=None, node_labels2=None):
         """
         Initializes the GraphIsomorphism object.
 
         Args:
-            graph1 (dict): Adjacency list of the first graph.
-            graph2 (dict): Adjacency list of the second graph.
+            graph1 (dict or CSRGraph): Adjacency list of the first graph.
+            graph2 (dict or CSRGraph): Adjacency list of the second graph.
+            node_labels1 (dict, optional): Label of every vertex of graph1.
+            node_labels2 (dict, optional): Label of every vertex of graph2.
         """
         self.g1 = graph1
         self.g2 = graph2
-        self.v1 = list(graph1.keys())
-        self.v2 = list(graph2.keys())
+        self._s1 = _Structure(graph1, node_labels1)
+        self._s2 = _Structure(graph2, node_labels2)
+        self.v1 = self._s1.labels
+        self.v2 = self._s2.labels
 
     def are_isomorphic(self):
         """
@@ -25,65 +42,302 @@ class GraphIsomorphism:
         Returns:
             bool: True if the graphs are isomorphic, False otherwise.
         """
-        if len(self.v1) != len(self.v2):
-            return False
+        return self.find_isomorphism() is not None
 
-        # A simple check: degree sequences must match
-        d1 = sorted([len(self.g1[v]) for v in self.v1])
-        d2 = sorted([len(self.g2[v]) for v in self.v2])
-        if d1 != d2:
-            return False
+    def find_isomorphism(self):
+        """
+        Finds an isomorphism between the two graphs.
+
+        Returns:
+            dict: A mapping from the vertices of graph1 to those of graph2, or None.
+        """
+        return next(self.iter_isomorphisms(), None)
 
-        # The core of VF2 is a recursive search with feasibility rules.
-        # This is a simplified version for demonstration.
-        # A full implementation is complex.
-        mapping = {}
-        return self._vf2_match(mapping)
+    def iter_isomorphisms(self):
+        """
+        Iterates over all isomorphisms between the two graphs.
 
-    def _vf2_match(self, mapping):
+        Yields:
+            dict: A mapping from the vertices of graph1 to those of graph2.
         """
-        Recursive matching function for VF2.
+        s1, s2 = self._s1, self._s2
+        if s1.n != s2.n or s1.num_edges != s2.num_edges:
+            return
+        palette = {}
+        colours1, colours2 = _refine([s1, s2], [
+            [palette.setdefault(label, len(palette)) for label in s.vertex_labels] for s in (s1, s2)
+        ])
+        if Counter(colours1) != Counter(colours2):
+            return
+        for core in _Matcher(s1, s2, colours1, colours2, induced_subgraph=False).run():
+            yield {s1.labels[u]: s2.labels[v] for u, v in enumerate(core)}
+
+    def is_subgraph_isomorphic(self):
         """
-        if len(mapping) == len(self.v1):
-            return True
+        Checks if graph2 is isomorphic to an induced subgraph of graph1.
 
-        # Get the next candidate pair to add to the mapping
-        u, v = self._next_candidate_pair(mapping)
+        Returns:
+            bool: True if such a subgraph exists, False otherwise.
+        """
+        return next(self.iter_subgraph_isomorphisms(), None) is not None
 
-        if u is None or v is None:
-            return False
+    def iter_subgraph_isomorphisms(self):
+        """
+        Iterates over all isomorphisms between induced subgraphs of graph1 and graph2.
+
+        Yields:
+            dict: A mapping from the vertices of the subgraph of graph1 to those of graph2.
+        """
+        s1, s2 = self._s1, self._s2
+        if s2.n > s1.n or s2.num_edges > s1.num_edges:
+            return
+        palette = {}
+        colours1 = [palette.setdefault(label, len(palette)) for label in s1.vertex_labels]
+        colours2 = [palette.setdefault(label, len(palette)) for label in s2.vertex_labels]
+        # graph2 is the pattern whose vertices are ordered and mapped into graph1
+        for core in _Matcher(s2, s1, colours2, colours1, induced_subgraph=True).run():
+            yield {s1.labels[v]: s2.labels[u] for u, v in enumerate(core)}
+
+
+def weisfeiler_lehman_hash(graph, iterations=3, node_labels=None):
+    """
+    Computes a Weisfeiler-Lehman hash of a graph. Isomorphic graphs always get
+    the same hash; different hashes prove that graphs are not isomorphic. The
+    hash is stable across processes, so it can be stored.
+
+    Args:
+        graph (dict or CSRGraph): Adjacency list of the graph.
+        iterations (int): The number of colour refinement rounds.
+        node_labels (dict, optional): Label of every vertex; labels are hashed by repr.
+
+    Returns:
+        str: A hexadecimal digest.
+    """
+    structure = _Structure(graph, node_labels)
+    colours = [_digest(repr(label)) for label in structure.vertex_labels]
+    histograms = [','.join(sorted(colours))]
+    for _ in range(iterations):
+        colours = [
+            _digest('%s|%s|%s' % (
+                colours[u],
+                ','.join(sorted(colours[w] for w in structure.succ[u])),
+                ','.join(sorted(colours[w] for w in structure.pred[u])),
+            ))
+            for u in range(structure.n)
+        ]
+        histograms.append(','.join(sorted(colours)))
+    return _digest(';'.join(histograms))
 
-        for v_candidate in self._get_feasible_v_candidates(u, mapping):
-            if self._is_feasible(u, v_candidate, mapping):
-                new_mapping = mapping.copy()
-                new_mapping[u] = v_candidate
-                if self._vf2_match(new_mapping):
-                    return True
-        return False
 
-    def _next_candidate_pair(self, mapping):
-        # In a real VF2, this would be more intelligent.
-        # Here, we just pick the next unmapped vertex from g1.
-        u = next((vertex for vertex in self.v1 if vertex not in mapping), None)
-        return u, None # v is determined by feasibility checks
+def _digest(text):
+    """
+    A short, process-independent hash of a string.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
 
-    def _get_feasible_v_candidates(self, u, mapping):
-        # Return all unmapped vertices in g2
-        return [v for v in self.v2 if v not in mapping.values()]
 
-    def _is_feasible(self, u, v, mapping):
+class _Structure:
+    """
+    A graph over integer ids with successor, predecessor and neighbour sets.
+    Parallel edges are ignored.
+    """
+    def __init__(self, graph, node_labels=None):
+        csr = as_csr(graph)
+        self.labels = list(csr.labels)
+        self.n = csr.num_vertices
+        offsets, targets = csr.offsets, csr.targets
+        self.succ = [set(targets[offsets[u]:offsets[u + 1]]) for u in range(self.n)]
+        self.pred = [set() for _ in range(self.n)]
+        for u in range(self.n):
+            for v in self.succ[u]:
+                self.pred[v].add(u)
+        self.neighbors = [self.succ[u] | self.pred[u] for u in range(self.n)]
+        self.num_edges = sum(len(s) for s in self.succ)
+        node_labels = node_labels or {}
+        self.vertex_labels = [node_labels.get(label) for label in self.labels]
+
+
+def _refine(structures, colours):
+    """
+    Joint WL colour refinement of several graphs with a shared palette, until
+    no graph gains colour classes.
+
+    Returns:
+        list: The final colour of every vertex, per graph.
+    """
+    while True:
+        palette = {}
+        refined = [
+            [
+                palette.setdefault((c[u], tuple(sorted(c[w] for w in s.succ[u])),
+                                    tuple(sorted(c[w] for w in s.pred[u]))), len(palette))
+                for u in range(s.n)
+            ]
+            for s, c in zip(structures, colours)
+        ]
+        if all(len(set(new)) == len(set(old)) for new, old in zip(refined, colours)):
+            return refined
+        colours = refined
+
+
+class _Matcher:
+    """
+    The VF2++ search of a pattern graph into a target graph.
+
+    With induced_subgraph=False both graphs have the same size and every pattern
+    vertex must match one of the same colour and degree (isomorphism). Otherwise
+    the pattern is matched to an induced subgraph of the target, and the target
+    degrees and terminal-set counts only need to be at least the pattern's.
+    """
+    def __init__(self, pattern, target, pattern_colours, target_colours, induced_subgraph):
+        self.p, self.t = pattern, target
+        self.pc, self.tc = pattern_colours, target_colours
+        self.induced_subgraph = induced_subgraph
+        self.core_p = [-1] * pattern.n
+        self.core_t = [-1] * target.n
+        self.term_p = [0] * pattern.n   # Number of mapped neighbours
+        self.term_t = [0] * target.n
+        self.by_colour = {}
+        for v in range(target.n):
+            self.by_colour.setdefault(target_colours[v], []).append(v)
+
+    def run(self):
         """
-        Check if mapping u to v is feasible.
+        Yields the target id of every pattern id for each complete match. The
+        search keeps one candidate list per depth instead of recursing.
         """
-        # Check if degrees are compatible
-        if len(self.g1.get(u, [])) != len(self.g2.get(v, [])):
+        p = self.p
+        if p.n == 0:
+            yield []
+            return
+        order, parent = self._order()
+        stack = [iter(self._candidates(order[0], parent))]
+        chosen = []
+        while stack:
+            depth = len(stack) - 1
+            u = order[depth]
+            if len(chosen) > depth:
+                self._unmap(u, chosen.pop())
+            for v in stack[-1]:
+                if self._feasible(u, v):
+                    self._map(u, v)
+                    chosen.append(v)
+                    break
+            else:
+                stack.pop()
+                continue
+            if len(chosen) == p.n:
+                yield list(self.core_p)
+            else:
+                stack.append(iter(self._candidates(order[depth + 1], parent)))
+
+    def _order(self):
+        """
+        The VF2++ matching order: breadth-first from the pattern vertex whose
+        colour is rarest in the target (then of largest degree), ordering every
+        level by connections to earlier vertices, degree and colour rarity.
+
+        Returns:
+            tuple: The order, and the earlier neighbour of every non-root vertex (or -1).
+        """
+        p, pc = self.p, self.pc
+        frequency = {c: len(vs) for c, vs in self.by_colour.items()}
+        degree = [len(p.succ[u]) + len(p.pred[u]) for u in range(p.n)]
+        roots = sorted(range(p.n), key=lambda u: (frequency.get(pc[u], 0), -degree[u]))
+        placed = bytearray(p.n)
+        connections = [0] * p.n
+        parent = [-1] * p.n
+        order = []
+        for root in roots:
+            if placed[root]:
+                continue
+            placed[root] = 1
+            level = [root]
+            while level:
+                level.sort(key=lambda u: (-connections[u], -degree[u], frequency.get(pc[u], 0)))
+                next_level = []
+                for u in level:
+                    order.append(u)
+                    for w in p.neighbors[u]:
+                        connections[w] += 1
+                        if not placed[w]:
+                            placed[w] = 1
+                            parent[w] = u
+                            next_level.append(w)
+                level = next_level
+        return order, parent
+
+    def _candidates(self, u, parent):
+        """
+        The target vertices u may map to: the matching neighbours of the image of
+        u's earlier neighbour, or every vertex of u's colour for a new component.
+        """
+        colour = self.pc[u]
+        if parent[u] < 0:
+            return list(self.by_colour.get(colour, ()))
+        image = self.core_p[parent[u]]
+        adjacent = self.t.succ[image] if u in self.p.succ[parent[u]] else self.t.pred[image]
+        return [v for v in adjacent if self.tc[v] == colour]
+
+    def _feasible(self, u, v):
+        """
+        Checks whether mapping u to v keeps the partial mapping consistent and
+        can still be completed, by the VF2 rules.
+        """
+        p, t = self.p, self.t
+        if self.core_t[v] != -1 or self.pc[u] != self.tc[v]:
+            return False
+        if self.induced_subgraph:
+            if len(t.succ[v]) < len(p.succ[u]) or len(t.pred[v]) < len(p.pred[u]):
+                return False
+        elif len(t.succ[v]) != len(p.succ[u]) or len(t.pred[v]) != len(p.pred[u]):
+            return False
+        if (u in p.succ[u]) != (v in t.succ[v]):
             return False
 
-        # Check consistency with the current partial mapping
-        for u_mapped, v_mapped in mapping.items():
-            # Check if adjacency is preserved
-            u_adj_to_u_mapped = u_mapped in self.g1.get(u, [])
-            v_adj_to_v_mapped = v_mapped in self.g2.get(v, [])
-            if u_adj_to_u_mapped != v_adj_to_v_mapped:
+        core_p, core_t = self.core_p, self.core_t
+        for p_adjacent, t_adjacent in ((p.succ[u], t.succ[v]), (p.pred[u], t.pred[v])):
+            mapped = 0
+            for w in p_adjacent:
+                image = core_p[w]
+                if image != -1:
+                    if image not in t_adjacent:
+                        return False
+                    mapped += 1
+            # Every edge between v and a mapped vertex must come from the pattern
+            if sum(1 for x in t_adjacent if core_t[x] != -1) != mapped:
                 return False
-        return True
+
+        # Look-ahead: unmapped neighbours in and outside the terminal set
+        p_terminal = p_new = t_terminal = t_new = 0
+        for w in p.neighbors[u]:
+            if core_p[w] == -1 and w != u:
+                if self.term_p[w]:
+                    p_terminal += 1
+                else:
+                    p_new += 1
+        for x in t.neighbors[v]:
+            if core_t[x] == -1 and x != v:
+                if self.term_t[x]:
+                    t_terminal += 1
+                else:
+                    t_new += 1
+        if self.induced_subgraph:
+            return p_terminal <= t_terminal and p_new <= t_new
+        return p_terminal == t_terminal and p_new == t_new
+
+    def _map(self, u, v):
+        self.core_p[u] = v
+        self.core_t[v] = u
+        for w in self.p.neighbors[u]:
+            self.term_p[w] += 1
+        for x in self.t.neighbors[v]:
+            self.term_t[x] += 1
+
+    def _unmap(self, u, v):
+        self.core_p[u] = -1
+        self.core_t[v] = -1
+        for w in self.p.neighbors[u]:
+            self.term_p[w] -= 1
+        for x in self.t.neighbors[v]:
+            self.term_t[x] -= 1
@@ -1,19 +1,38 @@
 import random
 
+from .csr_graph import as_csr
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only force_directed_layout needs it.
+    np = None
+
+_EXACT_LIMIT = 1000    # Largest graph whose repulsion is computed exactly by default
+_MAX_TREE_DEPTH = 20   # Quadtree levels; deeper cells only hold coincident points
+
 class GraphLayout:
     """
-    A placeholder for graph layout algorithms, such as force-directed layout.
-    These algorithms compute the positions of vertices for graph visualization.
+    Graph layout algorithms, which compute the positions of vertices for graph visualization.
+
+    force_directed_layout implements Fruchterman-Reingold. Every vertex repels
+    every other with force k^2 / d and edges pull their ends together with force
+    d^2 / k, where k is the ideal edge length. Displacements are capped by a
+    temperature that cools linearly. Repulsion is computed exactly with NumPy
+    broadcasting for small graphs and with a Barnes-Hut quadtree for large ones,
+    which treats a distant cell as a single mass at its centre, making each
+    iteration O(n log n).
     """
     def __init__(self, graph):
         """
         Initializes the GraphLayout object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph. Edge direction is ignored.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
     def random_layout(self, width=800, height=600):
         """
@@ -31,21 +50,99 @@ class GraphLayout:
             layout[vertex] = (random.uniform(0, width), random.uniform(0, height))
         return layout
 
-    def force_directed_layout_placeholder(self, iterations=50):
+    def force_directed_layout(self, iterations=50, width=800, height=600, tolerance=1e-4,
+                              barnes_hut=None, theta=0.5, positions=None, seed=None):
         """
-        A placeholder for a force-directed layout algorithm.
-        This is a conceptual implementation.
+        Computes a Fruchterman-Reingold force-directed layout.
+
+        Args:
+            iterations (int): The maximum number of iterations.
+            width (int): The width of the layout area.
+            height (int): The height of the layout area.
+            tolerance (float): Stop once the mean displacement of an iteration drops
+                               below tolerance times the ideal edge length.
+            barnes_hut (bool, optional): Approximate repulsion with a Barnes-Hut quadtree.
+                                         By default used above 1000 vertices.
+            theta (float): Barnes-Hut accuracy; a cell of size s at distance d is treated
+                           as one mass when s / d < theta. Smaller is more accurate.
+            positions (ndarray, optional): (n, 2) starting positions, e.g. a previous layout.
+                                           Random by default.
+            seed (int, optional): Seed for the random starting positions.
+
+        Returns:
+            tuple: A tuple containing:
+                - ndarray: The (n, 2) positions, scaled into the layout area.
+                - list: The vertex of every row.
         """
-        # 1. Initialize positions randomly
-        positions = self.random_layout()
+        if np is None:
+            raise ImportError("GraphLayout.force_directed_layout requires NumPy.")
+        n = self.csr.num_vertices
+        if positions is None:
+            positions = np.random.default_rng(seed).random((n, 2)) * (width, height)
+        else:
+            positions = np.array(positions, dtype=np.float64)
+            if positions.shape != (n, 2):
+                raise ValueError("positions must have one (x, y) row per vertex.")
+        if n == 0:
+            return positions, list(self.vertices)
+        if barnes_hut is None:
+            barnes_hut = n > _EXACT_LIMIT
 
-        # 2. Simulate forces for a number of iterations
-        # In a real implementation, you would calculate attractive forces for edges
-        # and repulsive forces between all nodes.
-        print(f"Simulating force-directed layout for {iterations} iterations (conceptual).")
-        # (Actual force calculation logic would go here)
+        u, v, strength = self._undirected_edges()
+        k = (width * height / n) ** 0.5
+        k2 = k * k
+        temperature = 0.1 * max(width, height)
 
-        return positions
+        for iteration in range(iterations):
+            if barnes_hut:
+                displacement = _barnes_hut_repulsion(positions, k2, theta)
+            else:
+                displacement = _exact_repulsion(positions, k2)
+
+            # Attraction along every edge, applied to both ends
+            delta = positions[u] - positions[v]
+            pull = delta * (strength * np.sqrt((delta * delta).sum(axis=1)) / k)[:, None]
+            for axis in range(2):
+                displacement[:, axis] -= np.bincount(u, weights=pull[:, axis], minlength=n)
+                displacement[:, axis] += np.bincount(v, weights=pull[:, axis], minlength=n)
+
+            # Move at most the current temperature
+            length = np.sqrt((displacement * displacement).sum(axis=1))
+            step = np.minimum(length, temperature)
+            positions += displacement * (step / np.maximum(length, 1e-12))[:, None]
+
+            if step.mean() < tolerance * k:
+                break
+            temperature *= 1 - 1 / (iterations - iteration)  # Linear cooling to 0
+
+        return _fit(positions, width, height), list(self.vertices)
+
+    def force_directed_layout_placeholder(self, iterations=50):
+        """
+        Returns force_directed_layout as a dictionary mapping each vertex to (x, y)
+        coordinates, or a random layout if NumPy is not installed.
+        """
+        if np is None:
+            return self.random_layout()
+        positions, vertices = self.force_directed_layout(iterations=iterations)
+        return {vertex: (float(x), float(y)) for vertex, (x, y) in zip(vertices, positions)}
+
+    def _undirected_edges(self):
+        """
+        Returns the distinct undirected edges, without self-loops, as arrays of
+        end ids and attraction strengths (the summed weights of weighted graphs).
+        """
+        offsets, targets, weights = self.csr.to_numpy()
+        n = self.csr.num_vertices
+        sources = np.repeat(np.arange(n), np.diff(offsets))
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+        keep = low != high
+        keys, inverse = np.unique(low[keep] * n + high[keep], return_inverse=True)
+        if self.csr.weighted:
+            strength = np.bincount(inverse, weights=weights[keep].astype(np.float64), minlength=len(keys))
+        else:
+            strength = np.ones(len(keys))
+        return keys // n, keys % n, strength
 
     def explain_concept(self):
         """
@@ -60,3 +157,114 @@ class GraphLayout:
             "- Hierarchical Layouts: Used for directed acyclic graphs (DAGs) to show hierarchy.\n"
             "- Circular Layouts: Place nodes in a circle, often used to highlight symmetries."
         )
+
+
+def _exact_repulsion(positions, k2):
+    """
+    The repulsive displacement k^2 / d of every vertex from every other, over
+    row blocks that bound the temporary memory.
+    """
+    n = len(positions)
+    displacement = np.zeros_like(positions)
+    block = max(1, (1 << 20) // n)
+    for start in range(0, n, block):
+        stop = min(n, start + block)
+        delta = positions[start:stop, None, :] - positions[None, :, :]
+        dist2 = (delta * delta).sum(axis=2)
+        dist2[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        displacement[start:stop] = k2 * (delta / np.maximum(dist2, 1e-12)[:, :, None]).sum(axis=1)
+    return displacement
+
+
+def _quadtree(positions):
+    """
+    Builds a linear quadtree: points are sorted by Morton code, so the points in
+    every cell are contiguous and the cells of each level are sorted by code.
+
+    Returns:
+        tuple: A tuple containing:
+            - list: Per level, the cell codes, point counts, centres of mass and
+                    the start and end of every cell's children in the next level.
+            - ndarray: The Morton code of every point.
+            - float: The side length of the root cell.
+            - int: The depth of the deepest level.
+    """
+    n = len(positions)
+    low = positions.min(axis=0)
+    side = max(float((positions.max(axis=0) - low).max()), 1e-12) * (1 + 1e-9)
+    grid = ((positions - low) * ((1 << _MAX_TREE_DEPTH) / side)).astype(np.int64)
+    codes = np.zeros(n, dtype=np.int64)
+    for bit in range(_MAX_TREE_DEPTH):
+        codes |= ((grid[:, 0] >> bit) & 1) << (2 * bit)
+        codes |= ((grid[:, 1] >> bit) & 1) << (2 * bit + 1)
+
+    order = np.argsort(codes, kind='stable')
+    sorted_codes, sorted_positions = codes[order], positions[order]
+    levels = []
+    for depth in range(_MAX_TREE_DEPTH + 1):
+        prefix = sorted_codes >> (2 * (_MAX_TREE_DEPTH - depth))
+        starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+        counts = np.diff(np.r_[starts, n])
+        centres = np.add.reduceat(sorted_positions, starts, axis=0) / counts[:, None]
+        levels.append([prefix[starts], counts, centres])
+        if len(starts) == n:  # Every point has its own cell
+            break
+
+    for depth in range(len(levels) - 1):
+        parents = levels[depth + 1][0] >> 2
+        levels[depth] += [np.searchsorted(parents, levels[depth][0], 'left'),
+                          np.searchsorted(parents, levels[depth][0], 'right')]
+    return levels, codes, side, len(levels) - 1
+
+
+def _barnes_hut_repulsion(positions, k2, theta):
+    """
+    Approximates the repulsive displacement of every vertex with a Barnes-Hut
+    quadtree. All (point, cell) pairs of one tree level are evaluated at once:
+    cells that are far enough away, or hold a single point, contribute directly,
+    and the others are opened into their children for the next level.
+    """
+    n = len(positions)
+    levels, codes, side, deepest = _quadtree(positions)
+    displacement = np.zeros_like(positions)
+    points = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+
+    for depth, level in enumerate(levels):
+        if len(points) == 0:
+            break
+        prefix, counts, centres = level[:3]
+        delta = positions[points] - centres[cells]
+        dist2 = (delta * delta).sum(axis=1)
+        inside = (codes[points] >> (2 * (_MAX_TREE_DEPTH - depth))) == prefix[cells]
+        size = side / (1 << depth)
+        accept = ~inside & ((counts[cells] == 1) | (size * size < theta * theta * dist2))
+        if depth == deepest:
+            accept = ~inside  # The rest coincide with the point itself
+
+        weight = k2 * counts[cells[accept]] / np.maximum(dist2[accept], 1e-12)
+        for axis in range(2):
+            displacement[:, axis] += np.bincount(points[accept], weights=weight * delta[accept, axis], minlength=n)
+
+        if depth == deepest:
+            break
+        # Open the remaining cells; a single-point cell containing the point is the point itself
+        opened = ~accept & (counts[cells] > 1)
+        points, cells = points[opened], cells[opened]
+        first, last = level[3][cells], level[4][cells]
+        num_children = last - first
+        points = np.repeat(points, num_children)
+        cells = np.arange(num_children.sum()) + np.repeat(first - np.cumsum(num_children) + num_children, num_children)
+    return displacement
+
+
+def _fit(positions, width, height):
+    """
+    Translates and uniformly scales positions into the width x height area.
+    """
+    positions = positions - positions.min(axis=0)
+    span = positions.max(axis=0)
+    scale = min(width / span[0] if span[0] > 0 else np.inf, height / span[1] if span[1] > 0 else np.inf)
+    if np.isfinite(scale):
+        positions *= scale
+    return positions
@@ -1,9 +1,17 @@
-from collections import deque
+from array import array
+
+from .csr_graph import CSRGraph
 
 class GraphMatching:
     """
     Implements the Hopcroft-Karp algorithm to find the maximum cardinality matching
     in a bipartite graph.
+
+    The vertices of U and V are relabelled to separate integer id ranges and the
+    matching state is kept in flat arrays, with -1 for an unmatched vertex. A
+    greedy pass matches most vertices up front; every phase then finds a maximal
+    set of shortest augmenting paths with a breadth-first layering and an
+    iterative depth-first search with current-edge pointers.
     """
     def __init__(self, graph):
         """
@@ -14,75 +22,154 @@ class GraphMatching:
                           The graph should be specified for one set of vertices (U),
                           with edges pointing to the other set (V).
                           Example: {'u1': ['v1', 'v2'], 'u2': ['v1'], ...}
+                          A CSRGraph is accepted; vertices with no out-edges are
+                          taken to be in V.
         """
         self.graph = graph
-        self.u_vertices = list(graph.keys())
-        # Infer v_vertices from the edges
-        v_set = set()
-        for edges in graph.values():
-            v_set.update(edges)
-        self.v_vertices = list(v_set)
+        if isinstance(graph, CSRGraph):
+            self._from_csr(graph)
+        else:
+            self.u_vertices = list(graph.keys())
+            v_index = {}
+            self.v_vertices = []
+            self._offsets = array('q', [0])
+            self._targets = array('q')
+            for u in self.u_vertices:
+                for v in graph[u]:
+                    i = v_index.get(v)
+                    if i is None:
+                        i = v_index[v] = len(self.v_vertices)
+                        self.v_vertices.append(v)
+                    self._targets.append(i)
+                self._offsets.append(len(self._targets))
 
         self.pair_u = {}
         self.pair_v = {}
-        self.dist = {}
-        self.NIL = 0 # Represents a null vertex
+        self.NIL = None  # Partner of an unmatched vertex in pair_u and pair_v
+
+    def _from_csr(self, csr):
+        """
+        Splits a CSRGraph into U (vertices with out-edges) and V (their targets).
+        """
+        offsets, targets = csr.offsets, csr.targets
+        u_ids = [u for u in range(csr.num_vertices) if offsets[u + 1] > offsets[u]]
+        v_local = {}
+        self._offsets = array('q', [0])
+        self._targets = array('q')
+        for u in u_ids:
+            for e in range(offsets[u], offsets[u + 1]):
+                self._targets.append(v_local.setdefault(targets[e], len(v_local)))
+            self._offsets.append(len(self._targets))
+        self.u_vertices = [csr.labels[u] for u in u_ids]
+        self.v_vertices = [csr.labels[v] for v in v_local]
 
     def hopcroft_karp(self):
         """
         Finds the maximum cardinality matching in the bipartite graph.
+        The matching is left in pair_u and pair_v.
 
         Returns:
             int: The size of the maximum matching.
         """
-        # Initialize pairs for all vertices in U and V
-        for u in self.u_vertices:
-            self.pair_u[u] = self.NIL
-        for v in self.v_vertices:
-            self.pair_v[v] = self.NIL
+        match_u, match_v = self._solve()
+        self.pair_u = {u: self.v_vertices[v] if v >= 0 else self.NIL for u, v in zip(self.u_vertices, match_u)}
+        self.pair_v = {v: self.u_vertices[u] if u >= 0 else self.NIL for v, u in zip(self.v_vertices, match_v)}
+        return sum(1 for v in match_u if v >= 0)
 
-        matching = 0
-        while self._bfs():
-            for u in self.u_vertices:
-                if self.pair_u[u] == self.NIL:
-                    if self._dfs(u):
-                        matching += 1
-        return matching
+    def maximum_matching(self):
+        """
+        Finds a maximum cardinality matching in the bipartite graph.
 
-    def _bfs(self):
+        Returns:
+            dict: The matched vertex of V for every matched vertex of U.
         """
-        BFS to build layers of augmenting paths.
+        self.hopcroft_karp()
+        return {u: v for u, v in self.pair_u.items() if v is not self.NIL}
+
+    def _solve(self):
         """
-        queue = deque()
-        for u in self.u_vertices:
-            if self.pair_u[u] == self.NIL:
-                self.dist[u] = 0
-                queue.append(u)
-            else:
-                self.dist[u] = float('inf')
+        Runs Hopcroft-Karp over the integer ids.
 
-        self.dist[self.NIL] = float('inf')
+        Returns:
+            tuple: The partner id of every U id and of every V id, or -1.
+        """
+        offsets, targets = self._offsets, self._targets
+        num_u, num_v = len(self.u_vertices), len(self.v_vertices)
+        match_u = array('q', [-1]) * num_u
+        match_v = array('q', [-1]) * num_v
 
-        while queue:
-            u = queue.popleft()
-            if self.dist[u] < self.dist[self.NIL]:
-                for v in self.graph.get(u, []):
-                    if self.dist.get(self.pair_v[v], float('inf')) == float('inf'):
-                        self.dist[self.pair_v[v]] = self.dist[u] + 1
-                        queue.append(self.pair_v[v])
-        return self.dist[self.NIL] != float('inf')
+        # Greedy initial matching: U vertices in order of increasing degree take the
+        # free neighbour with the fewest remaining unprocessed neighbours
+        remaining = array('q', [0]) * num_v
+        for v in targets:
+            remaining[v] += 1
+        for u in sorted(range(num_u), key=lambda u: offsets[u + 1] - offsets[u]):
+            best = -1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                remaining[v] -= 1
+                if match_v[v] < 0 and (best < 0 or remaining[v] < remaining[best]):
+                    best = v
+            if best >= 0:
+                match_u[u] = best
+                match_v[best] = u
 
-    def _dfs(self, u):
-        """
-        DFS to find an augmenting path.
-        """
-        if u != self.NIL:
-            for v in self.graph.get(u, []):
-                if self.dist.get(self.pair_v[v], float('inf')) == self.dist[u] + 1:
-                    if self._dfs(self.pair_v[v]):
-                        self.pair_v[v] = u
-                        self.pair_u[u] = v
-                        return True
-            self.dist[u] = float('inf')
-            return False
-        return True
+        unreached = num_u + 1
+        dist = array('q', [0]) * num_u
+        while True:
+            # BFS layering from the free vertices of U
+            queue = [u for u in range(num_u) if match_u[u] < 0]
+            for u in range(num_u):
+                dist[u] = unreached
+            for u in queue:
+                dist[u] = 0
+            limit = unreached  # Length of the shortest augmenting path, in U layers
+            for u in queue:  # The list grows while it is scanned
+                if dist[u] >= limit:
+                    continue
+                for e in range(offsets[u], offsets[u + 1]):
+                    w = match_v[targets[e]]
+                    if w < 0:
+                        if limit == unreached:
+                            limit = dist[u] + 1
+                    elif dist[w] == unreached:
+                        dist[w] = dist[u] + 1
+                        queue.append(w)
+            if limit == unreached:
+                break
+
+            # Iterative DFS along the layers, augmenting as soon as a path is found
+            pointer = array('q', offsets[:-1])
+            for root in range(num_u):
+                if match_u[root] >= 0 or dist[root] != 0:
+                    continue
+                stack = [root]
+                via = []  # via[i] is the V vertex leading from stack[i] to stack[i + 1]
+                while stack:
+                    u = stack[-1]
+                    end = offsets[u + 1]
+                    advanced = False
+                    while pointer[u] < end:
+                        v = targets[pointer[u]]
+                        pointer[u] += 1
+                        w = match_v[v]
+                        if w < 0:
+                            if dist[u] + 1 == limit:
+                                via.append(v)
+                                for x, y in zip(stack, via):
+                                    match_u[x] = y
+                                    match_v[y] = x
+                                stack = []
+                                advanced = True
+                                break
+                        elif dist[w] == dist[u] + 1:
+                            via.append(v)
+                            stack.append(w)
+                            advanced = True
+                            break
+                    if not advanced:
+                        dist[u] = unreached  # Dead end for the rest of the phase
+                        stack.pop()
+                        if via:
+                            via.pop()
+        return match_u, match_v
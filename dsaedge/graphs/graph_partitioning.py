@@ -1,10 +1,19 @@
+import heapq
+import math
 import random
+from collections import deque
+
+from .csr_graph import CSRGraph, as_csr
 
 class GraphPartitioning:
     """
     Implements the Kernighan-Lin algorithm for partitioning a graph into two
     equal-sized sets, minimizing the number of edges between them (the cut size).
     This is a heuristic algorithm.
+
+    For larger graphs, multilevel_partition coarsens the graph by heavy-edge
+    matching, partitions the coarsest graph, and refines the partition with
+    Fiduccia-Mattheyses moves while projecting it back, into any number of parts.
     """
     def __init__(self, graph):
         """
@@ -14,15 +23,29 @@ class GraphPartitioning:
             graph (dict): An adjacency list representation of the undirected, weighted graph.
                           Weights represent the cost of the edge.
                           Example: {'A': {'B': 1, 'C': 2}, 'B': {'A': 1, ...}}
+                          A CSRGraph is accepted and read with its weights as costs.
         """
+        csr = as_csr(graph)
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_adjacency_dict()
         self.graph = graph
-        self.vertices = list(graph.keys())
-        if len(self.vertices) % 2 != 0:
-            raise ValueError("Graph must have an even number of vertices.")
+        self.vertices = csr.labels
+        self.index = csr.index
+        # Edge costs by vertex id, without self-loops: adjacency[u] = {v: cost}
+        self.adjacency = [{} for _ in range(csr.num_vertices)]
+        for u in range(csr.num_vertices):
+            row = self.adjacency[u]
+            for e in range(csr.offsets[u], csr.offsets[u + 1]):
+                v = csr.targets[e]
+                if v != u:
+                    row[v] = row.get(v, 0) + csr.weights[e]
+        # The lowest cost of any vertex pair (0 for non-adjacent ones), bounding swap gains
+        self._cost_floor = min([0] + [cost for row in self.adjacency for cost in row.values()])
 
     def kernighan_lin(self, max_passes=10):
         """
-        Performs the Kernighan-Lin partitioning.
+        Performs the Kernighan-Lin partitioning. With an odd number of vertices
+        the second set gets the extra vertex.
 
         Args:
             max_passes (int): The maximum number of passes to perform.
@@ -32,38 +55,32 @@ class GraphPartitioning:
                 - partition (tuple): A tuple of two sets, representing the partition.
                 - cut_size (int): The size of the cut.
         """
+        num_vertices = len(self.vertices)
+
         # 1. Initial random partition
-        partition_a = set(random.sample(self.vertices, len(self.vertices) // 2))
-        partition_b = set(self.vertices) - partition_a
+        side = [1] * num_vertices
+        for v in random.sample(range(num_vertices), num_vertices // 2):
+            side[v] = 0
 
         for i in range(max_passes):
             # 2. Calculate D-values for all nodes
-            d_values = self._calculate_d_values(partition_a, partition_b)
+            d_values = self._calculate_d_values(side)
 
             # 3. Iteratively find pairs to swap
             swaps = []
             g_max = -float('inf')
             g_sum = 0
             best_k = -1
+            locked = bytearray(num_vertices)
+            buckets = (_GainBuckets(), _GainBuckets())  # Unlocked vertices of each side by D-value
+            for v in range(num_vertices):
+                buckets[side[v]].add(v, d_values[v])
 
-            temp_a, temp_b = set(partition_a), set(partition_b)
-
-            for k in range(len(self.vertices) // 2):
+            for k in range(num_vertices // 2):
                 # Find the best pair (a, b) to swap
-                max_gain = -float('inf')
-                best_pair = (None, None)
-
-                for a in temp_a:
-                    for b in temp_b:
-                        cost_ab = self.graph.get(a, {}).get(b, 0)
-                        gain = d_values[a] + d_values[b] - 2 * cost_ab
-                        if gain > max_gain:
-                            max_gain = gain
-                            best_pair = (a, b)
-                
-                if best_pair == (None, None): break # No more valid pairs
-
-                a_k, b_k = best_pair
+                max_gain, a_k, b_k = self._best_swap(buckets)
+                if a_k is None: break # No more valid pairs
+
                 swaps.append((a_k, b_k))
                 g_sum += max_gain
 
@@ -72,50 +89,453 @@ class GraphPartitioning:
                     best_k = k
 
                 # Update D-values for remaining nodes
-                self._update_d_values(d_values, a_k, b_k, temp_a, temp_b)
-                temp_a.remove(a_k)
-                temp_b.remove(b_k)
+                locked[a_k] = locked[b_k] = 1
+                buckets[0].remove(a_k, d_values[a_k])
+                buckets[1].remove(b_k, d_values[b_k])
+                self._update_d_values(d_values, a_k, b_k, side, locked, buckets)
 
             # 4. If max gain is positive, perform the best swaps
             if g_max > 0:
                 for k in range(best_k + 1):
                     a_k, b_k = swaps[k]
-                    partition_a.remove(a_k)
-                    partition_a.add(b_k)
-                    partition_b.remove(b_k)
-                    partition_b.add(a_k)
+                    side[a_k], side[b_k] = 1, 0
             else:
                 break # No improvement, stop
 
-        cut_size = self._calculate_cut_size(partition_a, partition_b)
-        return (partition_a, partition_b), cut_size
-
-    def _calculate_d_values(self, partition_a, partition_b):
-        d_values = {}
-        for v in self.vertices:
-            internal_cost = 0
-            external_cost = 0
-            current_partition = partition_a if v in partition_a else partition_b
-            other_partition = partition_b if v in partition_a else partition_a
-
-            for neighbor, weight in self.graph.get(v, {}).items():
-                if neighbor in current_partition:
-                    internal_cost += weight
-                elif neighbor in other_partition:
-                    external_cost += weight
-            d_values[v] = external_cost - internal_cost
+        partition = self._parts(side, 2)
+        return (partition[0], partition[1]), self.cut_size(partition)
+
+    def _calculate_d_values(self, side):
+        """
+        D-value of every vertex: external minus internal edge cost.
+        """
+        d_values = [0] * len(side)
+        for v, row in enumerate(self.adjacency):
+            for neighbor, weight in row.items():
+                if side[neighbor] == side[v]:
+                    d_values[v] -= weight
+                else:
+                    d_values[v] += weight
         return d_values
 
-    def _update_d_values(self, d_values, a_swapped, b_swapped, part_a, part_b):
-        # This is a simplified update. A more efficient implementation would be needed for large graphs.
-        # For now, we can just recalculate for the remaining nodes for simplicity.
-        # This is not the standard KL update, but serves for this example.
-        pass # In a real implementation, this would be more complex
+    def _best_swap(self, buckets):
+        """
+        Finds the unlocked pair (a, b) with the largest swap gain
+        D[a] + D[b] - 2 c(a, b). Candidates are taken from the gain buckets of
+        both sides in order of decreasing D-value, and the scan stops once
+        D[a] + D[b] - 2 c_min cannot beat the best gain, where c_min is the lowest
+        pair cost, or 0 if no cost is negative. Negative costs are allowed; they
+        only make the scan stop later.
+        """
+        slack = -2 * self._cost_floor
+        max_gain, best_a, best_b = -float('inf'), None, None
+        top_b = buckets[1].top()
+        if buckets[0].top() is None or top_b is None:
+            return max_gain, best_a, best_b
+
+        for a, d_a in buckets[0].descending():
+            if d_a + top_b[1] + slack <= max_gain:
+                break
+            costs = self.adjacency[a]
+            for b, d_b in buckets[1].descending():
+                if d_a + d_b + slack <= max_gain:
+                    break
+                gain = d_a + d_b - 2 * costs.get(b, 0)
+                if gain > max_gain:
+                    max_gain, best_a, best_b = gain, a, b
+        return max_gain, best_a, best_b
 
-    def _calculate_cut_size(self, partition_a, partition_b):
+    def _update_d_values(self, d_values, a_swapped, b_swapped, side, locked, buckets):
+        """
+        Updates the D-values (and gain buckets) of the unlocked vertices as if
+        a_swapped and b_swapped had changed sides. Only their neighbours change:
+            x on a's side:  D[x] += 2 c(x, a) - 2 c(x, b)
+            y on b's side:  D[y] += 2 c(y, b) - 2 c(y, a)
+        """
+        for swapped in (a_swapped, b_swapped):
+            home = side[swapped]
+            for x, weight in self.adjacency[swapped].items():
+                if not locked[x]:
+                    buckets[side[x]].remove(x, d_values[x])
+                    d_values[x] += 2 * weight if side[x] == home else -2 * weight
+                    buckets[side[x]].add(x, d_values[x])
+
+    def fiduccia_mattheyses(self, partition=None, imbalance=0.0, max_passes=10, seed=None):
+        """
+        Refines a bisection with Fiduccia-Mattheyses single-vertex moves.
+
+        Args:
+            partition (tuple, optional): Two sets of vertices to start from.
+                                         Defaults to a random halving.
+            imbalance (float): The allowed relative deviation from equal halves.
+            max_passes (int): The maximum number of passes to perform.
+            seed (int, optional): Seed for the random initial partition.
+
+        Returns:
+            tuple: A tuple containing:
+                - partition (tuple): A tuple of two sets, representing the partition.
+                - cut_size (int): The size of the cut.
+        """
+        num_vertices = len(self.vertices)
+        side = [1] * num_vertices
+        if partition is None:
+            for v in random.Random(seed).sample(range(num_vertices), num_vertices // 2):
+                side[v] = 0
+        else:
+            for v in partition[0]:
+                side[self.index[v]] = 0
+
+        lo, hi = _balance_bounds(num_vertices / 2, imbalance)
+        _fm_refine(self.adjacency, [1] * num_vertices, side, lo, hi, max_passes)
+        parts = self._parts(side, 2)
+        return (parts[0], parts[1]), self.cut_size(parts)
+
+    def multilevel_partition(self, k=2, imbalance=0.03, seed=None, max_passes=10):
+        """
+        Partitions the graph into k parts with a multilevel scheme and
+        recursive bisection. Each bisection coarsens the graph by repeatedly
+        contracting a heavy-edge matching, splits the coarsest graph by greedy
+        graph growing, and projects the split back level by level, refining it
+        with Fiduccia-Mattheyses moves on the way.
+
+        Args:
+            k (int): The number of parts; the vertex count need not be divisible by k.
+            imbalance (float): The allowed relative deviation of each split from its
+                               target size (parts come within about one vertex of
+                               equal with 0).
+            seed (int, optional): Seed for the matchings and initial splits.
+            max_passes (int): The maximum number of refinement passes per level.
+
+        Returns:
+            tuple: A tuple containing:
+                - list: The k parts, each a set of vertices.
+                - cut_size: The total cost of the edges between different parts.
+        """
+        num_vertices = len(self.vertices)
+        if not 1 <= k <= max(1, num_vertices):
+            raise ValueError("k must be between 1 and the number of vertices.")
+        rng = random.Random(seed)
+        part_of = [0] * num_vertices
+        # Deviations compound down the recursion, so each split gets its share of the budget
+        split_imbalance = imbalance / max(1, math.ceil(math.log2(k)))
+        _recursive_bisection(self.adjacency, [1] * num_vertices, list(range(num_vertices)),
+                             k, 0, part_of, split_imbalance, rng, max_passes)
+        parts = self._parts(part_of, k)
+        return parts, self.cut_size(parts)
+
+    def cut_size(self, parts):
+        """
+        Calculates the total cost of the edges between different parts.
+
+        Args:
+            parts (iterable): The parts, each an iterable of vertices.
+        """
+        part_of = {}
+        for i, part in enumerate(parts):
+            for v in part:
+                part_of[self.index[v]] = i
         cut_size = 0
-        for u in partition_a:
-            for v, weight in self.graph.get(u, {}).items():
-                if v in partition_b:
+        for u, row in enumerate(self.adjacency):
+            for v, weight in row.items():
+                if u < v and part_of.get(u) != part_of.get(v):
                     cut_size += weight
         return cut_size
+
+    def _calculate_cut_size(self, partition_a, partition_b):
+        return self.cut_size((partition_a, partition_b))
+
+    def _parts(self, part_of, k):
+        """
+        Turns the part of every vertex id into k sets of vertices.
+        """
+        parts = [set() for _ in range(k)]
+        for v, part in enumerate(part_of):
+            parts[part].add(self.vertices[v])
+        return parts
+
+
+_COARSEST_SIZE = 60  # Stop coarsening below this many vertices
+
+
+def _balance_bounds(target, imbalance, least=0, most=math.inf):
+    """
+    The allowed range for the weight of the first side of a bisection: target
+    plus or minus the slack, rounded inwards. A slack below one vertex leaves
+    the integer weights nearest to target. The range is clamped to [least, most].
+    """
+    slack = imbalance * target
+    lo, hi = math.ceil(target - slack), math.floor(target + slack)
+    if lo > hi:
+        lo, hi = math.floor(target), math.ceil(target)
+    return max(lo, least), min(hi, most)
+
+
+def _recursive_bisection(adjacency, vertex_weight, ids, k, first_part, part_of, imbalance, rng, max_passes):
+    """
+    Splits the graph into parts first_part .. first_part + k - 1, writing the
+    part of every vertex into part_of (indexed by the original ids). Every
+    split may deviate from its target by the given imbalance.
+    """
+    if k == 1:
+        for v in ids:
+            part_of[v] = first_part
+        return
+    if len(adjacency) <= k:
+        for i, v in enumerate(ids):
+            part_of[v] = first_part + i
+        return
+
+    k_first = k // 2
+    total_weight = sum(vertex_weight)
+    target = total_weight * k_first / k
+    # Each side must keep at least one vertex per part it is split into
+    least = k_first * min(vertex_weight)
+    bounds = _balance_bounds(target, imbalance, least, total_weight - (k - k_first) * min(vertex_weight))
+    side = _multilevel_bisection(adjacency, vertex_weight, target, bounds, rng, max_passes)
+
+    for half, half_k, half_first in ((0, k_first, first_part), (1, k - k_first, first_part + k_first)):
+        members = [v for v in range(len(adjacency)) if side[v] == half]
+        local = {v: i for i, v in enumerate(members)}
+        sub_adjacency = [
+            {local[w]: cost for w, cost in adjacency[v].items() if w in local}
+            for v in members
+        ]
+        _recursive_bisection(sub_adjacency, [vertex_weight[v] for v in members], [ids[v] for v in members],
+                             half_k, half_first, part_of, imbalance, rng, max_passes)
+
+
+def _multilevel_bisection(adjacency, vertex_weight, target, bounds, rng, max_passes):
+    """
+    Splits a graph into two sides, the first weighing about target and within
+    the (lo, hi) bounds if possible.
+
+    Returns:
+        list: The side (0 or 1) of every vertex.
+    """
+    lo, hi = bounds
+    total_weight = sum(vertex_weight)
+
+    # Coarsen
+    levels = []
+    graph, weights = adjacency, vertex_weight
+    max_vertex_weight = max(1.5 * total_weight / _COARSEST_SIZE, max(vertex_weight))
+    while len(graph) > _COARSEST_SIZE:
+        coarse_graph, coarse_weights, coarse_of = _coarsen(graph, weights, max_vertex_weight, rng)
+        if len(coarse_graph) > 0.95 * len(graph):
+            break  # Matching no longer shrinks the graph
+        levels.append((graph, weights, coarse_of))
+        graph, weights = coarse_graph, coarse_weights
+
+    # Partition the coarsest graph: best of a few grown and refined splits
+    best_side, best_score = None, None
+    for _ in range(4):
+        side = _grow_bisection(graph, weights, target, rng)
+        _fm_refine(graph, weights, side, lo, hi, max_passes)
+        weight = sum(w for w, s in zip(weights, side) if s == 0)
+        score = (max(0, lo - weight, weight - hi), _cut(graph, side))
+        if best_score is None or score < best_score:
+            best_side, best_score = side, score
+
+    # Uncoarsen and refine
+    side = best_side
+    for graph, weights, coarse_of in reversed(levels):
+        side = [side[c] for c in coarse_of]
+        _fm_refine(graph, weights, side, lo, hi, max_passes)
+    return side
+
+
+def _coarsen(adjacency, vertex_weight, max_vertex_weight, rng):
+    """
+    Contracts a heavy-edge matching: each unmatched vertex, in random order, is
+    merged with the unmatched neighbour it shares the heaviest edge with.
+
+    Returns:
+        tuple: The coarse adjacency, the coarse vertex weights, and the coarse
+               vertex of every fine vertex.
+    """
+    num_vertices = len(adjacency)
+    coarse_of = [-1] * num_vertices
+    order = list(range(num_vertices))
+    rng.shuffle(order)
+    num_coarse = 0
+    for u in order:
+        if coarse_of[u] != -1:
+            continue
+        mate, mate_cost = -1, None
+        for v, cost in adjacency[u].items():
+            if (coarse_of[v] == -1 and (mate_cost is None or cost > mate_cost)
+                    and vertex_weight[u] + vertex_weight[v] <= max_vertex_weight):
+                mate, mate_cost = v, cost
+        coarse_of[u] = num_coarse
+        if mate != -1:
+            coarse_of[mate] = num_coarse
+        num_coarse += 1
+
+    coarse_adjacency = [{} for _ in range(num_coarse)]
+    coarse_weight = [0] * num_coarse
+    for u in range(num_vertices):
+        cu = coarse_of[u]
+        coarse_weight[cu] += vertex_weight[u]
+        row = coarse_adjacency[cu]
+        for v, cost in adjacency[u].items():
+            cv = coarse_of[v]
+            if cv != cu:
+                row[cv] = row.get(cv, 0) + cost
+    return coarse_adjacency, coarse_weight, coarse_of
+
+
+def _grow_bisection(adjacency, vertex_weight, target, rng):
+    """
+    Greedy graph growing: the first side is grown breadth-first from a random
+    vertex until it weighs about target.
+    """
+    num_vertices = len(adjacency)
+    side = [1] * num_vertices
+    seen = bytearray(num_vertices)
+    weight = 0
+    unvisited = list(range(num_vertices))
+    rng.shuffle(unvisited)
+    queue = deque()
+    while True:
+        if not queue:
+            while unvisited and seen[unvisited[-1]]:
+                unvisited.pop()
+            if not unvisited:
+                break
+            start = unvisited.pop()
+            seen[start] = 1
+            queue.append(start)
+        u = queue.popleft()
+        if weight + vertex_weight[u] / 2 > target:
+            break
+        side[u] = 0
+        weight += vertex_weight[u]
+        for v in adjacency[u]:
+            if not seen[v]:
+                seen[v] = 1
+                queue.append(v)
+    return side
+
+
+def _fm_refine(adjacency, vertex_weight, side, lo, hi, max_passes):
+    """
+    Fiduccia-Mattheyses refinement of a bisection, in place.
+
+    Each pass moves every vertex at most once, always the highest-gain vertex
+    whose move keeps the first side's weight within one vertex weight of
+    [lo, hi] (or, while it is further outside, does not take it further away),
+    and then rolls back to the best prefix of moves, preferring balanced ones.
+    Gains are kept in buckets and updated incrementally for the neighbours of
+    each moved vertex.
+    """
+    num_vertices = len(adjacency)
+    if num_vertices == 0:
+        return
+    weight = sum(w for w, s in zip(vertex_weight, side) if s == 0)
+    violation = lambda w: max(0, lo - w, w - hi)
+    allowance = max(vertex_weight)
+
+    for _ in range(max_passes):
+        gain = [0] * num_vertices  # Cut reduction if the vertex changes sides
+        for u, row in enumerate(adjacency):
+            for v, cost in row.items():
+                gain[u] += cost if side[v] != side[u] else -cost
+        buckets = (_GainBuckets(), _GainBuckets())
+        for u in range(num_vertices):
+            buckets[side[u]].add(u, gain[u])
+
+        locked = bytearray(num_vertices)
+        moves = []
+        total_gain = 0
+        best_score, best_moves = (violation(weight), 0), 0
+
+        while True:
+            choice = None
+            for from_side in (0, 1):
+                top = buckets[from_side].top()
+                if top is None:
+                    continue
+                u, g = top
+                new_weight = weight - vertex_weight[u] if from_side == 0 else weight + vertex_weight[u]
+                if violation(new_weight) > max(violation(weight), allowance):
+                    continue
+                if choice is None or g > choice[1]:
+                    choice = (u, g, new_weight)
+            if choice is None:
+                break
+
+            u, g, weight = choice
+            from_side = side[u]
+            buckets[from_side].remove(u, g)
+            locked[u] = 1
+            side[u] = 1 - from_side
+            total_gain += g
+            moves.append(u)
+            for v, cost in adjacency[u].items():
+                if locked[v]:
+                    continue
+                buckets[side[v]].remove(v, gain[v])
+                # The edge (u, v) is now cut if v stayed behind, and uncut if v is on u's new side
+                gain[v] += 2 * cost if side[v] == from_side else -2 * cost
+                buckets[side[v]].add(v, gain[v])
+
+            score = (violation(weight), -total_gain)
+            if score < best_score:
+                best_score, best_moves = score, len(moves)
+
+        # Roll back the moves after the best prefix
+        for u in moves[best_moves:]:
+            side[u] = 1 - side[u]
+            weight += vertex_weight[u] if side[u] == 0 else -vertex_weight[u]
+        if best_moves == 0:
+            break
+
+
+def _cut(adjacency, side):
+    """
+    The cost of the edges between the two sides.
+    """
+    return sum(cost for u, row in enumerate(adjacency) for v, cost in row.items() if u < v and side[u] != side[v])
+
+
+class _GainBuckets:
+    """
+    Vertices bucketed by gain. The largest non-empty bucket is found through a
+    max-heap of bucket gains, from which emptied buckets are dropped lazily.
+    """
+    def __init__(self):
+        self.buckets = {}  # gain -> {vertex: None}, an insertion-ordered set
+        self.gains = []    # Negated gains of the buckets
+
+    def add(self, vertex, gain):
+        bucket = self.buckets.get(gain)
+        if bucket is None:
+            bucket = self.buckets[gain] = {}
+            heapq.heappush(self.gains, -gain)
+        bucket[vertex] = None
+
+    def remove(self, vertex, gain):
+        bucket = self.buckets[gain]
+        del bucket[vertex]
+        if not bucket:
+            del self.buckets[gain]
+
+    def descending(self):
+        """
+        Yields (vertex, gain) pairs in order of decreasing gain. Only the
+        distinct gains are sorted, and the buckets must not change meanwhile.
+        """
+        for gain in sorted(self.buckets, reverse=True):
+            for vertex in self.buckets[gain]:
+                yield vertex, gain
+
+    def top(self):
+        """
+        Returns a (vertex, gain) pair with the largest gain, or None if empty.
+        """
+        while self.gains:
+            bucket = self.buckets.get(-self.gains[0])
+            if bucket:
+                return next(iter(bucket)), -self.gains[0]
+            heapq.heappop(self.gains)
+        return None
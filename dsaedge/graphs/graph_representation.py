@@ -1,5 +1,7 @@
 from collections import defaultdict, deque
-import heapq
+
+from ..heaps.indexed_min_heap import IndexedMinHeap
+from .csr_graph import CSRGraph
 
 class Graph:
     """
@@ -21,35 +23,46 @@ class Graph:
             self.adj_list[v].append((u, weight))
 
     def bfs(self, start_vertex):
+        return list(self.iter_bfs(start_vertex))
+
+    def iter_bfs(self, start_vertex):
+        """
+        Yields the vertices in BFS order, lazily. Yields nothing for an unknown vertex.
+        """
         if start_vertex not in self.adj_list:
-            return []
-        visited = set()
+            return
+        visited = {start_vertex}
         queue = deque([start_vertex])
-        result = []
-        visited.add(start_vertex)
         while queue:
             vertex = queue.popleft()
-            result.append(vertex)
+            yield vertex
             for neighbor, _ in self.adj_list[vertex]:
                 if neighbor not in visited:
                     visited.add(neighbor)
                     queue.append(neighbor)
-        return result
 
     def dfs(self, start_vertex):
-        if start_vertex not in self.adj_list:
-            return []
-        visited = set()
-        result = []
-        self._dfs_recursive(start_vertex, visited, result)
-        return result
+        return list(self.iter_dfs(start_vertex))
 
-    def _dfs_recursive(self, vertex, visited, result):
-        visited.add(vertex)
-        result.append(vertex)
-        for neighbor, _ in self.adj_list[vertex]:
-            if neighbor not in visited:
-                self._dfs_recursive(neighbor, visited, result)
+    def iter_dfs(self, start_vertex):
+        """
+        Yields the vertices in DFS pre-order, lazily, using an explicit stack of
+        neighbour iterators instead of recursion. Yields nothing for an unknown vertex.
+        """
+        if start_vertex not in self.adj_list:
+            return
+        visited = {start_vertex}
+        yield start_vertex
+        stack = [iter(self.adj_list[start_vertex])]
+        while stack:
+            for neighbor, _ in stack[-1]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    stack.append(iter(self.adj_list[neighbor]))
+                    break
+            else:
+                stack.pop()
 
     def dijkstra(self, start_vertex):
         if start_vertex not in self.adj_list:
@@ -57,17 +70,18 @@ class Graph:
         distances = {vertex: float('infinity') for vertex in self.adj_list}
         predecessors = {vertex: None for vertex in self.adj_list}
         distances[start_vertex] = 0
-        pq = [(0, start_vertex)]
+        settled = set()
+        pq = IndexedMinHeap()  # One entry per vertex, lowered with decrease-key
+        pq.push(start_vertex, 0)
         while pq:
-            current_distance, current_vertex = heapq.heappop(pq)
-            if current_distance > distances[current_vertex]:
-                continue
+            current_vertex, current_distance = pq.pop()
+            settled.add(current_vertex)
             for neighbor, weight in self.adj_list[current_vertex]:
                 distance = current_distance + weight
-                if distance < distances[neighbor]:
+                if neighbor not in settled and distance < distances[neighbor]:
                     distances[neighbor] = distance
                     predecessors[neighbor] = current_vertex
-                    heapq.heappush(pq, (distance, neighbor))
+                    pq.push_or_decrease(neighbor, distance)
         return distances, predecessors
 
     def prims_algorithm(self, start_vertex):
@@ -81,25 +95,32 @@ class Graph:
 
         mst_cost = 0
         mst_edges = []
-        visited = {start_vertex}
-        # Priority queue stores (weight, from_vertex, to_vertex)
-        pq = [(weight, start_vertex, neighbor) for neighbor, weight in self.adj_list[start_vertex]]
-        heapq.heapify(pq)
+        visited = set()
+        # Priority queue holds each vertex once, keyed by its cheapest edge into the tree
+        best_edge = {}
+        pq = IndexedMinHeap()
+        pq.push(start_vertex, 0)
 
         while pq and len(visited) < len(self.adj_list):
-            weight, u, v = heapq.heappop(pq)
-
-            if v not in visited:
-                visited.add(v)
+            v, weight = pq.pop()
+            visited.add(v)
+            if v != start_vertex:
                 mst_cost += weight
-                mst_edges.append((u, v, weight))
+                mst_edges.append((best_edge[v], v, weight))
 
-                for neighbor, next_weight in self.adj_list[v]:
-                    if neighbor not in visited:
-                        heapq.heappush(pq, (next_weight, v, neighbor))
+            for neighbor, next_weight in self.adj_list[v]:
+                if neighbor not in visited and pq.push_or_decrease(neighbor, next_weight):
+                    best_edge[neighbor] = v
         
         return mst_cost, mst_edges
 
+    def to_csr(self):
+        """
+        Compacts the adjacency list into a CSRGraph, which every algorithm in
+        dsaedge.graphs accepts in place of an adjacency dict.
+        """
+        return CSRGraph.from_graph(self)
+
     def __str__(self):
         output = ""
         for vertex, neighbors in self.adj_list.items():
@@ -1,20 +1,31 @@
 from collections import deque
 
+from ..heaps.indexed_min_heap import IndexedMinHeap
+from .csr_graph import as_csr
+
 class GraphSearch:
     """
     Provides methods to find a path between two vertices in a graph using
-    Breadth-First Search (BFS) and Depth-First Search (DFS).
+    Breadth-First Search (BFS), Depth-First Search (DFS), bidirectional BFS,
+    bidirectional Dijkstra and A* search.
+
+    All searches record a predecessor per discovered vertex and rebuild the path
+    only once the end vertex is reached, instead of copying a path per queue entry.
     """
     def __init__(self, graph):
         """
         Initializes the GraphSearch object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph. Weighted adjacency lists are
+                          accepted; the BFS/DFS searches ignore the weights.
                           Example: {'A': ['B', 'C'], 'B': ['D', 'E'], ...}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
+        self._reverse_csr = None
 
     def find_path_bfs(self, start_vertex, end_vertex):
         """
@@ -27,24 +38,25 @@ class GraphSearch:
         Returns:
             list: A list of vertices representing the path, or None if no path exists.
         """
-        if start_vertex not in self.vertices or end_vertex not in self.vertices:
+        if start_vertex not in self.csr.index or end_vertex not in self.csr.index:
             return None
 
-        queue = deque([(start_vertex, [start_vertex])])
-        visited = {start_vertex}
+        offsets, targets = self.csr.offsets, self.csr.targets
+        source, target = self.csr.index[start_vertex], self.csr.index[end_vertex]
+        queue = deque([source])
+        predecessors = {source: -1}
 
         while queue:
-            current_vertex, path = queue.popleft()
+            current_vertex = queue.popleft()
 
-            if current_vertex == end_vertex:
-                return path
+            if current_vertex == target:
+                return self._build_path(predecessors, target)
 
-            for neighbor in self.graph.get(current_vertex, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append((neighbor, new_path))
+            for e in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[e]
+                if neighbor not in predecessors:
+                    predecessors[neighbor] = current_vertex
+                    queue.append(neighbor)
         return None
 
     def find_path_dfs(self, start_vertex, end_vertex):
@@ -58,22 +70,203 @@ class GraphSearch:
         Returns:
             list: A list of vertices representing the path, or None if no path exists.
         """
-        if start_vertex not in self.vertices or end_vertex not in self.vertices:
+        if start_vertex not in self.csr.index or end_vertex not in self.csr.index:
             return None
 
-        stack = [(start_vertex, [start_vertex])]
-        visited = {start_vertex}
+        offsets, targets = self.csr.offsets, self.csr.targets
+        source, target = self.csr.index[start_vertex], self.csr.index[end_vertex]
+        stack = [source]
+        predecessors = {source: -1}
 
         while stack:
-            current_vertex, path = stack.pop()
+            current_vertex = stack.pop()
 
-            if current_vertex == end_vertex:
-                return path
+            if current_vertex == target:
+                return self._build_path(predecessors, target)
 
-            for neighbor in self.graph.get(current_vertex, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    stack.append((neighbor, new_path))
+            for e in range(offsets[current_vertex], offsets[current_vertex + 1]):
+                neighbor = targets[e]
+                if neighbor not in predecessors:
+                    predecessors[neighbor] = current_vertex
+                    stack.append(neighbor)
         return None
+
+    def find_path_bidirectional_bfs(self, start_vertex, end_vertex):
+        """
+        Finds a shortest (fewest edges) path using BFS from both ends at once.
+        Each round expands one whole level of the smaller frontier, so only about
+        the square root of the vertices a one-sided BFS would touch are visited.
+
+        Args:
+            start_vertex: The starting vertex.
+            end_vertex: The ending vertex.
+
+        Returns:
+            list: A list of vertices representing the path, or None if no path exists.
+        """
+        if start_vertex not in self.csr.index or end_vertex not in self.csr.index:
+            return None
+
+        source, target = self.csr.index[start_vertex], self.csr.index[end_vertex]
+        if source == target:
+            return [start_vertex]
+
+        # Per direction: graph to expand, predecessors (which double as visited), depths, frontier
+        forward = (self.csr, {source: -1}, {source: 0}, [source])
+        backward = (self._get_reverse(), {target: -1}, {target: 0}, [target])
+
+        while forward[3] and backward[3]:
+            expand_forward = len(forward[3]) <= len(backward[3])
+            side, other = (forward, backward) if expand_forward else (backward, forward)
+            graph, predecessors, depths, frontier = side
+            other_depths = other[2]
+            offsets, targets = graph.offsets, graph.targets
+
+            best_length, meeting = float('infinity'), -1
+            next_frontier = []
+            for u in frontier:
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if v not in predecessors:
+                        predecessors[v] = u
+                        depths[v] = depths[u] + 1
+                        next_frontier.append(v)
+                    if v in other_depths and depths[u] + 1 + other_depths[v] < best_length:
+                        best_length = depths[u] + 1 + other_depths[v]
+                        meeting = (u, v)
+            frontier[:] = next_frontier
+
+            if meeting != -1:
+                # Route through the edge that realised the best length, oriented start -> end
+                u, v = meeting if expand_forward else reversed(meeting)
+                tail = self._build_path(backward[1], v)
+                tail.reverse()
+                return self._build_path(forward[1], u) + tail
+        return None
+
+    def find_path_bidirectional_dijkstra(self, start_vertex, end_vertex):
+        """
+        Finds a minimum-weight path by running Dijkstra's algorithm from both ends,
+        stopping once the two searches cannot improve on the best meeting point.
+        Edge weights must be non-negative.
+
+        Args:
+            start_vertex: The starting vertex.
+            end_vertex: The ending vertex.
+
+        Returns:
+            tuple: (distance, path), or (float('infinity'), None) if no path exists.
+        """
+        if start_vertex not in self.csr.index or end_vertex not in self.csr.index:
+            return float('infinity'), None
+
+        source, target = self.csr.index[start_vertex], self.csr.index[end_vertex]
+        if source == target:
+            return 0, [start_vertex]
+
+        graphs = (self.csr, self._get_reverse())
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({source: -1}, {target: -1})
+        settled = (set(), set())
+        heaps = (IndexedMinHeap(), IndexedMinHeap())
+        heaps[0].push(source, 0)
+        heaps[1].push(target, 0)
+        best, meeting = float('infinity'), -1
+
+        while heaps[0] and heaps[1]:
+            top_forward, top_backward = heaps[0].peek()[1], heaps[1].peek()[1]
+            if top_forward + top_backward >= best:
+                break
+            side = 0 if top_forward <= top_backward else 1
+            u, current_distance = heaps[side].pop()
+            settled[side].add(u)
+
+            graph, dist, other_dist = graphs[side], distances[side], distances[1 - side]
+            offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                distance = current_distance + weights[e]
+                if v not in settled[side] and distance < dist.get(v, float('infinity')):
+                    dist[v] = distance
+                    predecessors[side][v] = u
+                    heaps[side].push_or_decrease(v, distance)
+                if v in other_dist and distance + other_dist[v] < best:
+                    best = distance + other_dist[v]
+                    meeting = v
+
+        if meeting == -1:
+            return float('infinity'), None
+        path = self._build_path(predecessors[0], meeting)
+        tail = self._build_path(predecessors[1], meeting)
+        tail.reverse()
+        return best, path + tail[1:]
+
+    def find_path_astar(self, start_vertex, end_vertex, heuristic=None):
+        """
+        Finds a minimum-weight path using A* search. Edge weights must be non-negative.
+
+        Args:
+            start_vertex: The starting vertex.
+            end_vertex: The ending vertex.
+            heuristic (callable, optional): heuristic(vertex, end_vertex) returning an
+                          estimate of the remaining distance that never overestimates it
+                          (e.g. straight-line distance on a road graph). Defaults to 0,
+                          which makes A* behave like Dijkstra's algorithm.
+
+        Returns:
+            tuple: (distance, path), or (float('infinity'), None) if no path exists.
+        """
+        if start_vertex not in self.csr.index or end_vertex not in self.csr.index:
+            return float('infinity'), None
+
+        csr = self.csr
+        offsets, targets, weights, labels = csr.offsets, csr.targets, csr.weights, csr.labels
+        source, target = csr.index[start_vertex], csr.index[end_vertex]
+        estimates = {}
+
+        def estimate(v):
+            if heuristic is None:
+                return 0
+            if v not in estimates:
+                estimates[v] = heuristic(labels[v], end_vertex)
+            return estimates[v]
+
+        g_score = {source: 0}
+        predecessors = {source: -1}
+        pq = IndexedMinHeap()  # vertex id -> f = g + h
+        pq.push(source, estimate(source))
+
+        while pq:
+            u, _ = pq.pop()
+            current_distance = g_score[u]
+            if u == target:
+                return current_distance, self._build_path(predecessors, target)
+
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                distance = current_distance + weights[e]
+                if distance < g_score.get(v, float('infinity')):
+                    g_score[v] = distance
+                    predecessors[v] = u
+                    pq.push_or_decrease(v, distance + estimate(v))
+        return float('infinity'), None
+
+    def _build_path(self, predecessors, end):
+        """
+        Rebuilds the path ending at vertex id end from a predecessor map (-1 marks the start).
+        """
+        labels = self.csr.labels
+        path = []
+        while end != -1:
+            path.append(labels[end])
+            end = predecessors[end]
+        path.reverse()
+        return path
+
+    def _get_reverse(self):
+        """
+        Returns the transposed graph used by backward searches, built on first use.
+        """
+        if self._reverse_csr is None:
+            self._reverse_csr = self.csr.transpose()
+        return self._reverse_csr
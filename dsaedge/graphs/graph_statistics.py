@@ -1,3 +1,5 @@
+from .csr_graph import as_csr
+
 class GraphStatistics:
     """
     Computes various statistics for a graph.
@@ -7,11 +9,13 @@ class GraphStatistics:
         Initializes the GraphStatistics object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph.
             directed (bool): Whether the graph is directed.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.directed = directed
 
     def get_number_of_vertices(self):
@@ -24,7 +28,7 @@ class GraphStatistics:
         """
         Returns the number of edges in the graph.
         """
-        num_edges = sum(len(edges) for edges in self.graph.values())
+        num_edges = self.csr.num_edges
         if not self.directed:
             num_edges //= 2  # Each edge is counted twice in an undirected graph
         return num_edges
@@ -37,9 +41,10 @@ class GraphStatistics:
             dict: A dictionary where keys are degrees and values are the number of nodes
                   with that degree.
         """
+        offsets = self.csr.offsets
         degree_dist = {}
-        for v in self.vertices:
-            degree = len(self.graph.get(v, []))
+        for v in range(self.csr.num_vertices):
+            degree = offsets[v + 1] - offsets[v]
             degree_dist[degree] = degree_dist.get(degree, 0) + 1
         return degree_dist
 
@@ -50,5 +55,4 @@ class GraphStatistics:
         num_vertices = self.get_number_of_vertices()
         if num_vertices == 0:
             return 0
-        total_degree = sum(len(edges) for edges in self.graph.values())
-        return total_degree / num_vertices
+        return self.csr.num_edges / num_vertices
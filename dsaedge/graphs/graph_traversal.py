@@ -1,4 +1,21 @@
+import os
+from array import array
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .csr_graph import as_csr
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bfs_distances falls back to pure Python.
+    np = None
+
+# Direction-optimizing switch (Beamer et al.): go bottom-up once the frontier has
+# more than 1/_ALPHA of the unexplored edges, and back once it holds fewer than
+# 1/_BETA of the vertices.
+_ALPHA = 14
+_BETA = 24
+_CHUNK_EDGES = 1 << 20  # Edges gathered per vectorised step
 
 class GraphTraversal:
     """
@@ -10,11 +27,13 @@ class GraphTraversal:
         Initializes the GraphTraversal object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph.
                           Example: {'A': ['B', 'C'], 'B': ['D', 'E'], ...}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
     def bfs(self, start_vertex):
         """
@@ -26,23 +45,190 @@ class GraphTraversal:
         Returns:
             list: A list of vertices in BFS order.
         """
-        if start_vertex not in self.vertices:
-            raise ValueError("Start vertex not in graph.")
+        return list(self.iter_bfs(start_vertex))
 
-        visited = {v: False for v in self.vertices}
-        queue = deque([start_vertex])
-        result = []
-        visited[start_vertex] = True
+    def iter_bfs(self, start_vertex):
+        """
+        Performs a Breadth-First Search traversal lazily, so that it can be
+        stopped early or streamed.
+
+        Args:
+            start_vertex: The vertex to start the traversal from.
+
+        Returns:
+            iterator: The vertices in BFS order.
+        """
+        return self._iter_bfs(self._start(start_vertex))
+
+    def _iter_bfs(self, source):
+        offsets, targets, labels = self.csr.offsets, self.csr.targets, self.csr.labels
+        visited = bytearray(self.csr.num_vertices)
+        queue = deque([source])
+        visited[source] = True
 
         while queue:
             vertex = queue.popleft()
-            result.append(vertex)
+            yield labels[vertex]
 
-            for neighbor in self.graph.get(vertex, []):
+            for e in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[e]
                 if not visited[neighbor]:
                     visited[neighbor] = True
                     queue.append(neighbor)
-        return result
+
+    def bfs_distances(self, sources, direction_optimizing=True, n_jobs=1):
+        """
+        Performs a level-synchronous, multi-source Breadth-First Search and returns
+        the number of edges on a shortest path from the nearest source to every vertex.
+
+        Each level is expanded top-down (scanning the out-edges of the frontier) or,
+        with direction_optimizing, bottom-up (scanning the in-edges of the unvisited
+        vertices for a frontier parent) when the frontier is large. With NumPy the
+        levels are vectorised and can be split over threads.
+
+        Args:
+            sources (iterable): The start vertices, all at distance 0.
+            direction_optimizing (bool): Switch to bottom-up steps for large frontiers.
+                                         The transposed graph is built once and kept.
+            n_jobs (int): The number of threads expanding a level. None or a negative
+                          value uses every CPU. Only used with NumPy.
+
+        Returns:
+            array: The distance of every vertex, in the order of self.vertices,
+                   or -1 if it is unreachable.
+        """
+        ids = []
+        for vertex in sources:
+            if vertex not in self.csr.index:
+                raise ValueError("Start vertex not in graph.")
+            ids.append(self.csr.index[vertex])
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        if np is None:
+            return self._bfs_distances_python(ids, direction_optimizing)
+        return self._bfs_distances_numpy(ids, direction_optimizing, n_jobs)
+
+    def _reverse(self):
+        """
+        Returns the in-edge offsets and sources, computed once.
+        """
+        if getattr(self, '_in_edges', None) is None:
+            if np is None:
+                transposed = self.csr.transpose()
+                self._in_edges = transposed.offsets, transposed.targets
+            else:
+                offsets, targets, _ = self.csr.to_numpy()
+                n = self.csr.num_vertices
+                in_offsets = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum(np.bincount(targets, minlength=n), out=in_offsets[1:])
+                edge_sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+                self._in_edges = in_offsets, edge_sources[np.argsort(targets, kind='stable')]
+        return self._in_edges
+
+    def _bfs_distances_python(self, sources, direction_optimizing):
+        """
+        bfs_distances over the CSR arrays with a visited bytemap.
+        """
+        n = self.csr.num_vertices
+        offsets, targets = self.csr.offsets, self.csr.targets
+        if direction_optimizing:
+            in_offsets, in_sources = self._reverse()
+        distances = array('q', [-1]) * n
+        visited = bytearray(n)
+        frontier = []
+        for u in sources:
+            if not visited[u]:
+                visited[u] = 1
+                distances[u] = 0
+                frontier.append(u)
+        unexplored = self.csr.num_edges  # Out-edges of unvisited vertices
+        unexplored -= sum(offsets[u + 1] - offsets[u] for u in frontier)
+        level = 0
+        bottom_up = False
+        while frontier:
+            level += 1
+            if direction_optimizing:
+                frontier_edges = sum(offsets[u + 1] - offsets[u] for u in frontier)
+                if not bottom_up and frontier_edges > unexplored / _ALPHA:
+                    bottom_up = True
+                elif bottom_up and len(frontier) < n / _BETA:
+                    bottom_up = False
+            next_frontier = []
+            if bottom_up:
+                in_frontier = bytearray(n)
+                for u in frontier:
+                    in_frontier[u] = 1
+                for v in range(n):
+                    if not visited[v]:
+                        for e in range(in_offsets[v], in_offsets[v + 1]):
+                            if in_frontier[in_sources[e]]:
+                                next_frontier.append(v)
+                                break
+                for v in next_frontier:
+                    visited[v] = 1
+            else:
+                for u in frontier:
+                    for e in range(offsets[u], offsets[u + 1]):
+                        v = targets[e]
+                        if not visited[v]:
+                            visited[v] = 1
+                            next_frontier.append(v)
+            for v in next_frontier:
+                distances[v] = level
+                unexplored -= offsets[v + 1] - offsets[v]
+            frontier = next_frontier
+        return distances
+
+    def _bfs_distances_numpy(self, sources, direction_optimizing, n_jobs):
+        """
+        bfs_distances with every level vectorised over chunks of edges.
+        """
+        n = self.csr.num_vertices
+        offsets, targets, _ = self.csr.to_numpy()
+        degree = np.diff(offsets)
+        if direction_optimizing:
+            in_offsets, in_sources = self._reverse()
+            in_degree = np.diff(in_offsets)
+        distances = np.full(n, -1, dtype=np.int64)
+        frontier = np.unique(np.array(sources, dtype=np.int64))
+        distances[frontier] = 0
+        unexplored = len(targets) - int(degree[frontier].sum())
+        executor = ThreadPoolExecutor(n_jobs) if n_jobs > 1 else None
+        try:
+            level = 0
+            bottom_up = False
+            while len(frontier):
+                level += 1
+                if direction_optimizing:
+                    frontier_edges = int(degree[frontier].sum())
+                    if not bottom_up and frontier_edges > unexplored / _ALPHA:
+                        bottom_up = True
+                    elif bottom_up and len(frontier) < n / _BETA:
+                        bottom_up = False
+                if bottom_up:
+                    in_frontier = np.zeros(n, dtype=bool)
+                    in_frontier[frontier] = True
+                    unvisited = np.flatnonzero(distances < 0)
+
+                    def step(chunk):
+                        edges, owner = _gather(in_offsets, chunk)
+                        found = np.zeros(len(chunk), dtype=bool)
+                        found[owner[in_frontier[in_sources[edges]]]] = True
+                        return chunk[found]
+                    chunks = _chunks(unvisited, in_degree[unvisited])
+                else:
+                    def step(chunk):
+                        neighbors = targets[_gather(offsets, chunk)[0]]
+                        return neighbors[distances[neighbors] < 0]
+                    chunks = _chunks(frontier, degree[frontier])
+                found = list(executor.map(step, chunks)) if executor else [step(c) for c in chunks]
+                frontier = np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+                distances[frontier] = level
+                unexplored -= int(degree[frontier].sum())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return array('q', distances.tobytes())
 
     def dfs(self, start_vertex):
         """
@@ -54,21 +240,142 @@ class GraphTraversal:
         Returns:
             list: A list of vertices in DFS order.
         """
-        if start_vertex not in self.vertices:
-            raise ValueError("Start vertex not in graph.")
+        return list(self.iter_dfs(start_vertex))
+
+    def iter_dfs(self, start_vertex):
+        """
+        Performs a Depth-First Search traversal lazily, with an explicit stack
+        instead of recursion. Vertices come in the same pre-order as dfs.
 
-        visited = {v: False for v in self.vertices}
-        result = []
-        self._dfs_recursive(start_vertex, visited, result)
-        return result
+        Args:
+            start_vertex: The vertex to start the traversal from.
 
-    def _dfs_recursive(self, vertex, visited, result):
+        Returns:
+            iterator: The vertices in DFS order.
         """
-        A recursive helper for DFS.
+        return self._iter_dfs(self._start(start_vertex))
+
+    def _iter_dfs(self, source):
+        offsets, targets, labels = self.csr.offsets, self.csr.targets, self.csr.labels
+        visited = bytearray(self.csr.num_vertices)
+        visited[source] = True
+        yield labels[source]
+        stack = [source]
+        pointer = [offsets[source]]  # Next edge to scan for every vertex on the stack
+
+        while stack:
+            vertex = stack[-1]
+            e = pointer[-1]
+            end = offsets[vertex + 1]
+            while e < end and visited[targets[e]]:
+                e += 1
+            if e == end:
+                stack.pop()
+                pointer.pop()
+                continue
+            pointer[-1] = e + 1
+            neighbor = targets[e]
+            visited[neighbor] = True
+            yield labels[neighbor]
+            stack.append(neighbor)
+            pointer.append(offsets[neighbor])
+
+    def iter_edges(self, start_vertex, order='dfs'):
+        """
+        Walks the graph from start_vertex and reports every step as an event, lazily.
+
+        Events are (event, u, v, depth) tuples:
+            - ('discover', u, v, depth): v is reached for the first time along the
+              edge u -> v, at the given depth in the traversal tree. The start vertex
+              is discovered first, with u None and depth 0.
+            - ('nontree', u, v, depth): the edge u -> v leads to an already discovered
+              vertex; depth is that of u.
+            - ('finish', u, v, depth): all out-edges of v, at the given depth and
+              discovered from u, have been examined.
+
+        Args:
+            start_vertex: The vertex to start the traversal from.
+            order (str): 'dfs' or 'bfs'.
+
+        Returns:
+            iterator: The events.
         """
-        visited[vertex] = True
-        result.append(vertex)
+        if order not in ('dfs', 'bfs'):
+            raise ValueError("order must be 'dfs' or 'bfs'.")
+        source = self._start(start_vertex)
+        if order == 'bfs':
+            return self._iter_bfs_edges(source)
+        return self._iter_dfs_edges(source)
+
+    def _iter_dfs_edges(self, source):
+        offsets, targets, labels = self.csr.offsets, self.csr.targets, self.csr.labels
+        visited = bytearray(self.csr.num_vertices)
+        visited[source] = True
+        yield ('discover', None, labels[source], 0)
+        stack = [source]
+        pointer = [offsets[source]]
+
+        while stack:
+            vertex = stack[-1]
+            e = pointer[-1]
+            depth = len(stack) - 1
+            if e == offsets[vertex + 1]:
+                stack.pop()
+                pointer.pop()
+                yield ('finish', labels[stack[-1]] if stack else None, labels[vertex], depth)
+                continue
+            pointer[-1] = e + 1
+            neighbor = targets[e]
+            if visited[neighbor]:
+                yield ('nontree', labels[vertex], labels[neighbor], depth)
+            else:
+                visited[neighbor] = True
+                yield ('discover', labels[vertex], labels[neighbor], depth + 1)
+                stack.append(neighbor)
+                pointer.append(offsets[neighbor])
+
+    def _iter_bfs_edges(self, source):
+        offsets, targets, labels = self.csr.offsets, self.csr.targets, self.csr.labels
+        visited = bytearray(self.csr.num_vertices)
+        visited[source] = True
+        yield ('discover', None, labels[source], 0)
+        queue = deque([(source, None, 0)])  # Vertex, the label it was discovered from, depth
 
-        for neighbor in self.graph.get(vertex, []):
-            if not visited[neighbor]:
-                self._dfs_recursive(neighbor, visited, result)
+        while queue:
+            vertex, parent, depth = queue.popleft()
+            for e in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[e]
+                if visited[neighbor]:
+                    yield ('nontree', labels[vertex], labels[neighbor], depth)
+                else:
+                    visited[neighbor] = True
+                    yield ('discover', labels[vertex], labels[neighbor], depth + 1)
+                    queue.append((neighbor, labels[vertex], depth + 1))
+            yield ('finish', parent, labels[vertex], depth)
+
+    def _start(self, start_vertex):
+        if start_vertex not in self.csr.index:
+            raise ValueError("Start vertex not in graph.")
+        return self.csr.index[start_vertex]
+
+def _chunks(vertices, degrees):
+    """
+    Splits vertex ids into consecutive chunks of about _CHUNK_EDGES edges.
+    """
+    if len(vertices) == 0:
+        return []
+    ends = np.cumsum(degrees)
+    bounds = np.searchsorted(ends, np.arange(_CHUNK_EDGES, int(ends[-1]), _CHUNK_EDGES), side='right')
+    return np.split(vertices, np.unique(bounds))
+
+
+def _gather(offsets, vertices):
+    """
+    Returns the edge indices of the given vertices, and the position in vertices
+    that every edge belongs to.
+    """
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    owner = np.repeat(np.arange(len(vertices)), counts)
+    first = np.cumsum(counts) - counts
+    return np.arange(len(owner)) + (starts - first)[owner], owner
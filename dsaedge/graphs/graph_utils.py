@@ -1,3 +1,7 @@
+from collections import deque
+
+from .csr_graph import CSRGraph, as_csr
+
 class GraphUtils:
     """
     Provides utility functions for graph manipulation and analysis.
@@ -7,28 +11,26 @@ class GraphUtils:
         Initializes the GraphUtils object.
 
         Args:
-            graph (dict): An adjacency list representation of the graph.
+            graph (dict or CSRGraph): An adjacency list representation of the graph,
+                          or a prebuilt CSRGraph.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
     def get_transpose(self):
         """
         Computes the transpose of a directed graph.
 
         Returns:
-            dict: The adjacency list of the transposed graph.
-        """
-        transposed_graph = {v: [] for v in self.vertices}
-        for u, edges in self.graph.items():
-            for v in edges:
-                # This handles both weighted and unweighted graphs
-                if isinstance(v, tuple):
-                    neighbor, weight = v
-                    transposed_graph[neighbor].append((u, weight))
-                else:
-                    transposed_graph[v].append(u)
-        return transposed_graph
+            dict or CSRGraph: The adjacency list of the transposed graph, or a CSRGraph
+                              if the graph was given as one.
+        """
+        transposed_graph = self.csr.transpose()
+        if isinstance(self.graph, CSRGraph):
+            return transposed_graph
+        # This handles both weighted and unweighted graphs
+        return transposed_graph.to_adjacency_list()
 
     def is_bipartite(self):
         """
@@ -38,16 +40,17 @@ class GraphUtils:
         Returns:
             bool: True if the graph is bipartite, False otherwise.
         """
-        color = {}
-        for v_start in self.vertices:
-            if v_start not in color:
-                color[v_start] = 1  # 1 for one color, -1 for the other
-                queue = [v_start]
+        offsets, targets = self.csr.offsets, self.csr.targets
+        color = [0] * self.csr.num_vertices  # 0 for uncolored, 1 and -1 for the two colors
+        for v_start in range(self.csr.num_vertices):
+            if not color[v_start]:
+                color[v_start] = 1
+                queue = deque([v_start])
                 while queue:
-                    u = queue.pop(0)
-                    for v_info in self.graph.get(u, []):
-                        v = v_info[0] if isinstance(v_info, tuple) else v_info
-                        if v not in color:
+                    u = queue.popleft()
+                    for e in range(offsets[u], offsets[u + 1]):
+                        v = targets[e]
+                        if not color[v]:
                             color[v] = -color[u]
                             queue.append(v)
                         elif color[v] == color[u]:
@@ -59,4 +62,7 @@ class GraphUtils:
         Calculates the degree of a vertex in an undirected graph.
         For a directed graph, this returns the out-degree.
         """
-        return len(self.graph.get(vertex, []))
+        vertex_id = self.csr.index.get(vertex)
+        if vertex_id is None:
+            return 0
+        return self.csr.out_degree(vertex_id)
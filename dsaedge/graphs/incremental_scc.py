@@ -0,0 +1,228 @@
+from collections import deque
+
+from .csr_graph import as_csr
+from .tarjan import Tarjan
+
+class IncrementalSCC:
+    """
+    Maintains the Strongly Connected Components (SCCs) of a directed graph under
+    edge and vertex insertions.
+
+    Components are kept in a union-find structure together with a topological
+    order of the condensation DAG. An edge that agrees with the order is simply
+    recorded. An edge cu -> cv against the order triggers the Pearce-Kelly
+    update, which touches only the components ordered between cv and cu:
+    a forward search from cv and a backward search from cu, both bounded by
+    that range, find every component on a new cycle. Those components are merged,
+    and the affected components are reordered within the positions they held.
+    """
+    def __init__(self, graph=None):
+        """
+        Initializes the structure, optionally from an existing graph.
+
+        Args:
+            graph (dict or CSRGraph, optional): A dictionary representing the graph's
+                          adjacency list, or a prebuilt CSRGraph.
+        """
+        self.vertices = []    # Vertex id -> label
+        self.index = {}       # Label -> vertex id
+        self._parent = []     # Union-find over vertex ids; roots represent components
+        self._members = {}    # Component -> member vertex ids
+        self._out = {}        # Component -> successor components (possibly stale ids)
+        self._in = {}         # Component -> predecessor components (possibly stale ids)
+        self._order = {}      # Component -> position in topological order
+        self._next_position = 0
+        if graph is not None:
+            self._build(as_csr(graph))
+
+    def _build(self, csr):
+        """
+        Computes the initial components with Tarjan's algorithm and orders the
+        condensation with Kahn's algorithm. Unrelated components keep the order
+        of their vertices, so edges added in that order rarely need a reorder.
+        """
+        self.vertices = list(csr.labels)
+        self.index = dict(csr.index)
+        self._parent = list(range(csr.num_vertices))
+        for scc in Tarjan(csr).find_sccs():
+            ids = sorted(csr.index[label] for label in scc)
+            root = ids[0]
+            for v in ids:
+                self._parent[v] = root
+            self._members[root] = ids
+            self._out[root] = set()
+            self._in[root] = set()
+
+        offsets, targets = csr.offsets, csr.targets
+        for u in range(csr.num_vertices):
+            cu = self._parent[u]
+            for e in range(offsets[u], offsets[u + 1]):
+                cv = self._parent[targets[e]]
+                if cu != cv:
+                    self._out[cu].add(cv)
+                    self._in[cv].add(cu)
+
+        pending = {c: len(self._in[c]) for c in self._members}
+        queue = deque(c for c in sorted(self._members) if not pending[c])
+        while queue:
+            c = queue.popleft()
+            self._order[c] = self._next_position
+            self._next_position += 1
+            for w in self._out[c]:
+                pending[w] -= 1
+                if not pending[w]:
+                    queue.append(w)
+
+    @property
+    def num_components(self):
+        """
+        The number of strongly connected components.
+        """
+        return len(self._members)
+
+    def add_vertex(self, vertex):
+        """
+        Adds an isolated vertex, which forms its own component. Known vertices are ignored.
+
+        Args:
+            vertex: The vertex label.
+        """
+        if vertex in self.index:
+            return
+        v = len(self.vertices)
+        self.vertices.append(vertex)
+        self.index[vertex] = v
+        self._parent.append(v)
+        self._members[v] = [v]
+        self._out[v] = set()
+        self._in[v] = set()
+        self._order[v] = self._next_position
+        self._next_position += 1
+
+    def add_edge(self, u, v):
+        """
+        Adds the edge u -> v, adding unknown vertices first.
+
+        Args:
+            u: The source vertex.
+            v: The target vertex.
+
+        Returns:
+            bool: True if the edge merged components, False otherwise.
+        """
+        self.add_vertex(u)
+        self.add_vertex(v)
+        cu = self._find(self.index[u])
+        cv = self._find(self.index[v])
+        if cu == cv:
+            return False
+        order = self._order
+        lower, upper = order[cv], order[cu]
+        if lower > upper:  # cu already precedes cv
+            self._out[cu].add(cv)
+            self._in[cv].add(cu)
+            return False
+
+        forward = self._search(cv, self._out, lambda c: order[c] <= upper)
+        backward = self._search(cu, self._in, lambda c: order[c] >= lower)
+        cycle = forward & backward if cu in forward else set()
+        # The backward set takes the lowest of the freed positions and the forward
+        # set the highest, so neither passes a component outside the region
+        positions = sorted(order[c] for c in forward | backward)
+        before = sorted(backward - cycle, key=order.__getitem__)
+        after = sorted(forward - cycle, key=order.__getitem__)
+        for c, position in zip(before, positions):
+            order[c] = position
+        for c, position in zip(after, positions[len(positions) - len(after):]):
+            order[c] = position
+        if cycle:
+            order[self._merge(cycle)] = positions[len(before)]
+        else:
+            self._out[cu].add(cv)
+            self._in[cv].add(cu)
+        return bool(cycle)
+
+    def add_edges(self, edges):
+        """
+        Adds several edges.
+
+        Args:
+            edges (iterable): (u, v) pairs.
+
+        Returns:
+            bool: True if any edge merged components, False otherwise.
+        """
+        merged = False
+        for u, v in edges:
+            merged = self.add_edge(u, v) or merged
+        return merged
+
+    def same_component(self, u, v):
+        """
+        Checks whether u and v are strongly connected.
+        """
+        return self._find(self._id(u)) == self._find(self._id(v))
+
+    def component(self, vertex):
+        """
+        Returns the vertices of the SCC containing vertex.
+        """
+        return [self.vertices[v] for v in self._members[self._find(self._id(vertex))]]
+
+    def sccs(self):
+        """
+        Returns all SCCs in topological order of the condensation.
+
+        Returns:
+            list: A list of lists, where each inner list is an SCC.
+        """
+        components = sorted(self._members, key=self._order.__getitem__)
+        return [[self.vertices[v] for v in self._members[c]] for c in components]
+
+    def _id(self, vertex):
+        if vertex not in self.index:
+            raise ValueError("Vertex not in graph.")
+        return self.index[vertex]
+
+    def _find(self, v):
+        """
+        Returns the component of vertex id v, halving the path on the way.
+        """
+        parent = self._parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    def _search(self, start, adjacency, allowed):
+        """
+        Returns the components reachable from start along adjacency, without
+        leaving the allowed range of the order.
+        """
+        seen = {start}
+        stack = [start]
+        while stack:
+            c = stack.pop()
+            for w in adjacency[c]:
+                w = self._find(w)
+                if w not in seen and allowed(w):
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    def _merge(self, components):
+        """
+        Merges components into the largest of them and returns it.
+        """
+        root = max(components, key=lambda c: len(self._members[c]))
+        out_edges, in_edges = set(), set()
+        for c in components:
+            out_edges.update(self._out.pop(c))
+            in_edges.update(self._in.pop(c))
+            if c != root:
+                self._parent[c] = root
+                self._members[root].extend(self._members.pop(c))
+                del self._order[c]
+        self._out[root] = {w for w in map(self._find, out_edges) if w != root}
+        self._in[root] = {w for w in map(self._find, in_edges) if w != root}
+        return root
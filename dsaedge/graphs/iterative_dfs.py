@@ -0,0 +1,110 @@
+from array import array
+
+from .csr_graph import as_csr
+
+class IterativeDFS:
+    """
+    An explicit-stack Depth-First Search driver over a CSRGraph.
+
+    The driver visits vertices in exactly the order of the classic recursive DFS,
+    but keeps a per-vertex edge cursor instead of Python frames, so it never hits
+    the recursion limit. It maintains discovery times, low-link values, DFS-tree
+    parents and vertex states, and reports progress through callbacks:
+
+        enter(u)     u has just been discovered (disc[u] and parent[u] are set).
+        edge(u, v)   u -> v leads to an already discovered vertex v.
+        exit(u, p)   u is finished; p is its DFS-tree parent (-1 for a root).
+                     low[p] has already absorbed low[u].
+
+    A callback that returns True stops the search immediately.
+    """
+    WHITE, GRAY, BLACK = 0, 1, 2
+
+    def __init__(self, graph, undirected=False):
+        """
+        Initializes the driver.
+
+        Args:
+            graph (dict or CSRGraph): The graph to search.
+            undirected (bool): If True, the edge back to the DFS-tree parent is skipped
+                               and every edge to a discovered vertex lowers the low-link,
+                               as needed for bridges, articulation points and BCCs.
+                               If False, low-link updates along non-tree edges are left
+                               to the edge callback (e.g. Tarjan's on-stack rule).
+        """
+        self.csr = as_csr(graph)
+        self.undirected = undirected
+        num_vertices = self.csr.num_vertices
+        self.disc = array('q', [-1]) * num_vertices    # Discovery times
+        self.low = array('q', [-1]) * num_vertices     # Low-link values
+        self.parent = array('q', [-1]) * num_vertices  # DFS-tree parents
+        self.state = bytearray(num_vertices)           # WHITE, GRAY (on the DFS path) or BLACK
+        self.time = 0
+        self._next_edge = array('q', [0]) * num_vertices
+
+    def run(self, root, enter=None, edge=None, exit=None):
+        """
+        Runs a DFS from root over the not yet discovered part of the graph.
+
+        Args:
+            root (int): The vertex id to start from. Must not be discovered yet.
+            enter, edge, exit (callable, optional): The callbacks described on the class.
+
+        Returns:
+            bool: True if a callback stopped the search, False otherwise.
+        """
+        offsets, targets = self.csr.offsets, self.csr.targets
+        disc, low, parent, state = self.disc, self.low, self.parent, self.state
+        next_edge = self._next_edge
+        undirected = self.undirected
+
+        disc[root] = low[root] = self.time
+        self.time += 1
+        state[root] = self.GRAY
+        next_edge[root] = offsets[root]
+        if enter is not None and enter(root):
+            return True
+        stack = [root]
+
+        while stack:
+            u = stack[-1]
+            e, end = next_edge[u], offsets[u + 1]
+            descended = False
+
+            while e < end:
+                v = targets[e]
+                e += 1
+                if disc[v] == -1:  # Tree edge: descend into v
+                    next_edge[u] = e
+                    parent[v] = u
+                    disc[v] = low[v] = self.time
+                    self.time += 1
+                    state[v] = self.GRAY
+                    next_edge[v] = offsets[v]
+                    stack.append(v)
+                    if enter is not None and enter(v):
+                        return True
+                    descended = True
+                    break
+
+                if undirected:
+                    if v == parent[u]:
+                        continue
+                    if disc[v] < low[u]:
+                        low[u] = disc[v]
+                if edge is not None and edge(u, v):
+                    return True
+
+            if descended:
+                continue
+
+            # All edges of u are explored: finish u and report to its parent
+            stack.pop()
+            state[u] = self.BLACK
+            p = parent[u]
+            if p != -1 and low[u] < low[p]:
+                low[p] = low[u]
+            if exit is not None and exit(u, p):
+                return True
+
+        return False
@@ -1,4 +1,10 @@
-from .bellman_ford import bellman_ford
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .bellman_ford import _bellman_ford_csr
+from .csr_graph import CSRGraph, as_csr
 from .dijkstra import Dijkstra
 
 class Johnson:
@@ -12,60 +18,134 @@ class Johnson:
         Initializes the Johnson object with a graph.
 
         Args:
-            graph (dict): A dictionary representing the graph's adjacency list.
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
                           Example: {'A': [('B', -2)], 'B': [('C', -1)], ...}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
-    def find_all_pairs_shortest_paths(self):
+    def find_all_pairs_shortest_paths(self, n_jobs=1):
         """
         Calculates all-pairs shortest paths using Johnson's algorithm.
 
+        Args:
+            n_jobs (int): The number of worker processes for the Dijkstra runs,
+                          as for iter_shortest_paths.
+
         Returns:
             dict: A dictionary of dictionaries representing the shortest paths
                   between all pairs of vertices. Example: {'A': {'B': -2, 'C': -3}, ...}
         """
-        # 1. Add a new vertex 's' with zero-weight edges to all other vertices.
-        temp_graph = self.graph.copy()
-        temp_graph['s'] = [(v, 0) for v in self.vertices]
+        return dict(self.iter_shortest_paths(n_jobs=n_jobs))
+
+    def iter_shortest_paths(self, n_jobs=1, chunk_size=None):
+        """
+        Lazily yields the shortest paths from each vertex in turn, so the full
+        V x V result never has to be held in memory at once.
+
+        With n_jobs > 1 the reweighted graph is published once in shared memory
+        and the per-source Dijkstra runs are spread over a process pool. Only a
+        bounded number of chunks is in flight at any time, so a slow consumer
+        does not make finished results pile up.
+
+        Args:
+            n_jobs (int): The number of worker processes. 0 or 1 runs in this process;
+                          None or a negative value uses every CPU.
+            chunk_size (int, optional): The number of sources per task sent to a worker.
+
+        Yields:
+            tuple: (source, distances), in vertex order, where distances maps every
+                   vertex reachable from source to its shortest distance.
+
+        Raises:
+            ValueError: If the graph contains a negative cycle (on the first next()).
+        """
+        labels = self.vertices
+        reweighted, h = self._reweight()
+        num_vertices = reweighted.num_vertices
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+
+        if n_jobs <= 1 or num_vertices < 2:
+            dijkstra_solver = Dijkstra(reweighted)
+            for source in range(num_vertices):
+                yield labels[source], {labels[v]: d for v, d in _shortest_paths_from(dijkstra_solver, h, source)}
+            return
 
-        # 2. Run Bellman-Ford from 's' to find re-weighting values (h).
-        # We need a graph representation suitable for the bellman_ford function.
-        num_vertices = len(self.vertices) + 1
-        vertex_map = {name: i for i, name in enumerate(self.vertices + ['s'])}
-        reverse_map = {i: name for name, i in vertex_map.items()}
+        if chunk_size is None:
+            chunk_size = max(1, min(64, num_vertices // (4 * n_jobs)))
+        chunks = (range(start, min(start + chunk_size, num_vertices)) for start in range(0, num_vertices, chunk_size))
 
-        bf_graph = type('Graph', (), {'V': num_vertices, 'graph': []})()
-        for u, edges in temp_graph.items():
-            for v, w in edges:
-                bf_graph.graph.append([vertex_map[u], vertex_map[v], w])
+        block, descriptor = reweighted.to_shared_memory()
+        try:
+            with ProcessPoolExecutor(n_jobs, initializer=_init_worker, initargs=(descriptor, h)) as executor:
+                pending = deque(executor.submit(_run_sources, chunk) for chunk in islice(chunks, 2 * n_jobs))
+                while pending:
+                    results = pending.popleft().result()
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(executor.submit(_run_sources, chunk))
+                    for source, paths in results:
+                        yield labels[source], {labels[v]: d for v, d in paths}
+        finally:
+            block.close()
+            block.unlink()
 
-        h, _, negative_cycle = bellman_ford(bf_graph, vertex_map['s'])
+    def _reweight(self):
+        """
+        Runs Bellman-Ford (SPFA) from a virtual vertex and reweights every edge to be non-negative.
+
+        Returns:
+            tuple: The reweighted CSRGraph and the potential h of every vertex id.
+        """
+        csr = self.csr
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        num_vertices = csr.num_vertices
 
-        if negative_cycle:
+        # 1-2. Run Bellman-Ford from a virtual source 's' with zero-weight edges to all
+        # vertices to find re-weighting values (h). Starting every vertex at distance 0
+        # is equivalent, so 's' is never materialised.
+        h, _, negative_cycle = _bellman_ford_csr(csr, range(num_vertices), spfa=True)
+
+        if negative_cycle is not None:
             raise ValueError("Graph contains a negative cycle.")
 
-        # 3. Re-weight the original graph.
-        reweighted_graph = {u: [] for u in self.vertices}
-        for u, edges in self.graph.items():
-            for v, w in edges:
-                h_u = h[vertex_map[u]]
-                h_v = h[vertex_map[v]]
-                reweighted_graph[u].append((v, w + h_u - h_v))
-
-        # 4. Run Dijkstra from each vertex on the re-weighted graph.
-        all_shortest_paths = {}
-        dijkstra_solver = Dijkstra(reweighted_graph)
-        for u in self.vertices:
-            distances, _ = dijkstra_solver.find_shortest_paths(u)
-            # 5. Adjust the distances back.
-            adjusted_distances = {}
-            for v, dist in distances.items():
-                if dist != float('infinity'):
-                    h_u = h[vertex_map[u]]
-                    h_v = h[vertex_map[v]]
-                    adjusted_distances[v] = dist - h_u + h_v
-            all_shortest_paths[u] = adjusted_distances
-
-        return all_shortest_paths
+        # 3. Re-weight the original graph, sharing its offsets and targets layout.
+        reweighted = [
+            weights[e] + h[u] - h[targets[e]]
+            for u in range(num_vertices)
+            for e in range(offsets[u], offsets[u + 1])
+        ]
+        return CSRGraph(offsets, targets, reweighted, csr.labels), h
+
+
+def _shortest_paths_from(dijkstra_solver, h, source):
+    """
+    Runs Dijkstra from one vertex id on the re-weighted graph and adjusts the
+    distances back. Returns (vertex id, distance) pairs in vertex order.
+    """
+    settled, _ = dijkstra_solver._search([source])
+    h_source = h[source]
+    return [(v, settled[v] - h_source + h[v]) for v in sorted(settled)]
+
+
+_worker_state = None  # (Dijkstra over the shared graph, its block, h), set per worker process
+
+
+def _init_worker(descriptor, h):
+    """
+    Attaches a worker process to the shared reweighted graph.
+    """
+    global _worker_state
+    graph, block = CSRGraph.from_shared_memory(descriptor)
+    _worker_state = (Dijkstra(graph), block, h)
+
+
+def _run_sources(sources):
+    """
+    Computes the adjusted shortest paths from a chunk of vertex ids in a worker process.
+    """
+    dijkstra_solver, _, h = _worker_state
+    return [(source, _shortest_paths_from(dijkstra_solver, h, source)) for source in sources]
@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class Kosaraju:
     """
     Implementation of Kosaraju's algorithm for finding Strongly Connected Components (SCCs)
@@ -8,11 +11,13 @@ class Kosaraju:
         Initializes the Kosaraju object with a graph.
 
         Args:
-            graph (dict): A dictionary representing the graph's adjacency list.
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1], 1: [2], 2: [0, 3], 3: [4], 4: [5], 5: [3]}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
         self.sccs = []
 
@@ -24,53 +29,39 @@ class Kosaraju:
             list: A list of lists, where each inner list is an SCC.
                   Example: [[0, 1, 2], [3, 4, 5]]
         """
+        self.sccs = []
         # 1. First DFS to get the finishing times (post-order traversal)
-        stack = []
-        visited = {v: False for v in self.vertices}
-        for v in self.vertices:
-            if not visited[v]:
-                self._dfs1(v, visited, stack)
+        stack = self._dfs1()
 
         # 2. Get the transpose of the graph
         transposed_graph = self._get_transpose()
 
         # 3. Second DFS on the transposed graph in the order of finishing times
-        visited = {v: False for v in self.vertices}
+        dfs = IterativeDFS(transposed_graph)
+        labels = self.csr.labels
         while stack:
             v = stack.pop()
-            if not visited[v]:
+            if dfs.disc[v] == -1:
                 scc = []
-                self._dfs2(v, visited, scc, transposed_graph)
+                dfs.run(v, enter=lambda u: scc.append(labels[u]))
                 self.sccs.append(scc)
 
         return self.sccs
 
-    def _dfs1(self, u, visited, stack):
+    def _dfs1(self):
         """
-        First DFS to fill the stack with vertices in order of finishing times.
+        First DFS, returning a stack of vertex ids in order of finishing times.
         """
-        visited[u] = True
-        for v in self.graph.get(u, []):
-            if not visited[v]:
-                self._dfs1(v, visited, stack)
-        stack.append(u)
-
-    def _dfs2(self, u, visited, scc, transposed_graph):
-        """
-        Second DFS on the transposed graph to find SCCs.
-        """
-        visited[u] = True
-        scc.append(u)
-        for v in transposed_graph.get(u, []):
-            if not visited[v]:
-                self._dfs2(v, visited, scc, transposed_graph)
+        stack = []
+        dfs = IterativeDFS(self.csr)
+        finish = lambda u, parent: stack.append(u)
+        for v in range(self.num_vertices):
+            if dfs.disc[v] == -1:
+                dfs.run(v, exit=finish)
+        return stack
 
     def _get_transpose(self):
         """
-        Computes the transpose of the graph.
+        Computes the transpose of the graph as a CSRGraph over the same vertex ids.
         """
-        transposed_graph = {v: [] for v in self.vertices}
-        for u, edges in self.graph.items():
-            for v in edges:
-                transposed_graph[v].append(u)
-        return transposed_graph
+        return self.csr.transpose()
@@ -1,3 +1,4 @@
+from .csr_graph import CSRGraph
 
 
 class DSU:
@@ -40,21 +41,26 @@ class DSU:
             return True
         return False
 
-def kruskal_algorithm(vertices, edges):
+def kruskal_algorithm(vertices, edges=None):
     """
     Finds the Minimum Spanning Tree (MST) of a connected, undirected graph
     using Kruskal's algorithm.
 
     Args:
-        vertices (list): A list of all vertices in the graph.
+        vertices (list or CSRGraph): A list of all vertices in the graph, or a
+                      CSRGraph whose edge arrays supply both vertices and edges.
         edges (list): A list of tuples, where each tuple is (weight, u, v)
                       representing an edge between u and v with the given weight.
+                      Not needed when vertices is a CSRGraph.
 
     Returns:
         tuple: A tuple containing:
             - mst_cost (int/float): The total cost of the MST.
             - mst_edges (list): A list of edges (u, v, weight) in the MST.
     """
+    if isinstance(vertices, CSRGraph):
+        return _kruskal_csr(vertices)
+
     # 1. Sort all edges in non-decreasing order of their weight
     sorted_edges = sorted(edges)
 
@@ -83,4 +89,30 @@ def kruskal_algorithm(vertices, edges):
     return mst_cost, mst_edges
 
 
+def _kruskal_csr(csr):
+    """
+    Kruskal's algorithm over the edge arrays of a CSRGraph. Edges are sorted
+    by weight over vertex ids, and only the chosen edges are mapped back to labels.
+    """
+    offsets, targets, weights, labels = csr.offsets, csr.targets, csr.weights, csr.labels
+    num_vertices = csr.num_vertices
+    edge_order = sorted(range(csr.num_edges), key=weights.__getitem__)
+    sources = [0] * csr.num_edges
+    for u in range(num_vertices):
+        for e in range(offsets[u], offsets[u + 1]):
+            sources[e] = u
+
+    dsu = DSU(range(num_vertices))
+    mst_cost = 0
+    mst_edges = []
+    for e in edge_order:
+        if dsu.union(sources[e], targets[e]):
+            mst_cost += weights[e]
+            mst_edges.append((labels[sources[e]], labels[targets[e]], weights[e]))
+            if len(mst_edges) == num_vertices - 1:
+                break
+
+    if len(mst_edges) != num_vertices - 1 and num_vertices > 1:
+        print("Warning: Graph is not connected. MST might not include all vertices.")
 
+    return mst_cost, mst_edges
@@ -1,10 +1,24 @@
+from array import array
 from collections import deque
 
+from .csr_graph import CSRGraph
+
 class NetworkFlow:
     """
-    Implements the Edmonds-Karp algorithm to find the maximum flow in a flow network.
-    This is a specific implementation of the Ford-Fulkerson method that uses BFS
-    to find augmenting paths in the residual graph.
+    Maximum flow and minimum cut in a flow network.
+
+    The residual network is stored in flat arrays: every capacity edge u -> v
+    becomes an arc and a paired reverse arc, and the arcs of each vertex are
+    contiguous, as in a CSRGraph. Three max-flow engines run on it:
+
+        edmonds_karp    Shortest augmenting paths found by BFS, O(VE^2).
+        dinic           Blocking flows on BFS level graphs with current-arc
+                        pointers, O(V^2 E).
+        push_relabel    Highest-label preflow push-relabel with the gap
+                        heuristic, O(V^2 sqrt(E)).
+
+    Each engine augments the flow already in the residual network, so calls
+    can be mixed and repeated.
     """
     def __init__(self, graph):
         """
@@ -15,11 +29,102 @@ class NetworkFlow:
                           The keys are vertices, and the values are dictionaries
                           representing the capacities to neighboring vertices.
                           Example: {'s': {'a': 10, 'b': 5}, 'a': {'c': 10}, ...}
+                          A CSRGraph is accepted and read as capacities by its weights.
         """
+        if isinstance(graph, CSRGraph):
+            graph = graph.to_adjacency_dict()
         self.graph = graph
         self.vertices = list(graph.keys())
-        # The residual graph is initially a copy of the capacity graph.
-        self.residual_graph = {u: self.graph[u].copy() for u in self.vertices}
+        self.labels = list(self.vertices)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        edges = []
+        for u in self.vertices:
+            for v, capacity in self.graph[u].items():
+                edges.append((self._vertex_id(u), self._vertex_id(v), capacity, 0))
+        self._layout(edges)
+        self._terminals = None  # (source id, sink id) of the flow in the network
+
+    def _vertex_id(self, label):
+        """
+        Returns the id of a vertex, adding vertices that only appear as neighbours.
+        """
+        i = self.index.get(label)
+        if i is None:
+            i = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return i
+
+    def _layout(self, edges):
+        """
+        Lays out the arc arrays from (u id, v id, capacity, flow) edges. Arc e runs
+        from tail to head[e], rev[e] is its paired arc, and residual[e] its remaining
+        capacity; the arcs of vertex u are offsets[u]..offsets[u + 1] - 1.
+        """
+        num_vertices = len(self.labels)
+        offsets = array('q', [0]) * (num_vertices + 1)
+        for u, v, _, _ in edges:
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for i in range(num_vertices):
+            offsets[i + 1] += offsets[i]
+
+        num_arcs = 2 * len(edges)
+        position = offsets[:-1]
+        head = array('q', [0]) * num_arcs
+        rev = array('q', [0]) * num_arcs
+        residual = [0] * num_arcs
+        capacity = [0] * num_arcs
+        forward = bytearray(num_arcs)
+        self._arc = {}  # (u id, v id) -> forward arc of the capacity edge u -> v
+        for u, v, c, flow in edges:
+            e = position[u]
+            position[u] += 1
+            r = position[v]  # Taken after e, so a self-loop gets two distinct arcs
+            position[v] += 1
+            head[e], rev[e], residual[e], capacity[e] = v, r, c - flow, c
+            head[r], rev[r], residual[r] = u, e, flow
+            forward[e] = 1
+            self._arc[(u, v)] = e
+
+        self._offsets, self._head, self._rev, self._residual = offsets, head, rev, residual
+        self._capacity = capacity  # Capacity of every arc, 0 for reverse arcs
+        self._forward = forward    # 1 for the arcs of capacity edges, 0 for reverse arcs
+
+    @property
+    def residual_graph(self):
+        """
+        The residual capacities as a dict of dicts, {u: {v: residual capacity}}.
+        The residual of u -> v combines the capacity edge u -> v and the
+        reverse arc of the capacity edge v -> u.
+        """
+        labels, offsets, head, residual = self.labels, self._offsets, self._head, self._residual
+        forward = self._forward
+        residual_graph = {u: {} for u in self.vertices}
+        for u in range(len(labels)):
+            for e in range(offsets[u], offsets[u + 1]):
+                if forward[e] or residual[e] > 0:
+                    row = residual_graph.setdefault(labels[u], {})
+                    v = labels[head[e]]
+                    row[v] = row.get(v, 0) + residual[e]
+        return residual_graph
+
+    def max_flow(self, source, sink, method='dinic'):
+        """
+        Calculates the maximum flow from a source to a sink in the network.
+
+        Args:
+            source: The source vertex.
+            sink: The sink vertex.
+            method (str): 'dinic', 'push_relabel' or 'edmonds_karp'.
+
+        Returns:
+            float: The flow added on top of the flow already in the network,
+                   i.e. the maximum flow value on a fresh network.
+        """
+        engines = {'dinic': self.dinic, 'push_relabel': self.push_relabel, 'edmonds_karp': self.edmonds_karp}
+        if method not in engines:
+            raise ValueError("method must be 'dinic', 'push_relabel' or 'edmonds_karp'.")
+        return engines[method](source, sink)
 
     def edmonds_karp(self, source, sink):
         """
@@ -32,46 +137,416 @@ class NetworkFlow:
         Returns:
             float: The maximum flow value.
         """
-        max_flow = 0
-        while True:
-            # Find an augmenting path using BFS on the residual graph
-            parent, path_flow = self._bfs(source, sink)
+        s, t = self._begin(source, sink)
+        return self._push(s, t, float('infinity'))
+
+    def _push(self, a, b, limit, bridge=False):
+        """
+        Sends up to limit units of flow from vertex id a to b along shortest
+        augmenting paths. With bridge, paths may also jump between the source
+        and the sink of the current flow through virtual arcs of unbounded capacity.
 
-            if path_flow == 0:
+        Returns:
+            float: The amount sent.
+        """
+        head, rev, residual = self._head, self._rev, self._residual
+        sent = 0
+        while sent < limit:
+            # Find an augmenting path using BFS on the residual graph
+            parent_arc = self._bfs(a, b, bridge)
+            if parent_arc is None:
                 break  # No more augmenting paths
 
-            max_flow += path_flow
-            v = sink
-            while v != source:
-                u = parent[v]
+            path = []
+            v = b
+            while v != a:
+                e = parent_arc[v]
+                if e == -2:  # Virtual arc between the terminals
+                    s, t = self._terminals
+                    v = t if v == s else s
+                else:
+                    path.append(e)
+                    v = head[rev[e]]
+            path_flow = min([limit - sent] + [residual[e] for e in path])
+
+            sent += path_flow
+            for e in path:
                 # Update residual capacities
-                self.residual_graph[u][v] -= path_flow
-                # Ensure reverse edge exists for residual graph
-                if v not in self.residual_graph:
-                    self.residual_graph[v] = {}
-                if u not in self.residual_graph[v]:
-                    self.residual_graph[v][u] = 0
-                self.residual_graph[v][u] += path_flow
-                v = u
+                residual[e] -= path_flow
+                residual[rev[e]] += path_flow
 
-        return max_flow
+        return sent
 
-    def _bfs(self, source, sink):
+    def _bfs(self, a, b, bridge=False):
         """
         A BFS to find an augmenting path in the residual graph.
+        Returns the arc leading into every reached vertex (-2 for a virtual arc
+        between the terminals), or None if b is unreachable.
+        """
+        offsets, head, residual = self._offsets, self._head, self._residual
+        parent_arc = array('q', [-1]) * len(self.labels)
+        terminals = self._terminals if bridge else ()
+        queue = deque([a])
+
+        while queue:
+            u = queue.popleft()
+            for e in range(offsets[u], offsets[u + 1]):
+                v = head[e]
+                if parent_arc[v] == -1 and v != a and residual[e] > 0:
+                    parent_arc[v] = e
+                    if v == b:
+                        return parent_arc
+                    queue.append(v)
+            if u in terminals:
+                v = terminals[1] if u == terminals[0] else terminals[0]
+                if parent_arc[v] == -1 and v != a:
+                    parent_arc[v] = -2
+                    if v == b:
+                        return parent_arc
+                    queue.append(v)
+        return None
+
+    def dinic(self, source, sink):
+        """
+        Calculates the maximum flow with Dinic's algorithm.
+
+        Each phase labels vertices with their BFS distance from the source in the
+        residual network and then saturates the level graph with a blocking flow.
+        The per-vertex current-arc pointer makes every arc be skipped at most once
+        per phase.
+
+        Args:
+            source: The source vertex.
+            sink: The sink vertex.
+
+        Returns:
+            float: The maximum flow value.
+        """
+        s, t = self._begin(source, sink)
+        offsets, head, rev, residual = self._offsets, self._head, self._rev, self._residual
+        max_flow = 0
+
+        while True:
+            level = self._levels(s, t)
+            if level[t] == -1:
+                break
+            current = offsets[:-1]  # Current-arc pointers
+            path = []  # Arcs from s to u
+            u = s
+            while True:
+                if u == t:
+                    path_flow = min(residual[e] for e in path)
+                    max_flow += path_flow
+                    retreat = len(path)
+                    for i, e in enumerate(path):
+                        residual[e] -= path_flow
+                        residual[rev[e]] += path_flow
+                        if residual[e] == 0 and i < retreat:
+                            retreat = i
+                    # Resume from the tail of the first saturated arc
+                    del path[retreat:]
+                    u = head[path[-1]] if path else s
+                    continue
+
+                e, end = current[u], offsets[u + 1]
+                next_level = level[u] + 1
+                while e < end and (residual[e] <= 0 or level[head[e]] != next_level):
+                    e += 1
+                current[u] = e
+                if e < end:
+                    path.append(e)
+                    u = head[e]
+                    continue
+
+                # Dead end: drop u from the level graph and retreat
+                level[u] = -1
+                if not path:
+                    break
+                e = path.pop()
+                u = head[rev[e]]
+                current[u] += 1
+
+        return max_flow
+
+    def _levels(self, s, t):
+        """
+        BFS distances from s in the residual network, up to the level of t (-1 if unreached).
+        """
+        offsets, head, residual = self._offsets, self._head, self._residual
+        level = array('q', [-1]) * len(self.labels)
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            if u == t:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = head[e]
+                if level[v] == -1 and residual[e] > 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+    def push_relabel(self, source, sink):
         """
-        parent = {v: None for v in self.vertices}
-        queue = deque([(source, float('infinity'))])
-        path_flow = {v: 0 for v in self.vertices}
-        path_flow[source] = float('infinity')
+        Calculates the maximum flow with the highest-label push-relabel algorithm.
+
+        The source arcs are saturated into a preflow, and active vertices (with
+        excess) are discharged highest label first. When no vertex is left at
+        some height below n (a gap), every vertex above it is cut off from the
+        sink and is lifted to n at once. A second pass returns the excess that
+        could not reach the sink to the source, leaving a valid flow.
+
+        Args:
+            source: The source vertex.
+            sink: The sink vertex.
 
+        Returns:
+            float: The maximum flow value.
+        """
+        s, t = self._begin(source, sink)
+        offsets, head, rev, residual = self._offsets, self._head, self._rev, self._residual
+        n = len(self.labels)
+
+        # Exact distance-to-sink labels (global relabelling); unreachable vertices get n
+        height = [n] * n
+        height[t] = 0
+        queue = deque([t])
         while queue:
-            u, flow = queue.popleft()
-            for v, capacity in self.residual_graph.get(u, {}).items():
-                if parent[v] is None and v != source and capacity > 0:
-                    parent[v] = u
-                    new_flow = min(flow, capacity)
-                    if v == sink:
-                        return parent, new_flow
-                    queue.append((v, new_flow))
-        return parent, 0
+            v = queue.popleft()
+            for e in range(offsets[v], offsets[v + 1]):
+                u = head[e]
+                if height[u] == n and u != s and residual[rev[e]] > 0:
+                    height[u] = height[v] + 1
+                    queue.append(u)
+        height[s] = n
+
+        excess = [0] * n
+        for e in range(offsets[s], offsets[s + 1]):
+            delta = residual[e]
+            if delta > 0:
+                residual[e] -= delta
+                residual[rev[e]] += delta
+                excess[head[e]] += delta
+
+        # Phase 1 pushes as much excess as possible to the sink; phase 2 sends
+        # the rest back to the source.
+        self._discharge_all(s, t, height, excess, limit=n, gap=True)
+        self._discharge_all(s, t, height, excess, limit=2 * n, gap=False)
+        return excess[t]
+
+    def _discharge_all(self, s, t, height, excess, limit, gap):
+        """
+        Discharges active vertices below the height limit, highest label first.
+        """
+        offsets, head, rev, residual = self._offsets, self._head, self._rev, self._residual
+        n = len(self.labels)
+        buckets = [[] for _ in range(limit)]  # Active vertices by height
+        count = [0] * (2 * n + 1)             # Vertices by height, for the gap heuristic
+        for v in range(n):
+            count[height[v]] += 1
+            if excess[v] > 0 and v != s and v != t and height[v] < limit:
+                buckets[height[v]].append(v)
+        current = offsets[:-1]
+        highest = limit - 1
+
+        while highest >= 0:
+            bucket = buckets[highest]
+            if not bucket:
+                highest -= 1
+                continue
+            u = bucket.pop()
+            if height[u] != highest or excess[u] <= 0:
+                continue  # Stale entry, lifted by a gap or already discharged
+
+            while excess[u] > 0:
+                e = current[u]
+                if e == offsets[u + 1]:
+                    # Relabel: lift u just above its lowest residual neighbour
+                    old_height = height[u]
+                    new_height = 2 * n
+                    for a in range(offsets[u], offsets[u + 1]):
+                        if residual[a] > 0 and height[head[a]] + 1 < new_height:
+                            new_height = height[head[a]] + 1
+                    count[old_height] -= 1
+                    height[u] = new_height
+                    count[new_height] += 1
+                    current[u] = offsets[u]
+
+                    if gap and count[old_height] == 0 and old_height < n:
+                        # Gap: nothing above old_height can reach the sink any more
+                        for v in range(n):
+                            if old_height < height[v] < n:
+                                count[height[v]] -= 1
+                                height[v] = n
+                                count[n] += 1
+                    if height[u] >= limit:
+                        break
+                    continue
+
+                v = head[e]
+                if residual[e] > 0 and height[u] == height[v] + 1:
+                    delta = min(excess[u], residual[e])
+                    residual[e] -= delta
+                    residual[rev[e]] += delta
+                    excess[u] -= delta
+                    if excess[v] == 0 and v != s and v != t:
+                        buckets[height[v]].append(v)
+                        if height[v] > highest:  # u may have been relabelled above highest
+                            highest = height[v]
+                    excess[v] += delta
+                else:
+                    current[u] = e + 1
+
+    @property
+    def flow_value(self):
+        """
+        The value of the flow in the network: the net flow into the sink of the
+        last max-flow run, or 0 before any run.
+        """
+        if self._terminals is None:
+            return 0
+        _, t = self._terminals
+        value = 0
+        for e in range(self._offsets[t], self._offsets[t + 1]):
+            if self._forward[e]:
+                value -= self._capacity[e] - self._residual[e]  # Flow leaving the sink
+            else:
+                value += self._residual[e]  # Reverse arc: its residual is the flow in
+        return value
+
+    def reset(self):
+        """
+        Removes all flow from the network.
+        """
+        self._residual = list(self._capacity)
+        self._terminals = None
+
+    def update_capacity(self, u, v, capacity, method='dinic'):
+        """
+        Changes the capacity of the edge u -> v (adding the edge if needed) and
+        repairs the current maximum flow instead of solving from scratch.
+
+        Raising a capacity only needs new augmenting paths. Lowering it below the
+        flow on the edge leaves excess at u and a deficit at v: the excess is first
+        rerouted from u to v through the residual network, and whatever cannot be
+        rerouted is cancelled along residual paths back to the source and from the
+        sink. The flow is then re-augmented between the terminals of the last run.
+        The capacity dict passed to the constructor is not modified.
+
+        Args:
+            u: The tail of the edge.
+            v: The head of the edge.
+            capacity (float): The new capacity.
+            method (str): The max-flow engine used to re-augment, as for max_flow.
+
+        Returns:
+            float: The maximum flow value after the change (0 if no flow has been
+                   computed yet).
+        """
+        if capacity < 0:
+            raise ValueError("Capacity must be non-negative.")
+        a, b = self._vertex_id(u), self._vertex_id(v)
+        e = self._arc.get((a, b))
+        if e is None:
+            self._add_edge(a, b, capacity)
+        else:
+            flow = self._capacity[e] - self._residual[e]
+            self._capacity[e] = capacity
+            if capacity >= flow:
+                self._residual[e] = capacity - flow
+            else:
+                self._residual[e] = 0
+                self._residual[self._rev[e]] = capacity
+                if a != b:
+                    self._repair(a, b, flow - capacity)
+
+        if self._terminals is None:
+            return 0
+        s, t = self._terminals
+        self.max_flow(self.labels[s], self.labels[t], method)
+        return self.flow_value
+
+    def _add_edge(self, a, b, capacity):
+        """
+        Adds the capacity edge a -> b, re-laying the arc arrays and keeping the flow.
+        """
+        capacities, residual = self._capacity, self._residual
+        edges = [(u, v, capacities[e], capacities[e] - residual[e]) for (u, v), e in self._arc.items()]
+        edges.append((a, b, capacity, 0))
+        self._layout(edges)
+
+    def _repair(self, u, v, excess):
+        """
+        Restores flow conservation after the flow on the edge u -> v was lowered
+        by excess. Rerouting from u to v keeps the flow value; crossing between
+        the terminals through their virtual arcs cancels flow instead.
+        """
+        excess -= self._push(u, v, excess)
+        if excess > 0 and self._terminals is not None:
+            self._push(u, v, excess, bridge=True)
+
+    def _begin(self, source, sink):
+        """
+        Resolves the terminals of a max-flow run. Flow left by a run between other
+        terminals is not a valid flow for these ones, so it is removed first.
+        """
+        terminals = self._resolve(source, sink)
+        if self._terminals is not None and self._terminals != terminals:
+            self.reset()
+        self._terminals = terminals
+        return terminals
+
+    def min_cut(self, source, sink, method='dinic'):
+        """
+        Finds a minimum source-sink cut.
+
+        Any remaining flow is pushed first with the given engine; the source side
+        of the cut is then everything still reachable from the source in the
+        residual network.
+
+        Args:
+            source: The source vertex.
+            sink: The sink vertex.
+            method (str): The max-flow engine, as for max_flow.
+
+        Returns:
+            tuple: A tuple containing:
+                - float: The capacity of the cut, equal to the maximum flow value.
+                - set: The vertices on the source side.
+                - list: The cut edges (u, v), from the source side to the sink side.
+        """
+        self.max_flow(source, sink, method)
+        s, _ = self._resolve(source, sink)
+        offsets, head, residual = self._offsets, self._head, self._residual
+        reachable = bytearray(len(self.labels))
+        reachable[s] = 1
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for e in range(offsets[u], offsets[u + 1]):
+                v = head[e]
+                if not reachable[v] and residual[e] > 0:
+                    reachable[v] = 1
+                    queue.append(v)
+
+        labels = self.labels
+        cut_value = 0
+        cut_edges = []
+        for (u, v), e in self._arc.items():
+            if reachable[u] and not reachable[v]:
+                cut_value += self._capacity[e]
+                cut_edges.append((labels[u], labels[v]))
+        return cut_value, {labels[v] for v in range(len(labels)) if reachable[v]}, cut_edges
+
+    def _resolve(self, source, sink):
+        """
+        Maps the source and sink to vertex ids.
+        """
+        if source not in self.index:
+            raise ValueError("Source vertex not in graph.")
+        if sink not in self.index:
+            raise ValueError("Sink vertex not in graph.")
+        if source == sink:
+            raise ValueError("Source and sink must differ.")
+        return self.index[source], self.index[sink]
@@ -1,20 +1,26 @@
-import heapq
+from ..heaps.indexed_min_heap import IndexedMinHeap
+from .csr_graph import as_csr
 
 class Prim:
     """
     Implementation of Prim's algorithm for finding the Minimum Spanning Tree (MST)
     of a connected, undirected, weighted graph.
     """
-    def __init__(self, graph):
+    def __init__(self, graph, heap_factory=IndexedMinHeap):
         """
         Initializes the Prim object with a graph.
 
         Args:
-            graph (dict): A dictionary representing the graph's adjacency list.
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
                           Example: {'A': [('B', 2), ('C', 3)], 'B': [('A', 2), ...]}
+            heap_factory (callable): Creates the empty decrease-key priority queue, e.g.
+                          IndexedMinHeap, lambda: IndexedMinHeap(arity=4) or PairingHeap.
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.heap_factory = heap_factory
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
 
     def find_mst(self, start_vertex):
         """
@@ -29,29 +35,39 @@ class Prim:
                 - mst_edges (list): A list of tuples representing the edges in the MST.
                                     Example: [('A', 'B', 2), ('B', 'D', 5), ...]
         """
-        if start_vertex not in self.vertices:
+        if start_vertex not in self.csr.index:
             raise ValueError("Start vertex not in graph.")
 
+        csr = self.csr
+        offsets, targets, weights, labels = csr.offsets, csr.targets, csr.weights, csr.labels
+        num_vertices = csr.num_vertices
+        source = csr.index[start_vertex]
+
         mst_cost = 0
         mst_edges = []
-        visited = {start_vertex}
-        # (weight, from_vertex, to_vertex)
-        pq = [(weight, start_vertex, neighbor) for neighbor, weight in self.graph.get(start_vertex, [])]
-        heapq.heapify(pq)
-
-        while pq and len(visited) < len(self.vertices):
-            weight, u, v = heapq.heappop(pq)
+        visited = bytearray(num_vertices)
+        num_visited = 0
+        # Each vertex outside the tree is queued once, keyed by its cheapest edge into
+        # the tree; best_edge[v] is the tree end of that edge.
+        best_edge = {}
+        pq = self.heap_factory()
+        pq.push(source, 0)
 
-            if v not in visited:
-                visited.add(v)
+        while pq and num_visited < num_vertices:
+            v, weight = pq.pop()
+            visited[v] = 1
+            num_visited += 1
+            if v != source:
+                u = best_edge[v]
                 mst_cost += weight
-                mst_edges.append((u, v, weight))
+                mst_edges.append((labels[u], labels[v], weight))
 
-                for neighbor, next_weight in self.graph.get(v, []):
-                    if neighbor not in visited:
-                        heapq.heappush(pq, (next_weight, v, neighbor))
+            for e in range(offsets[v], offsets[v + 1]):
+                neighbor = targets[e]
+                if not visited[neighbor] and pq.push_or_decrease(neighbor, weights[e]):
+                    best_edge[neighbor] = v
 
-        if len(visited) != len(self.vertices):
+        if num_visited != num_vertices:
             print("Warning: Graph is not connected. The result is a minimum spanning forest.")
 
         return mst_cost, mst_edges
@@ -0,0 +1,296 @@
+import random
+import sys
+import time
+from array import array
+
+from .csr_graph import as_csr
+from .tarjan import Tarjan
+
+_BITSET_LIMIT = 20000  # Most components for which method='auto' builds the full closure
+
+class ReachabilityIndex:
+    """
+    Answers "can u reach v" queries on a directed graph without a search per query.
+
+    The graph is condensed with Tarjan's algorithm: vertices in one Strongly
+    Connected Component (SCC) reach each other, and the components form a DAG.
+    Components are numbered in topological order, so a component can only reach
+    components with a larger id. Two query structures are available:
+
+    - 'bitset': the transitive closure of the DAG as one bitset per component,
+      built from the sinks up. Queries are O(1); memory is O(C^2 / 8) bytes.
+    - 'interval': GRAIL-style interval labels from several randomized depth-first
+      traversals. Each labelling assigns every component an interval that contains
+      the intervals of everything it reaches, so a missing containment proves
+      unreachability, and the DFS tree of the first traversal proves reachability
+      along tree edges. Only the remaining queries fall back to a DFS, pruned by
+      the topological order and the labels. Memory is O(k * C).
+    """
+    def __init__(self, graph, method='auto', num_intervals=2, seed=None):
+        """
+        Builds the index.
+
+        Args:
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
+            method (str): 'bitset', 'interval', or 'auto' to use bitsets for up to
+                          20000 components and intervals otherwise.
+            num_intervals (int): The number of interval labellings (interval method only).
+            seed (int, optional): Seed for the randomized traversals.
+        """
+        if method not in ('auto', 'bitset', 'interval'):
+            raise ValueError("method must be 'auto', 'bitset' or 'interval'.")
+        if num_intervals < 1:
+            raise ValueError("num_intervals must be at least 1.")
+        started = time.perf_counter()
+        self.graph = graph
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
+        self._condense()
+        if method == 'auto':
+            method = 'bitset' if self.num_components <= _BITSET_LIMIT else 'interval'
+        self.method = method
+        if method == 'bitset':
+            self._build_bitsets()
+        else:
+            self._build_intervals(num_intervals, random.Random(seed))
+        self.build_time = time.perf_counter() - started  # Seconds spent building the index
+
+    @property
+    def num_components(self):
+        """
+        The number of strongly connected components.
+        """
+        return len(self.components)
+
+    def _condense(self):
+        """
+        Computes the SCCs and the deduplicated condensation DAG in CSR form,
+        with component ids in topological order.
+        """
+        csr = self.csr
+        sccs = Tarjan(csr).find_sccs()  # Reverse topological order
+        sccs.reverse()
+        self.components = sccs  # Members of every component, by component id
+        self.component = array('q', [0]) * csr.num_vertices  # Vertex id -> component id
+        for c, scc in enumerate(sccs):
+            for label in scc:
+                self.component[csr.index[label]] = c
+
+        offsets, targets, component = csr.offsets, csr.targets, self.component
+        self._offsets = array('q', [0])
+        self._targets = array('q')
+        for c, scc in enumerate(sccs):
+            successors = set()
+            for label in scc:
+                u = csr.index[label]
+                for e in range(offsets[u], offsets[u + 1]):
+                    successors.add(component[targets[e]])
+            successors.discard(c)
+            self._targets.extend(sorted(successors))
+            self._offsets.append(len(self._targets))
+
+    def _build_bitsets(self):
+        """
+        Computes the closure of every component from the sinks up. Successors are
+        merged nearest first, so one already covered by an earlier merge is skipped.
+        """
+        offsets, targets = self._offsets, self._targets
+        closure = [0] * self.num_components
+        for c in range(self.num_components - 1, -1, -1):
+            reach = 1 << c
+            for e in range(offsets[c], offsets[c + 1]):
+                d = targets[e]
+                if not reach >> d & 1:
+                    reach |= closure[d]
+            closure[c] = reach
+        self._closure = closure
+
+    def _build_intervals(self, num_intervals, rng):
+        """
+        Computes num_intervals interval labellings. Labelling i gives component c
+        the interval [low[i][c], post[i][c]], where post is the post-order rank of
+        one traversal and low the smallest rank reachable from c. The first
+        traversal visits children in order; the others in random order.
+        """
+        n = self.num_components
+        offsets = self._offsets
+        self._low, self._post = [], []
+        for i in range(num_intervals):
+            targets = self._targets
+            roots = list(range(n))
+            if i:
+                targets = array('q', targets)
+                for c in range(n):
+                    row = targets[offsets[c]:offsets[c + 1]]
+                    rng.shuffle(row)
+                    targets[offsets[c]:offsets[c + 1]] = row
+                rng.shuffle(roots)
+            start, post = self._traverse(targets, roots)
+            if i == 0:
+                self._tree_start = array('q', start)  # The DFS tree subtree of c has ranks [start, post]
+            # Successors have larger ids, so lows are final when taken in reverse
+            low = start
+            for c in range(n - 1, -1, -1):
+                for e in range(offsets[c], offsets[c + 1]):
+                    d = targets[e]
+                    if low[d] < low[c]:
+                        low[c] = low[d]
+            self._low.append(low)
+            self._post.append(post)
+        self._seen = array('q', [-1]) * n  # Query stamp of every component visited by the fallback
+        self._queries = 0
+
+    def _traverse(self, targets, roots):
+        """
+        An iterative DFS over the condensation.
+
+        Returns:
+            tuple: The first post-order rank inside every component's DFS subtree,
+                   and every component's own post-order rank.
+        """
+        n = self.num_components
+        offsets = self._offsets
+        start = array('q', [0]) * n
+        post = array('q', [0]) * n
+        pointer = array('q', offsets[:-1])
+        visited = bytearray(n)
+        rank = 0
+        for root in roots:
+            if visited[root]:
+                continue
+            visited[root] = 1
+            start[root] = rank
+            stack = [root]
+            while stack:
+                c = stack[-1]
+                if pointer[c] < offsets[c + 1]:
+                    d = targets[pointer[c]]
+                    pointer[c] += 1
+                    if not visited[d]:
+                        visited[d] = 1
+                        start[d] = rank
+                        stack.append(d)
+                else:
+                    stack.pop()
+                    post[c] = rank
+                    rank += 1
+        return start, post
+
+    def reachable(self, u, v):
+        """
+        Checks whether there is a path from u to v. Every vertex reaches itself.
+
+        Args:
+            u: The source vertex.
+            v: The target vertex.
+
+        Returns:
+            bool: True if v is reachable from u, False otherwise.
+        """
+        return self._reachable(self.component[self._id(u)], self.component[self._id(v)])
+
+    def reachable_many(self, pairs):
+        """
+        Answers many reachability queries.
+
+        Args:
+            pairs (iterable): (u, v) pairs.
+
+        Returns:
+            list: One bool per pair.
+        """
+        index, component = self.csr.index, self.component
+        try:
+            return [self._reachable(component[index[u]], component[index[v]]) for u, v in pairs]
+        except KeyError:
+            raise ValueError("Vertex not in graph.") from None
+
+    def same_component(self, u, v):
+        """
+        Checks whether u and v reach each other.
+        """
+        return self.component[self._id(u)] == self.component[self._id(v)]
+
+    def component_of(self, vertex):
+        """
+        Returns the id of the component containing vertex. Ids are in topological
+        order of the condensation.
+        """
+        return self.component[self._id(vertex)]
+
+    def condensation(self):
+        """
+        Returns the condensation DAG.
+
+        Returns:
+            dict: The successor component ids of every component id.
+        """
+        offsets, targets = self._offsets, self._targets
+        return {c: list(targets[offsets[c]:offsets[c + 1]]) for c in range(self.num_components)}
+
+    def memory_bytes(self):
+        """
+        Estimates the memory held by the index, excluding the input graph.
+
+        Returns:
+            int: The size in bytes.
+        """
+        parts = [self.component, self._offsets, self._targets]
+        if self.method == 'bitset':
+            parts.append(self._closure)
+            parts.extend(self._closure)
+        else:
+            parts.extend(self._low)
+            parts.extend(self._post)
+            parts += [self._tree_start, self._seen]
+        return sum(sys.getsizeof(part) for part in parts)
+
+    def _id(self, vertex):
+        if vertex not in self.csr.index:
+            raise ValueError("Vertex not in graph.")
+        return self.csr.index[vertex]
+
+    def _reachable(self, cu, cv):
+        if cu == cv:
+            return True
+        if self.method == 'bitset':
+            return bool(self._closure[cu] >> cv & 1)
+        if cu > cv or not self._contains(cu, cv):
+            return False
+        if self._in_tree(cu, cv):
+            return True
+
+        # Fallback DFS, skipping components that cannot lead to cv
+        self._queries += 1
+        stamp, seen = self._queries, self._seen
+        offsets, targets = self._offsets, self._targets
+        seen[cu] = stamp
+        stack = [cu]
+        while stack:
+            c = stack.pop()
+            for e in range(offsets[c], offsets[c + 1]):
+                d = targets[e]
+                if d == cv:
+                    return True
+                if d < cv and seen[d] != stamp and self._contains(d, cv):
+                    if self._in_tree(d, cv):
+                        return True
+                    seen[d] = stamp
+                    stack.append(d)
+        return False
+
+    def _contains(self, cu, cv):
+        """
+        Checks whether every labelling's interval of cu contains that of cv.
+        """
+        for low, post in zip(self._low, self._post):
+            if low[cv] < low[cu] or post[cv] > post[cu]:
+                return False
+        return True
+
+    def _in_tree(self, cu, cv):
+        """
+        Checks whether cv lies in cu's subtree of the first traversal's DFS tree.
+        """
+        return self._tree_start[cu] <= self._post[0][cv] <= self._post[0][cu]
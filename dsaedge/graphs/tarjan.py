@@ -1,3 +1,6 @@
+from .csr_graph import as_csr
+from .iterative_dfs import IterativeDFS
+
 class Tarjan:
     """
     Implementation of Tarjan's algorithm for finding Strongly Connected Components (SCCs)
@@ -8,56 +11,66 @@ class Tarjan:
         Initializes the Tarjan object with a graph.
 
         Args:
-            graph (dict): A dictionary representing the graph's adjacency list.
+            graph (dict or CSRGraph): A dictionary representing the graph's adjacency list,
+                          or a prebuilt CSRGraph.
                           Example: {0: [1], 1: [2], 2: [0, 3], 3: [4], 4: [5], 5: [3]}
         """
         self.graph = graph
-        self.vertices = list(graph.keys())
+        self.csr = as_csr(graph)
+        self.vertices = self.csr.labels
         self.num_vertices = len(self.vertices)
+        self._reset()
+
+    def _reset(self):
+        """
+        Clears the search state, so that find_sccs can be called again.
+        """
         self.sccs = []
         self.stack = []
-        self.on_stack = {v: False for v in self.vertices}
-        self.disc = {v: -1 for v in self.vertices}  # Discovery times
-        self.low = {v: -1 for v in self.vertices}   # Low-link values
-        self.time = 0
+        self.on_stack = bytearray(self.num_vertices)
+        self._dfs = IterativeDFS(self.csr)
+        self.disc = self._dfs.disc  # Discovery times, indexed by vertex id
+        self.low = self._dfs.low    # Low-link values, indexed by vertex id
 
     def find_sccs(self):
         """
-        Finds all Strongly Connected Components in the graph.
+        Finds all Strongly Connected Components in the graph, in reverse
+        topological order of the condensation.
 
         Returns:
             list: A list of lists, where each inner list is an SCC.
                   Example: [[0, 1, 2], [3, 4, 5]]
         """
-        for v in self.vertices:
+        self._reset()
+        for v in range(self.num_vertices):
             if self.disc[v] == -1:
-                self._tarjan_dfs(v)
+                self._dfs.run(v, self._enter, self._edge, self._exit)
         return self.sccs
 
-    def _tarjan_dfs(self, u):
+    def _enter(self, u):
         """
-        A recursive DFS helper for Tarjan's algorithm.
+        Pushes a newly discovered vertex onto the SCC stack.
         """
-        self.disc[u] = self.time
-        self.low[u] = self.time
-        self.time += 1
         self.stack.append(u)
         self.on_stack[u] = True
 
-        for v in self.graph.get(u, []):
-            if self.disc[v] == -1:
-                self._tarjan_dfs(v)
-                self.low[u] = min(self.low[u], self.low[v])
-            elif self.on_stack[v]:
-                self.low[u] = min(self.low[u], self.disc[v])
+    def _edge(self, u, v):
+        """
+        Lowers u's low-link along an edge to a vertex still on the SCC stack.
+        """
+        if self.on_stack[v] and self.disc[v] < self.low[u]:
+            self.low[u] = self.disc[v]
 
-        # If u is a root node, pop the stack and form an SCC
+    def _exit(self, u, parent):
+        """
+        If u is a root node, pop the stack and form an SCC.
+        """
         if self.low[u] == self.disc[u]:
             scc = []
             while True:
                 node = self.stack.pop()
                 self.on_stack[node] = False
-                scc.append(node)
+                scc.append(self.csr.labels[node])
                 if node == u:
                     break
             self.sccs.append(scc)
@@ -1,4 +1,6 @@
-from collections import defaultdict, deque
+from collections import defaultdict
+
+from .csr_graph import CSRGraph
 
 class Graph:
     """
@@ -16,44 +18,265 @@ class Graph:
         self.adj[u].append(v)
         self.in_degree[v] += 1
 
-def topological_sort(graph):
+def topological_sort(graph, method='kahn'):
     """
-    Performs a topological sort on a Directed Acyclic Graph (DAG)
-    using Kahn's algorithm (in-degree based).
+    Performs a topological sort on a Directed Acyclic Graph (DAG).
+    The graph is not modified, so the sort can be repeated.
 
     Args:
-        graph (Graph): The graph object.
+        graph (Graph or CSRGraph): The graph object.
+        method (str): 'kahn' for Kahn's algorithm (in-degree based), or 'dfs' for
+                      the reverse post-order of an iterative depth-first search.
 
     Returns:
         list: A list representing the topological order of vertices.
               Returns an empty list if a cycle is detected.
     """
-    q = deque()
-    # Add all vertices with in-degree 0 to the queue
-    for i in range(graph.V):
-        if graph.in_degree[i] == 0:
-            q.append(i)
-
-    topological_order = []
-    count_visited_nodes = 0
-
-    while q:
-        u = q.popleft()
-        topological_order.append(u)
-        count_visited_nodes += 1
-
-        # Reduce in-degree of all adjacent vertices
-        for v in graph.adj[u]:
-            graph.in_degree[v] -= 1
-            # If in-degree becomes 0, add it to the queue
-            if graph.in_degree[v] == 0:
-                q.append(v)
-
-    # Check if there was a cycle
-    if count_visited_nodes != graph.V:
-        print("Graph contains a cycle! Topological sort not possible.")
-        return []
+    if method not in ('kahn', 'dfs'):
+        raise ValueError("method must be 'kahn' or 'dfs'.")
+    labels, successors = _successors(graph)
+    if method == 'dfs':
+        order = _dfs_order(successors)
     else:
-        return topological_order
+        order = [u for layer in _kahn_layers(successors) for u in layer]
+    if len(order) != len(labels):
+        return []
+    return [labels[u] for u in order]
+
+
+def topological_layers(graph):
+    """
+    Groups the vertices of a DAG by depth, for batch scheduling: the first layer
+    holds the vertices without predecessors, and every other vertex is in the
+    layer after its deepest predecessor. All vertices of a layer can be
+    processed in parallel once the previous layers are done.
+
+    Args:
+        graph (Graph or CSRGraph): The graph object.
+
+    Returns:
+        list: A list of layers, each a list of vertices.
+              Returns an empty list if a cycle is detected.
+    """
+    labels, successors = _successors(graph)
+    layers = _kahn_layers(successors)
+    if sum(len(layer) for layer in layers) != len(labels):
+        return []
+    return [[labels[u] for u in layer] for layer in layers]
+
+
+def _successors(graph):
+    """
+    Returns the vertex labels and the successor ids of every vertex id.
+    """
+    if isinstance(graph, CSRGraph):
+        offsets, targets = graph.offsets, graph.targets
+        return graph.labels, [targets[offsets[u]:offsets[u + 1]] for u in range(graph.num_vertices)]
+    return list(range(graph.V)), [graph.adj.get(u, ()) for u in range(graph.V)]
+
+
+def _kahn_layers(successors):
+    """
+    Kahn's algorithm on a private copy of the in-degrees, one layer at a time.
+    Vertices on or behind a cycle are left out.
+    """
+    in_degree = [0] * len(successors)
+    for targets in successors:
+        for v in targets:
+            in_degree[v] += 1
+
+    layer = [u for u in range(len(successors)) if in_degree[u] == 0]
+    layers = []
+    while layer:
+        layers.append(layer)
+        next_layer = []
+        for u in layer:
+            # Reduce in-degree of all adjacent vertices
+            for v in successors[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    next_layer.append(v)
+        layer = next_layer
+    return layers
+
+
+def _dfs_order(successors):
+    """
+    The reverse post-order of an iterative DFS, or a shorter list if an edge
+    back to a vertex on the DFS path closes a cycle.
+    """
+    n = len(successors)
+    state = bytearray(n)  # 0 unvisited, 1 on the DFS path, 2 finished
+    post_order = []
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            u, neighbours = stack[-1]
+            for v in neighbours:
+                if state[v] == 1:
+                    return []
+                if state[v] == 0:
+                    state[v] = 1
+                    stack.append((v, iter(successors[v])))
+                    break
+            else:
+                stack.pop()
+                state[u] = 2
+                post_order.append(u)
+    post_order.reverse()
+    return post_order
+
+
+class DynamicTopologicalOrder:
+    """
+    Maintains a topological order of a DAG while edges are inserted, with the
+    Pearce-Kelly algorithm.
+
+    An edge u -> v that agrees with the order is simply recorded. Otherwise only
+    the vertices ordered between v and u can be affected: a forward search from
+    v and a backward search from u, both bounded by that range, find them, and
+    they are reordered among the positions they already held. An edge that
+    would close a cycle is rejected and the cycle is reported.
+    """
+    def __init__(self, graph=None):
+        """
+        Initializes the order, optionally from an existing DAG.
+
+        Args:
+            graph (Graph or CSRGraph, optional): The initial graph.
+
+        Raises:
+            ValueError: If the initial graph contains a cycle.
+        """
+        self.vertices = []   # Vertex id -> label
+        self.index = {}      # Label -> vertex id
+        self._succ = []      # Successor ids of every vertex id
+        self._pred = []      # Predecessor ids of every vertex id
+        self._position = []  # Vertex id -> position in the order
+        self._at = []        # Position -> vertex id
+        if graph is not None:
+            labels, successors = _successors(graph)
+            order = [u for layer in _kahn_layers(successors) for u in layer]
+            if len(order) != len(labels):
+                raise ValueError("Graph contains a cycle.")
+            for u in order:
+                self.add_vertex(labels[u])
+            for u, targets in enumerate(successors):
+                for v in targets:
+                    self._link(self.index[labels[u]], self.index[labels[v]])
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def add_vertex(self, vertex):
+        """
+        Adds a vertex at the end of the order. Known vertices are ignored.
+
+        Args:
+            vertex: The vertex label.
+        """
+        if vertex in self.index:
+            return
+        v = len(self.vertices)
+        self.vertices.append(vertex)
+        self.index[vertex] = v
+        self._succ.append(set())
+        self._pred.append(set())
+        self._position.append(len(self._at))
+        self._at.append(v)
+
+    def add_edge(self, u, v):
+        """
+        Adds the edge u -> v, adding unknown vertices first, and repairs the order.
+
+        Args:
+            u: The source vertex.
+            v: The target vertex.
+
+        Returns:
+            list: None if the edge was added. If it would close a cycle, the edge
+                  is not added and the cycle is returned as a list of vertices
+                  [u, v, ..., u], following the edges.
+        """
+        self.add_vertex(u)
+        self.add_vertex(v)
+        iu, iv = self.index[u], self.index[v]
+        if iu == iv:
+            return [u, u]
+        position = self._position
+        lower, upper = position[iv], position[iu]
+        if lower > upper:  # u already precedes v
+            self._link(iu, iv)
+            return None
+
+        # Forward from v, within positions up to u's; reaching u closes a cycle
+        parent = {iv: None}
+        stack = [iv]
+        while stack:
+            x = stack.pop()
+            for y in self._succ[x]:
+                if y not in parent and position[y] <= upper:
+                    parent[y] = x
+                    if y == iu:
+                        cycle = [u]
+                        while y is not None:
+                            cycle.append(self.vertices[y])
+                            y = parent[y]
+                        cycle[1:] = reversed(cycle[1:])
+                        return cycle
+                    stack.append(y)
+        forward = list(parent)
+
+        # Backward from u, within positions from v's
+        backward = {iu}
+        stack = [iu]
+        while stack:
+            x = stack.pop()
+            for y in self._pred[x]:
+                if y not in backward and position[y] >= lower:
+                    backward.add(y)
+                    stack.append(y)
+
+        # The backward set takes the lowest of the freed positions, in its old order
+        backward = sorted(backward, key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        positions = sorted(position[x] for x in backward + forward)
+        for x, p in zip(backward + forward, positions):
+            position[x] = p
+            self._at[p] = x
+        self._link(iu, iv)
+        return None
+
+    def remove_edge(self, u, v):
+        """
+        Removes the edge u -> v. The order stays valid and is left unchanged.
+        """
+        iu, iv = self._id(u), self._id(v)
+        if iv not in self._succ[iu]:
+            raise ValueError("Edge not in graph.")
+        self._succ[iu].discard(iv)
+        self._pred[iv].discard(iu)
+
+    def order(self):
+        """
+        Returns the vertices in the current topological order.
+        """
+        return [self.vertices[v] for v in self._at]
+
+    def position(self, vertex):
+        """
+        Returns the position of vertex in the current order.
+        """
+        return self._position[self._id(vertex)]
 
+    def _id(self, vertex):
+        if vertex not in self.index:
+            raise ValueError("Vertex not in graph.")
+        return self.index[vertex]
 
+    def _link(self, u, v):
+        self._succ[u].add(v)
+        self._pred[v].add(u)
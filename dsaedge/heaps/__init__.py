@@ -0,0 +1,9 @@
+from .min_heap import MinHeap
+from .indexed_min_heap import IndexedMinHeap
+from .pairing_heap import PairingHeap
+
+__all__ = [
+    'MinHeap',
+    'IndexedMinHeap',
+    'PairingHeap'
+]
@@ -0,0 +1,181 @@
+from typing import Dict, Hashable, List, Tuple
+
+class IndexedMinHeap:
+    """
+    An indexed d-ary Min-Heap that maps items to priorities.
+    Every item appears at most once, and the position of each item in the heap is
+    tracked in a dictionary, so membership tests, priority lookups, decrease_key and
+    remove run without searching the heap.
+    With arity=2 this is a binary heap; larger arities make the heap shallower,
+    which favours workloads with many decrease_key calls such as Dijkstra's algorithm.
+    """
+    def __init__(self, arity: int = 2) -> None:
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        self.items: List[Hashable] = []
+        self.priorities: List[float] = []
+        self.position: Dict[Hashable, int] = {}
+
+    def _parent(self, i: int) -> int:
+        """
+        Get the index of the parent of node at index i.
+        """
+        return (i - 1) // self.arity
+
+    def push(self, item: Hashable, priority: float) -> None:
+        """
+        Insert a new item with the given priority.
+        Raises a KeyError if the item is already in the heap.
+        """
+        if item in self.position:
+            raise KeyError(f"{item!r} is already in the heap")
+        self.items.append(item)
+        self.priorities.append(priority)
+        self.position[item] = len(self.items) - 1
+        self._heapify_up(len(self.items) - 1)
+
+    def decrease_key(self, item: Hashable, priority: float) -> None:
+        """
+        Lower the priority of an item already in the heap.
+        Raises a KeyError if the item is missing, and a ValueError if the new
+        priority is larger than the current one.
+        """
+        i = self.position[item]
+        if priority > self.priorities[i]:
+            raise ValueError("decrease_key cannot increase a priority")
+        self.priorities[i] = priority
+        self._heapify_up(i)
+
+    def push_or_decrease(self, item: Hashable, priority: float) -> bool:
+        """
+        Insert the item, or lower its priority if it is already in the heap.
+        Returns True if the heap changed, False if the item already had a
+        priority no larger than the given one.
+        """
+        i = self.position.get(item)
+        if i is None:
+            self.push(item, priority)
+            return True
+        if priority < self.priorities[i]:
+            self.priorities[i] = priority
+            self._heapify_up(i)
+            return True
+        return False
+
+    def pop(self) -> Tuple[Hashable, float]:
+        """
+        Remove and return the (item, priority) pair with the smallest priority.
+        Raises an IndexError if the heap is empty.
+        """
+        if not self.items:
+            raise IndexError("pop from an empty heap")
+        item, priority = self.items[0], self.priorities[0]
+        self._remove_at(0)
+        return item, priority
+
+    def peek(self) -> Tuple[Hashable, float]:
+        """
+        Returns the (item, priority) pair with the smallest priority without removing it.
+        Raises an IndexError if the heap is empty.
+        """
+        if not self.items:
+            raise IndexError("peek from an empty heap")
+        return self.items[0], self.priorities[0]
+
+    def remove(self, item: Hashable) -> float:
+        """
+        Remove an arbitrary item from the heap and return its priority.
+        Raises a KeyError if the item is not in the heap.
+        """
+        i = self.position[item]
+        priority = self.priorities[i]
+        self._remove_at(i)
+        return priority
+
+    def get_priority(self, item: Hashable) -> float:
+        """
+        Returns the current priority of an item in O(1).
+        Raises a KeyError if the item is not in the heap.
+        """
+        return self.priorities[self.position[item]]
+
+    def contains(self, item: Hashable) -> bool:
+        """
+        Checks if an item is in the heap in O(1).
+        """
+        return item in self.position
+
+    def _remove_at(self, i: int) -> None:
+        """
+        Remove the node at index i by moving the last node into its place.
+        """
+        del self.position[self.items[i]]
+        last_item, last_priority = self.items.pop(), self.priorities.pop()
+        if i == len(self.items):
+            return
+        self.items[i], self.priorities[i] = last_item, last_priority
+        self.position[last_item] = i
+        if i > 0 and last_priority < self.priorities[self._parent(i)]:
+            self._heapify_up(i)
+        else:
+            self._heapify_down(i)
+
+    def _heapify_up(self, i: int) -> None:
+        """
+        Move a node up in the tree to maintain the heap property.
+        Parents are shifted down into the hole, and the node is written once at the end.
+        """
+        items, priorities, position = self.items, self.priorities, self.position
+        item, priority = items[i], priorities[i]
+        while i > 0:
+            parent = (i - 1) // self.arity
+            if priorities[parent] <= priority:
+                break
+            items[i], priorities[i] = items[parent], priorities[parent]
+            position[items[i]] = i
+            i = parent
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+    def _heapify_down(self, i: int) -> None:
+        """
+        Move a node down in the tree to maintain the heap property.
+        """
+        items, priorities, position = self.items, self.priorities, self.position
+        n = len(items)
+        item, priority = items[i], priorities[i]
+        while True:
+            first_child = self.arity * i + 1
+            if first_child >= n:
+                break
+            # Find the smallest of the (up to arity) children
+            smallest = first_child
+            for child in range(first_child + 1, min(first_child + self.arity, n)):
+                if priorities[child] < priorities[smallest]:
+                    smallest = child
+            if priorities[smallest] >= priority:
+                break
+            items[i], priorities[i] = items[smallest], priorities[smallest]
+            position[items[i]] = i
+            i = smallest
+        items[i], priorities[i] = item, priority
+        position[item] = i
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the heap is empty.
+        """
+        return len(self.items) == 0
+
+    def size(self) -> int:
+        """
+        Returns the number of items in the heap.
+        """
+        return len(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.position
@@ -0,0 +1,181 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class PairingNode:
+    """
+    A node of a pairing heap, holding an item and its priority.
+    'prev' points to the previous sibling, or to the parent for a leftmost child.
+    """
+    __slots__ = ('item', 'priority', 'child', 'sibling', 'prev')
+
+    def __init__(self, item: Hashable, priority: float) -> None:
+        self.item = item
+        self.priority = priority
+        self.child: Optional['PairingNode'] = None
+        self.sibling: Optional['PairingNode'] = None
+        self.prev: Optional['PairingNode'] = None
+
+class PairingHeap:
+    """
+    An indexed Pairing Heap that maps items to priorities.
+    Insertion and decrease_key take O(1) time (amortised O(log n) is the proven
+    bound for decrease_key, and it is very fast in practice), while pop takes
+    amortised O(log n). It offers the same interface as IndexedMinHeap.
+    """
+    def __init__(self) -> None:
+        self.root: Optional[PairingNode] = None
+        self.nodes: Dict[Hashable, PairingNode] = {}
+
+    def _meld(self, a: PairingNode, b: PairingNode) -> PairingNode:
+        """
+        Link two heap-ordered trees, making the larger root the first child of the smaller.
+        """
+        if b.priority < a.priority:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    def _cut(self, node: PairingNode) -> None:
+        """
+        Detach a non-root node (with its subtree) from its parent and siblings.
+        """
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _merge_pairs(self, first: Optional[PairingNode]) -> Optional[PairingNode]:
+        """
+        Combine a list of sibling trees with the standard two-pass pairing, iteratively.
+        """
+        pairs: List[PairingNode] = []
+        node = first
+        while node is not None:
+            a, b = node, node.sibling
+            if b is None:
+                a.prev = a.sibling = None
+                pairs.append(a)
+                break
+            node = b.sibling
+            a.prev = a.sibling = b.prev = b.sibling = None
+            pairs.append(self._meld(a, b))
+
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+    def push(self, item: Hashable, priority: float) -> None:
+        """
+        Insert a new item with the given priority.
+        Raises a KeyError if the item is already in the heap.
+        """
+        if item in self.nodes:
+            raise KeyError(f"{item!r} is already in the heap")
+        node = PairingNode(item, priority)
+        self.nodes[item] = node
+        self.root = node if self.root is None else self._meld(self.root, node)
+
+    def decrease_key(self, item: Hashable, priority: float) -> None:
+        """
+        Lower the priority of an item already in the heap.
+        Raises a KeyError if the item is missing, and a ValueError if the new
+        priority is larger than the current one.
+        """
+        node = self.nodes[item]
+        if priority > node.priority:
+            raise ValueError("decrease_key cannot increase a priority")
+        node.priority = priority
+        if node is not self.root:
+            self._cut(node)
+            self.root = self._meld(self.root, node)
+
+    def push_or_decrease(self, item: Hashable, priority: float) -> bool:
+        """
+        Insert the item, or lower its priority if it is already in the heap.
+        Returns True if the heap changed, False if the item already had a
+        priority no larger than the given one.
+        """
+        node = self.nodes.get(item)
+        if node is None:
+            self.push(item, priority)
+            return True
+        if priority < node.priority:
+            self.decrease_key(item, priority)
+            return True
+        return False
+
+    def pop(self) -> Tuple[Hashable, float]:
+        """
+        Remove and return the (item, priority) pair with the smallest priority.
+        Raises an IndexError if the heap is empty.
+        """
+        if self.root is None:
+            raise IndexError("pop from an empty heap")
+        root = self.root
+        del self.nodes[root.item]
+        self.root = self._merge_pairs(root.child)
+        return root.item, root.priority
+
+    def peek(self) -> Tuple[Hashable, float]:
+        """
+        Returns the (item, priority) pair with the smallest priority without removing it.
+        Raises an IndexError if the heap is empty.
+        """
+        if self.root is None:
+            raise IndexError("peek from an empty heap")
+        return self.root.item, self.root.priority
+
+    def remove(self, item: Hashable) -> float:
+        """
+        Remove an arbitrary item from the heap and return its priority.
+        Raises a KeyError if the item is not in the heap.
+        """
+        node = self.nodes[item]
+        if node is self.root:
+            return self.pop()[1]
+        del self.nodes[item]
+        self._cut(node)
+        subtree = self._merge_pairs(node.child)
+        if subtree is not None:
+            self.root = self._meld(self.root, subtree)
+        return node.priority
+
+    def get_priority(self, item: Hashable) -> float:
+        """
+        Returns the current priority of an item in O(1).
+        Raises a KeyError if the item is not in the heap.
+        """
+        return self.nodes[item].priority
+
+    def contains(self, item: Hashable) -> bool:
+        """
+        Checks if an item is in the heap in O(1).
+        """
+        return item in self.nodes
+
+    def is_empty(self) -> bool:
+        """
+        Checks if the heap is empty.
+        """
+        return self.root is None
+
+    def size(self) -> int:
+        """
+        Returns the number of items in the heap.
+        """
+        return len(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.nodes
@@ -25,6 +25,9 @@ setup(
     keywords='data structures algorithms python linked list tree graph sort search dynamic programming backtracking',
     install_requires=[],
     extras_require={
+        'numpy': [
+            'numpy',
+        ],
         'dev': [
             'pytest',
             'ruff',
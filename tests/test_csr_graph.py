@@ -0,0 +1,40 @@
+from dsaedge.graphs import GraphSearch, GraphTraversal, Tarjan
+from dsaedge.graphs.csr_graph import CSRGraph
+
+GRID = {
+    (0, 0): [(0, 1), (1, 0)],
+    (0, 1): [(0, 0), (1, 1)],
+    (1, 0): [(0, 0), (1, 1)],
+    (1, 1): [(0, 1), (1, 0)],
+}
+
+
+def test_tuple_labels_are_not_read_as_weights():
+    csr = CSRGraph.from_adjacency(GRID)
+    assert csr.labels == list(GRID)
+    assert not csr.weighted
+    assert csr.to_adjacency_list() == GRID
+
+
+def test_tuple_labelled_graph_through_algorithms():
+    assert sorted(GraphTraversal(GRID).bfs((0, 0))) == sorted(GRID)
+    assert [sorted(scc) for scc in Tarjan(GRID).find_sccs()] == [sorted(GRID)]
+    path = GraphSearch(GRID).find_path_bfs((0, 0), (1, 1))
+    assert path[0] == (0, 0) and path[-1] == (1, 1) and len(path) == 3
+
+
+def test_three_tuple_labels():
+    graph = {(0, 0, 0): [(0, 0, 1)], (0, 0, 1): []}
+    assert GraphTraversal(graph).bfs((0, 0, 0)) == [(0, 0, 0), (0, 0, 1)]
+
+
+def test_weighted_lists_are_still_detected():
+    csr = CSRGraph.from_adjacency({'A': [('B', 1), ('C', 4)], 'B': [('C', 2)], 'C': []})
+    assert csr.weighted
+    assert csr.to_adjacency_dict() == {'A': {'B': 1, 'C': 4}, 'B': {'C': 2}, 'C': {}}
+
+
+def test_explicit_weighted_flag():
+    csr = CSRGraph.from_adjacency({(0, 0): [(0, 0)]}, weighted=True)
+    assert csr.labels == [(0, 0), 0]
+    assert csr.weights[0] == 0